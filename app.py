@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 
 import hashlib
 
@@ -37,8 +36,11 @@ menu_options = {
     "1. Socio-demographics & distribution": "👥 Socio-demographics",
     "2. Attitudes towards vacations": "🧠 Vacation Attitudes",
     "2a. Differences and Similarities": "📊 Differences and Similarities",  # 👈 NEU
+    "2b. Cross-question Correlations": "🔗 Correlation Explorer",
     "3. Last Vacation": "🏖️ Last Vacation",
     "4. Descriptions and Rating": "🗣️ Vacation Descriptions",
+    "4a. Adjectives and Rating Levels": "🌡️ Adjective Heatmaps",
+    "4b. Crosstab Builder (SQL)": "🧮 Crosstab Builder",
     "5. To be added": "🔧 Coming Soon"
 }
 
@@ -51,6 +53,31 @@ menu = st.sidebar.radio(
 st.sidebar.markdown("---")
 st.sidebar.markdown("ℹ️ *Tourism Survey 2025 Dashboard*")
 
+
+def render_static_page(menu):
+    """Seiten ohne Daten: Einführung und Platzhalter."""
+    if menu.startswith("0."):
+        from sections import introduction
+        introduction.run()
+    else:
+        st.title("Coming soon...")
+        st.markdown("This section will be added in a future release.")
+
+
+# Eingefrorener Build (TOURISM_FROZEN=1, erzeugt mit tools/freeze.py): Seiten kommen fertig
+# von der Platte – keine Datenlader, Modelle, API, Renderer-Pool oder Vorwärmen
+from sections.frozen import FROZEN_ENABLED
+
+if FROZEN_ENABLED:
+    from sections.frozen import build_caption, serve_frozen_page
+    from sections.metrics import serve_metrics
+
+    st.sidebar.markdown(build_caption())
+    serve_metrics()
+    if not serve_frozen_page(menu):
+        render_static_page(menu)
+    st.stop()
+
 # Force reload button
 if "reload_data" not in st.session_state:
     st.session_state.reload_data = False
@@ -59,12 +86,12 @@ if st.sidebar.button("🔄 Force Reload"):
     st.session_state.reload_data = True
 
 # Load Excel data (used for sociodemographics and possibly others)
-@st.cache_data(show_spinner=True)
-def load_data():
-    return pd.read_excel("data/DATA_TourismCommunity2025_Countries.xlsx", sheet_name=None, header=None)
+from sections.data import load_workbook as load_data
 
 if st.session_state.reload_data:
     st.cache_data.clear()
+    from sections.prefetch import reset_prefetch
+    reset_prefetch()
     st.session_state.reload_data = False
 
 # Lade relevante Sheets (optional nutzbar in anderen Sektionen)
@@ -74,28 +101,75 @@ sociodemo_df = sheets["Sociodemographics"]
 first_part_df = sheets["First Part"]
 
 # Import core sections
-from sections import sociodemographics, attitudes, Last_Holiday, descriptions_rating, differences
+from sections import sociodemographics, attitudes, Last_Holiday, descriptions_rating, differences, adjective_ratings, crosstab, correlations
+from sections.registry import preload_models
+
+# Gefittete Modelle einmal pro Serverprozess von Platte laden
+preload_models()
+
+# JSON-API für andere Tools (teilt sich die gecachten Loader mit dem Dashboard)
+from sections.api import run_alongside_app
+
+run_alongside_app()
+
+# Prometheus-Metriken (Caches, Renderzeiten, Exporte, Sessions, RSS) auf lokalem Port
+from sections.metrics import serve_metrics
+
+serve_metrics()
+
+# Warme Kaleido-Prozesse für PNG-Exporte (Download-Buttons)
+from sections.renderer import start_renderer_pool
+
+start_renderer_pool()
+
+# Alle Sektionen einmal pro Serverprozess im Hintergrund vorwärmen (Dauer und Einträge im Log)
+from sections.warmup import warm_on_server_start
+
+warm_on_server_start()
+
+# Seiten-Routing (Figure-Größen pro Seite gegen das Byte-Budget messen)
+from sections.figures import begin_page, end_page
+from sections.validation import DataValidationError
+
+begin_page(menu)
+
+# Datensätze werden beim ersten Einlesen pro Datenversion geprüft – fehlerhafte Daten stoppen die Seite mit Bericht
+try:
+    if menu.startswith("1."):
+        sociodemographics.render(sociodemo_df)
+
+    elif menu.startswith("2."):
+        attitudes.render(None)
+
+    elif menu.startswith("2a."):
+        differences.render()
+
+    elif menu.startswith("2b."):
+        correlations.render()
+
+    elif menu.startswith("3."):
+        Last_Holiday.render()
+
+    elif menu.startswith("4."):
+        descriptions_rating.render()  # ✅ NEU eingebunden
 
-# Seiten-Routing
-if menu.startswith("0."):
-    from sections import introduction
-    introduction.run()
+    elif menu.startswith("4a."):
+        adjective_ratings.render()
 
-elif menu.startswith("1."):
-    sociodemographics.render(sociodemo_df)
+    elif menu.startswith("4b."):
+        crosstab.render()
 
-elif menu.startswith("2."):
-    attitudes.render(None)
+    else:
+        render_static_page(menu)
 
-elif menu.startswith("2a."):
-    differences.render()
+except DataValidationError as exc:
+    st.error(f"❌ The data file behind this page failed validation: {exc}")
+    st.dataframe(exc.report, use_container_width=True, hide_index=True)
+    st.caption("Run `python -m sections.validation` for the full report after fixing the data.")
 
-elif menu.startswith("3."):
-    Last_Holiday.render()
+end_page()
 
-elif menu.startswith("4."):
-    descriptions_rating.render()  # ✅ NEU eingebunden
+# Andere Seiten im Hintergrund vorwärmen, nachdem die aktuelle Seite fertig ist
+from sections.prefetch import prefetch_other_sections
 
-else:
-    st.title("Coming soon...")
-    st.markdown("This section will be added in a future release.")
+prefetch_other_sections(menu)
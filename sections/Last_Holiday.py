@@ -1,78 +1,192 @@
 import streamlit as st
 import pandas as pd
-from sections.utils import prepare_figure_for_export
+from sections.utils import deferred_export, deferred_html, deferred_image
+from sections.figures import show_chart
+from sections.registry import frame_hash, get_model
+from sections.shared_cache import shared_cache
+from sections.data import data_version, display_frame, load_last_vacation_data, load_question_texts, to_float64
 import plotly.express as px
 import plotly.figure_factory as ff
 from scipy.cluster.hierarchy import linkage
 from sklearn.preprocessing import StandardScaler
-from io import BytesIO
-
-@st.cache_data
-def load_last_vacation_data():
-    df = pd.read_csv("data/Cleaned_LastVacation_FINAL_FIXED.csv")
-    df = df.dropna(subset=["Percentage"])
-    df = df[~df["Answer"].str.contains("Count", case=False, na=False)]
-    df["Answer"] = df["Answer"].astype(str).str.strip()
-    df["Percentage"] = (df["Percentage"] * 100).round(1)
-
-    df.loc[(df["Question_Code"] == "QDuration") & (df["Answer"].isin(["Short trip", "2-4 nights"])), "Answer"] = "Short trip / 2-4 nights"
-    df.loc[(df["Question_Code"] == "QDuration") & (df["Answer"].isin(["Medium trip", "5-7 nights"])), "Answer"] = "Medium trip / 5-7 nights"
-    df.loc[(df["Question_Code"] == "QDuration") & (df["Answer"].isin(["Long trip", "8-14 nights"])), "Answer"] = "Long trip / 8-14 nights"
-    df.loc[(df["Question_Code"] == "QDuration") & (df["Answer"].isin(["Extra long trip", "15 or more nights"])), "Answer"] = "Extra long trip / 15 or more nights"
-    df.loc[(df["Question_Code"] == "QDuration") & (df["Answer"].isin(["1 night", "Overnight stay"])), "Answer"] = "Overnight stay / 1 night"
-
-    df.loc[df["Question_Code"] == "QWhere", "Answer"] = df.loc[df["Question_Code"] == "QWhere", "Answer"].replace({
-        r"^Domestically.*": "Domestically, within my country",
-        r"^International.*": "Internationally, outside my country",
-        r"^Both domest.*": "Both domestically and internationally"
-    }, regex=True)
-
-    df = df.groupby(["Question_Code", "Question_Text", "Country", "Answer"], as_index=False).agg({"Percentage": "mean"})
-
-    country_map = {
-        "SG": "Singapore", "UK": "United Kingdom", "US": "United States",
-        "CN": "China", "KR": "South Korea", "UAE": "United Arab Emirates",
-        "BR": "Brazil", "FR": "France", "DE": "Germany", "AU": "Australia",
-        "Total": "Total"
-    }
-    df["Country_clean"] = df["Country"].map(country_map)
-    return df
 
-def render():
-    st.title("Last Vacation Insights")
+QUESTION_ORDER = [
+    "QWhen", "QWhyno", "QDuration", "QWhere",
+    "QAccom", "QFeat", "QWhowith", "QReasons", "QDescribe_E"
+]
+
+# Vorauswahl des Ländervergleichs je Frage: die beiden Länder mit dem größten Unterschied
+DEFAULT_COUNTRIES = {
+    "QWhen": ["Brazil", "China"],
+    "QWhyno": ["China", "South Korea"],
+    "QDuration": ["France", "South Korea"],
+    "QWhere": ["China", "Singapore"],
+    "QAccom": ["France", "Singapore"],
+    "QFeat": ["Germany", "United Arab Emirates"],
+    "QWhowith": ["China", "Brazil"],
+    "QReasons": ["Germany", "United Arab Emirates"],
+    "QDescribe_E": ["Germany", "United Arab Emirates"]
+}
+
+# Feste Antwortreihenfolgen; alle anderen Fragen nach Anteil im Total Sample
+ANSWER_ORDERS = {
+    "QWhen": [
+        "In the last week", "In the last month", "In the last 3 months",
+        "In the last 6 months", "In the last 12 months",
+        "Longer than 12 months ago", "Never"
+    ],
+    "QDuration": [
+        "Overnight stay / 1 night", "Short trip / 2-4 nights",
+        "Medium trip / 5-7 nights", "Long trip / 8-14 nights",
+        "Extra long trip / 15 or more nights"
+    ],
+    "QWhere": [
+        "Domestically, within my country",
+        "Internationally, outside my country",
+        "Both domestically and internationally"
+    ]
+}
+
+def build_question_views(df: pd.DataFrame, question_texts: pd.Series) -> dict:
+    """
+    Plotfertige Ansicht je Frage: Text, Antwortreihenfolge, Total-Sample-Frame,
+    Länder-Frame (sortiert nach Antwort und Land) und Liste der verfügbaren Länder.
+    """
+    views = {}
+    for question, df_q in df.groupby("Question_Code", observed=True):
+        df_q = display_frame(df_q)
+        total_df = df_q[df_q["Country_clean"] == "Total"]
+
+        order = ANSWER_ORDERS.get(question) or total_df.sort_values("Percentage", ascending=False)["Answer"].tolist()
+
+        total_df = total_df.assign(Answer=pd.Categorical(total_df["Answer"], categories=order, ordered=True))
+        countries_df = df_q[(df_q["Country"] != "Total") & df_q["Answer"].isin(order)]
+        countries_df = countries_df.assign(Answer=pd.Categorical(countries_df["Answer"], categories=order, ordered=True))
+
+        views[question] = {
+            "text": question_texts[question],
+            "order": order,
+            "total": total_df.sort_values("Answer"),
+            "countries": countries_df.sort_values(["Answer", "Country_clean"]),
+            "available_countries": sorted(df_q[df_q["Country"] != "Total"]["Country_clean"].dropna().unique().tolist())
+        }
+    return views
+
+# Ressource statt Daten-Cache: die Ansichten werden nur gelesen, daher ohne Kopie pro Rerun.
+# Nur die aktuelle Datenversion bleibt im Speicher.
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_question_views(version):
+    return build_question_views(load_last_vacation_data(), load_question_texts())
+
+def question_comparison(view: dict, countries: list[str]) -> pd.DataFrame:
+    """Länder-Frame einer Frage für die Auswahl (bereits nach Antwort und Land sortiert)."""
+    countries_df = view["countries"]
+    return countries_df[countries_df["Country_clean"].isin(countries)]
+
+# Figures pro Datenversion, Frage und Länderauswahl; st.cache_data gibt jeder Session eine eigene Kopie
+# (show_chart verändert die Figure). Eine Kopie kostet ~4 ms, px.bar neu zu bauen ~35 ms.
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_total_figure(version, question):
+    fig_total = px.bar(
+        load_question_views(version)[question]["total"], x="Answer", y="Percentage", text="Percentage",
+        title="", color_discrete_sequence=["#5DADE2"]
+    )
+    fig_total.update_layout(showlegend=False)
+    return fig_total
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_comparison_figure(version, question, countries):
+    fig_compare = px.bar(
+        question_comparison(load_question_views(version)[question], list(countries)),
+        x="Answer", y="Percentage", color="Country_clean",
+        text="Percentage", barmode="group",
+        color_discrete_sequence=px.colors.qualitative.Prism,
+        title=""
+    )
+    fig_compare.update_layout(showlegend=True)
+    return fig_compare
 
-    df = load_last_vacation_data()
+def default_countries(view: dict, question: str) -> list[str]:
+    return DEFAULT_COUNTRIES.get(question, view["available_countries"][:2])
 
-    # Dendrogramm ganz oben anzeigen mit Plotly
-    st.subheader("🌍 Hierarchical Clustering of Countries based on Vacation Behavior")
-
-    df_clu = df[df["Country"] != "Total"].copy()
+def build_behavior_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """Länder × (Frage, Antwort) Matrix der Prozentwerte, ohne Total."""
+    df_clu = df[df["Country"] != "Total"].assign(Percentage=lambda d: to_float64(d["Percentage"]))
     pivot_df = df_clu.pivot_table(
         index="Country",
         columns=["Question_Code", "Answer"],
         values="Percentage",
-        aggfunc="mean"
+        aggfunc="mean",
+        observed=True
     ).fillna(0)
+    pivot_df.index = pivot_df.index.astype(str)
+    return pivot_df
+
+def fit_behavior_models(pivot_df: pd.DataFrame) -> dict:
+    """Standardisierung und Ward-Linkage für das Länder-Dendrogramm."""
+    scaler = StandardScaler().fit(pivot_df)
+    return {
+        "scaler": scaler,
+        "linkage": linkage(scaler.transform(pivot_df), method='ward')
+    }
 
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(pivot_df)
-    linkage_matrix = linkage(scaled_data, method='ward')
+@st.cache_data(show_spinner=False)
+@shared_cache("figures", codec="figure")
+def build_dendrogram_figure(pivot_df):
+    # Scaler und Ward-Linkage aus der Registry (nur bei geänderten Daten neu fitten)
+    models = get_model(
+        "last_holiday_ward",
+        frame_hash(pivot_df),
+        lambda: fit_behavior_models(pivot_df)
+    )
+    scaled_data = models["scaler"].transform(pivot_df)
+    linkage_matrix = models["linkage"]
 
     fig_dendro = ff.create_dendrogram(
         scaled_data,
         orientation='left',
         labels=pivot_df.index.tolist(),
-        hovertext=pivot_df.index.tolist()
+        linkagefun=lambda _: linkage_matrix
     )
     fig_dendro.update_layout(width=1000, height=700, margin=dict(t=50, l=250, r=50, b=50))
-    st.plotly_chart(fig_dendro, use_container_width=True)
+    return fig_dendro
+
+def warm():
+    """
+    Daten, Ward-Modell und die gecachten Figures der Startansicht vorab laden: Dendrogramm,
+    Vergleichs-Dendrogramme und die Balken jeder Frage mit der Länder-Vorauswahl.
+    """
+    from sections.correspondence import load_correspondence
+    from sections.linkage_comparison import warm_default_dendrograms
+    from sections.stability import load_or_compute_stability
+
+    version = data_version()
+    pivot_df = build_behavior_matrix(load_last_vacation_data())
+    build_dendrogram_figure(pivot_df)
+    views = load_question_views(version)
+    for question in QUESTION_ORDER:
+        build_total_figure(version, question)
+        build_comparison_figure(version, question, tuple(default_countries(views[question], question)))
+    load_or_compute_stability("last_holiday", pivot_df, method="ward", n_clusters=3)
+    load_correspondence(version)
+    warm_default_dendrograms()
+
+def render():
+    st.title("Last Vacation Insights")
+
+    df = load_last_vacation_data()
+
+    # Dendrogramm ganz oben anzeigen mit Plotly
+    st.subheader("🌍 Hierarchical Clustering of Countries based on Vacation Behavior")
+
+    pivot_df = build_behavior_matrix(df)
+    fig_dendro = build_dendrogram_figure(pivot_df)
+    show_chart(fig_dendro)
 
     # Export als PNG (optional)
-    png_buf = BytesIO()
-    fig_dendro.write_image(png_buf, format="png", width=1000, height=700, scale=2)
     st.download_button(
         label="⬇️ Download Dendrogram (PNG)",
-        data=png_buf.getvalue(),
+        data=deferred_image(fig_dendro, width=1000, height=700, scale=2),
         file_name="dendrogram_vacation_clusters.png",
         mime="image/png",
         key="dl_dendro_png"
@@ -80,12 +194,31 @@ def render():
 
     st.download_button(
         label="⬇️ Download Dendrogram (HTML)",
-        data=fig_dendro.to_html(),
+        data=deferred_html(fig_dendro),
         file_name="dendrogram_vacation_clusters.html",
         mime="text/html",
         key="dl_dendro_html"
     )
 
+    # Bootstrap-Stabilität der Ward-Cluster
+    from sections.stability import render_stability
+
+    with st.expander("🎲 Cluster Stability (Bootstrap Resampling)"):
+        render_stability("last_holiday", pivot_df, method="ward", n_clusters=3)
+
+    # Linkage-Methoden und Distanzmaße im Vergleich
+    from sections.linkage_comparison import render_linkage_comparison
+
+    with st.expander("⚖️ Compare Linkage Methods (Cophenetic Correlation)"):
+        render_linkage_comparison()
+
+    # Korrespondenzanalyse über alle Fragen und Antworten
+    from sections.correspondence import render_correspondence
+    from sections.differences import QUESTION_LABELS
+
+    with st.expander("🧭 Correspondence Analysis (Countries × Answers)"):
+        render_correspondence(QUESTION_LABELS)
+
     st.markdown("""
     ### 🔍 Interpretation of Clusters
     Based on the hierarchical clustering above, we observe grouping patterns such as:
@@ -103,63 +236,19 @@ def render():
     > This approach highlights particularly contrasting travel behaviors and attitudes, helping to identify cultural or regional divergences.
     """)
 
-    question_order = [
-        "QWhen", "QWhyno", "QDuration", "QWhere",
-        "QAccom", "QFeat", "QWhowith", "QReasons", "QDescribe_E"
-    ]
-
-    default_countries_by_question = {
-        "QWhen": ["Brazil", "China"],
-        "QWhyno": ["China", "South Korea"],
-        "QDuration": ["France", "South Korea"],
-        "QWhere": ["China", "Singapore"],
-        "QAccom": ["France", "Singapore"],
-        "QFeat": ["Germany", "United Arab Emirates"],
-        "QWhowith": ["China", "Brazil"],
-        "QReasons": ["Germany", "United Arab Emirates"],
-        "QDescribe_E": ["Germany", "United Arab Emirates"]
-    }
+    # Vorberechnete Ansichten je Frage (einmal pro Datenversion)
+    version = data_version()
+    question_views = load_question_views(version)
 
-    for idx, question in enumerate(question_order, 1):
-        df_q = df[df["Question_Code"] == question].copy()
-        q_text = df_q["Question_Text"].iloc[0]
-        st.markdown(f"### {idx}. {q_text}")
+    for idx, question in enumerate(QUESTION_ORDER, 1):
+        view = question_views[question]
+        st.markdown(f"### {idx}. {view['text']}")
 
         st.markdown("**Total Sample**")
-        total_df = df_q[(df_q["Country_clean"] == "Total")].copy()
-
-        if question == "QWhen":
-            order = [
-                "In the last week", "In the last month", "In the last 3 months",
-                "In the last 6 months", "In the last 12 months",
-                "Longer than 12 months ago", "Never"
-            ]
-        elif question == "QDuration":
-            order = [
-                "Overnight stay / 1 night", "Short trip / 2-4 nights",
-                "Medium trip / 5-7 nights", "Long trip / 8-14 nights",
-                "Extra long trip / 15 or more nights"
-            ]
-        elif question == "QWhere":
-            order = [
-                "Domestically, within my country",
-                "Internationally, outside my country",
-                "Both domestically and internationally"
-            ]
-        else:
-            order = total_df.sort_values("Percentage", ascending=False)["Answer"].tolist()
-
-        total_df["Answer"] = pd.Categorical(total_df["Answer"], categories=order, ordered=True)
-        total_df = total_df.sort_values("Answer")
-
-        fig_total = px.bar(
-            total_df, x="Answer", y="Percentage", text="Percentage",
-            title="", color_discrete_sequence=["#5DADE2"]
-        )
-        fig_total.update_layout(showlegend=False)
-        st.plotly_chart(fig_total, use_container_width=True)
+        fig_total = build_total_figure(version, question)
+        show_chart(fig_total)
 
-        fig_total_png = prepare_figure_for_export(
+        fig_total_png = deferred_export(
             fig_total, title_size=24, label_size=20, tick_size=18, legend_size=18,
             width=1600, height=900, scale=2
         )
@@ -172,32 +261,18 @@ def render():
         )
 
         st.markdown("#### Country Comparison")
-        available_countries = df_q[df_q["Country"] != "Total"]["Country_clean"].dropna().unique().tolist()
-        default_selection = default_countries_by_question.get(question, available_countries[:2])
-
         selected_countries = st.multiselect(
             label="Select countries:",
-            options=sorted(available_countries),
-            default=default_selection,
+            options=view["available_countries"],
+            default=default_countries(view, question),
             key=f"compare_{question}"
         )
 
         if selected_countries:
-            compare_df = df_q[df_q["Country_clean"].isin(selected_countries)].copy()
-            compare_df = compare_df[compare_df["Answer"].isin(order)]
-            compare_df["Answer"] = pd.Categorical(compare_df["Answer"], categories=order, ordered=True)
-            compare_df = compare_df.sort_values(["Answer", "Country_clean"])
-
-            fig_compare = px.bar(
-                compare_df, x="Answer", y="Percentage", color="Country_clean",
-                text="Percentage", barmode="group",
-                color_discrete_sequence=px.colors.qualitative.Prism,
-                title=""
-            )
-            fig_compare.update_layout(showlegend=True)
-            st.plotly_chart(fig_compare, use_container_width=True)
+            fig_compare = build_comparison_figure(version, question, tuple(selected_countries))
+            show_chart(fig_compare)
 
-            fig_compare_png = prepare_figure_for_export(
+            fig_compare_png = deferred_export(
                 fig_compare, title_size=24, label_size=20, tick_size=18, legend_size=18,
                 width=1800, height=1000, scale=2
             )
@@ -1,7 +1,3 @@
-# Initial loading of core modules
-from . import sociodemographics
-from . import attitudes
-from . import Last_Holiday
-
-# Do NOT import 'introduction' here to avoid circular import issues.
-# It will be imported directly in app.py when needed.
+# Sections are imported where they are needed (app.py, tools/), so that importing
+# sections.frozen or sections.metrics does not pull in pandas, scikit-learn or SciPy.
+# 'introduction' is imported directly in app.py as well.
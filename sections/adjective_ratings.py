@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from sections.data import data_version
+from sections.descriptions_rating import COUNTRY_MAP
+from sections.figures import show_chart
+from sections.metrics import cache_metrics
+from sections.utils import deferred_export
+from sections.validation import load_dataset
+
+RATING_LEVELS = [
+    "Does not at all describe my vacation",
+    "Partially describes my vacation",
+    "Describes my vacation perfectly"
+]
+SHORT_LEVELS = {
+    "Does not at all describe my vacation": "Not at all",
+    "Partially describes my vacation": "Partially",
+    "Describes my vacation perfectly": "Perfectly"
+}
+
+
+def load_adjective_data():
+    """
+    Anteile je Land, Adjektiv und Stufe in Prozent. Die Datei erzeugt tools/export_adjective_ratings.py
+    aus dem Workbook; Werte außerhalb von 0–1 oder Stufen, die sich nicht zu 100 % summieren,
+    stoppen das Einlesen mit DataValidationError – die Seite zeigt dann den Prüfbericht.
+    """
+    df = load_dataset("adjective_ratings")
+    df["Country_clean"] = df["Country"].str.extract(r"\((.)\)").iloc[:, 0].map(COUNTRY_MAP)
+    df["Percentage"] = (df["Percentage"] * 100).round(1)
+    return df
+
+
+def build_adjective_cube(df: pd.DataFrame) -> dict:
+    """
+    Adjektiv × Rating-Level × Land als dichtes Numpy-Array (Prozent, fehlende Kombinationen NaN).
+
+    Rückgabe: dict mit adjectives, levels, countries (Achsenbeschriftungen) und values (3-D Array).
+    """
+    adjectives = list(dict.fromkeys(df["Adjective"]))
+    levels = [level for level in RATING_LEVELS if level in set(df["Rating_Level"])]
+    countries = [c for c in COUNTRY_MAP.values() if c in set(df["Country_clean"])]
+
+    values = np.full((len(adjectives), len(levels), len(countries)), np.nan)
+    rows = df[df["Rating_Level"].isin(levels) & df["Country_clean"].isin(countries)]
+    values[
+        pd.Index(adjectives).get_indexer(rows["Adjective"]),
+        pd.Index(levels).get_indexer(rows["Rating_Level"]),
+        pd.Index(countries).get_indexer(rows["Country_clean"])
+    ] = rows["Percentage"].to_numpy()
+    # Nur lesend verwendet (gemeinsam über Sessions)
+    values.setflags(write=False)
+    return {"adjectives": adjectives, "levels": levels, "countries": countries, "values": values}
+
+
+# Ressource statt Daten-Cache: der Würfel wird nur gelesen, daher ohne Kopie pro Rerun
+@cache_metrics("adjective_cube", st.cache_resource(show_spinner=False, max_entries=1))
+def load_adjective_cube(version):
+    return build_adjective_cube(load_adjective_data())
+
+
+def country_panels(cube: dict, countries: list[str]) -> np.ndarray:
+    """Ein Adjektiv × Level-Panel pro Land (Achse 0 = Land), für Small Multiples."""
+    idx = [cube["countries"].index(name) for name in countries]
+    return np.moveaxis(cube["values"][:, :, idx], 2, 0)
+
+
+def warm():
+    """Würfel für die aktuelle Datenversion vorab berechnen."""
+    load_adjective_cube(data_version())
+
+
+def _heatmap(values: np.ndarray, x: list[str], y: list[str], title: str, zmax: float = 100) -> go.Figure:
+    fig = px.imshow(
+        values, x=x, y=y, text_auto=".1f", aspect="auto",
+        color_continuous_scale="Blues", zmin=0, zmax=zmax,
+        labels=dict(color="%"), title=title
+    )
+    fig.update_layout(height=120 + 60 * len(y), xaxis_title=None, yaxis_title=None)
+    return fig
+
+
+def render():
+    st.title("Adjectives and Rating Levels")
+    st.markdown(
+        "### How well do these adjectives describe your most recent vacation?\n"
+        "Share of respondents per rating level, by adjective and country."
+    )
+    st.caption("ℹ️ This question was only asked in Singapore, the United Kingdom and the United States.")
+
+    cube = load_adjective_cube(data_version())
+    adjectives, levels, countries, values = cube["adjectives"], cube["levels"], cube["countries"], cube["values"]
+    short_levels = [SHORT_LEVELS.get(level, level) for level in levels]
+
+    # Ein Land: Adjektiv × Rating-Level
+    st.subheader("Adjective × Rating Level")
+    country = st.selectbox("Country:", countries, index=0)
+    c = countries.index(country)
+    fig_country = _heatmap(values[:, :, c], short_levels, adjectives, f"{country}: Adjective × Rating Level")
+    show_chart(fig_country)
+    st.download_button(
+        label="📥 Download Heatmap as PNG",
+        data=deferred_export(fig_country),
+        file_name=f"adjective_rating_{country}.png",
+        mime="image/png"
+    )
+
+    # Ein Rating-Level: Adjektiv × Land
+    st.subheader("Adjective × Country")
+    level = st.selectbox("Rating level:", levels, index=len(levels) - 1)
+    lvl = levels.index(level)
+    fig_level = _heatmap(values[:, lvl, :], countries, adjectives, f"“{level}” by country")
+    fig_level.update_xaxes(tickangle=-30)
+    show_chart(fig_level)
+    st.download_button(
+        label="📥 Download Heatmap as PNG",
+        data=deferred_export(fig_level),
+        file_name=f"adjective_country_{SHORT_LEVELS.get(level, level)}.png",
+        mime="image/png"
+    )
+
+    # Small Multiples: ein Panel pro Land, gleiche Farbskala
+    st.subheader("All Countries at a Glance")
+    selected = st.multiselect("Countries:", countries, default=countries)
+    if not selected:
+        st.info("Select at least one country.")
+        return
+    fig_multi = px.imshow(
+        country_panels(cube, selected), x=short_levels, y=adjectives,
+        facet_col=0, facet_col_wrap=4, facet_col_spacing=0.04, facet_row_spacing=0.08,
+        color_continuous_scale="Blues", zmin=0, zmax=100, aspect="auto", labels=dict(color="%")
+    )
+    # Facetten-Titel "facet_col=0" durch Ländernamen ersetzen
+    for annotation in fig_multi.layout.annotations:
+        annotation.text = selected[int(annotation.text.split("=")[1])]
+    rows = -(-len(selected) // 4)
+    fig_multi.update_layout(height=260 * rows + 80)
+    fig_multi.update_xaxes(tickangle=-30, title=None)
+    fig_multi.update_yaxes(title=None)
+    show_chart(fig_multi)
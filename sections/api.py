@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TypedDict
+from urllib.parse import parse_qs, urlsplit
+
+import streamlit as st
+
+from sections.data import data_version
+from sections.renderer import renderer_metrics
+
+API_HOST = "127.0.0.1"
+API_PORT = int(os.environ.get("TOURISM_API_PORT", "8765"))
+# TOURISM_API=0 schaltet den Begleit-Server ab (z. B. für Offline-Renderer und Worker-Prozesse)
+API_ENABLED = os.environ.get("TOURISM_API", "1") != "0"
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_AGE = 60
+
+
+# ------------------------------
+# Antwort-Typen
+# ------------------------------
+class AgreementRecord(TypedDict):
+    country: str
+    country_name: str
+    statement: str
+    statement_label: str
+    agreement: float
+
+
+class QuestionRangeRecord(TypedDict):
+    question: str
+    label: str | None
+    max_range: float
+
+
+class AnswerRangeRecord(TypedDict):
+    question: str
+    answer: str
+    range: float
+
+
+class NpsRecord(TypedDict):
+    country: str
+    nps: float
+
+
+def _number(value):
+    return None if value is None or math.isnan(value) else round(float(value), 1)
+
+
+def _filter(df, column, values):
+    return df[df[column].isin(values)] if values else df
+
+
+# ------------------------------
+# Abfragen (nutzen dieselben gecachten Loader wie das Dashboard)
+# ------------------------------
+def query_agreement(country=None, statement=None) -> list[AgreementRecord]:
+    from sections.attitudes import SHORT_LABELS, agreement_by_country, load_attitudes_data
+
+    df = agreement_by_country(load_attitudes_data())
+    df = _filter(_filter(df, "Country", country), "Statement_Code", statement)
+    return [
+        AgreementRecord(
+            country=row.Country,
+            country_name=row.Country_clean,
+            statement=row.Statement_Code,
+            statement_label=SHORT_LABELS.get(row.Statement_Code, row.Statement_Code),
+            agreement=_number(row.Agreement)
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
+def query_question_ranges(question=None) -> list[QuestionRangeRecord]:
+    from sections.data import load_last_vacation_data
+    from sections.differences import compute_question_ranges
+
+    df = _filter(compute_question_ranges(load_last_vacation_data()), "Question_Code", question)
+    return [
+        QuestionRangeRecord(
+            question=row.Question_Code,
+            label=row.Label if isinstance(row.Label, str) else None,
+            max_range=_number(row.Range)
+        )
+        for row in df.sort_values("Range", ascending=False).itertuples(index=False)
+    ]
+
+
+def query_answer_ranges(question=None) -> list[AnswerRangeRecord]:
+    from sections.data import load_last_vacation_data
+    from sections.differences import compute_answer_ranges
+
+    df = _filter(compute_answer_ranges(load_last_vacation_data()).reset_index(), "Question_Code", question)
+    return [
+        AnswerRangeRecord(question=row.Question_Code, answer=row.Answer, range=_number(row.Range))
+        for row in df[["Question_Code", "Answer", "Range"]].itertuples(index=False)
+    ]
+
+
+def query_nps(country=None) -> list[NpsRecord]:
+    from sections.descriptions_rating import compute_nps, load_rating_data
+
+    df = _filter(compute_nps(load_rating_data()), "Country_clean", country)
+    return [NpsRecord(country=row.Country_clean, nps=_number(row.NPS)) for row in df.itertuples(index=False)]
+
+
+# Pfad -> (Abfragefunktion, erlaubte Parameter)
+ENDPOINTS = {
+    "/api/v1/agreement": (query_agreement, {"country", "statement"}),
+    "/api/v1/question-ranges": (query_question_ranges, {"question"}),
+    "/api/v1/answer-ranges": (query_answer_ranges, {"question"}),
+    "/api/v1/nps": (query_nps, {"country"}),
+}
+
+
+# ------------------------------
+# Antwort-Cache mit ETags
+# ------------------------------
+_response_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _normalize_params(query):
+    """'?country=DE,FR&country=UK' -> {'country': ('DE', 'FR', 'UK')}, sortiert und ohne Duplikate."""
+    params = {}
+    for key, values in parse_qs(query).items():
+        items = {v.strip() for value in values for v in value.split(",") if v.strip()}
+        params[key] = tuple(sorted(items))
+    return params
+
+
+def get_response(path, params):
+    """Liefert (etag, body, cache_hit) für einen Endpunkt; gecacht je Datenversion."""
+    key = (data_version(), path, tuple(sorted(params.items())))
+    with _cache_lock:
+        if key in _response_cache:
+            _response_cache.move_to_end(key)
+            etag, body = _response_cache[key]
+            return etag, body, True
+
+    query, _ = ENDPOINTS[path]
+    records = query(**{name: list(values) for name, values in params.items()})
+    body = json.dumps({"data": records, "count": len(records), "version": key[0]}, allow_nan=False).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    with _cache_lock:
+        _response_cache[key] = (etag, body)
+        while len(_response_cache) > CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+    return etag, body, False
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    server_version = "TourismQueryAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/api/v1/health":
+            return self._send_json(200, {"status": "ok", "version": data_version(), "renderer": renderer_metrics()})
+        if url.path not in ENDPOINTS:
+            return self._send_json(404, {"error": f"Unknown endpoint: {url.path}", "endpoints": sorted(ENDPOINTS)})
+
+        params = _normalize_params(url.query)
+        unknown = set(params) - ENDPOINTS[url.path][1]
+        if unknown:
+            return self._send_json(400, {"error": f"Unknown parameter(s): {', '.join(sorted(unknown))}"})
+
+        try:
+            etag, body, hit = get_response(url.path, params)
+        except Exception as exc:  # Fehler im Datenlayer als 500 melden, Server läuft weiter
+            return self._send_json(500, {"error": str(exc)})
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"private, max-age={CACHE_MAX_AGE}",
+            "X-Cache": "HIT" if hit else "MISS"
+        }
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            return self._send(304, b"", headers)
+        return self._send(200, body, headers)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), {"Cache-Control": "no-store"})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Zugriffe nicht ins Streamlit-Log schreiben
+        pass
+
+
+def start_server(host=API_HOST, port=API_PORT):
+    """Startet die API in einem Daemon-Thread. port=0 wählt einen freien Port (z. B. für Tests)."""
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="tourism-query-api", daemon=True).start()
+    return server
+
+
+@st.cache_resource(show_spinner=False)
+def run_alongside_app():
+    """Einmal pro Serverprozess starten; ist der Port belegt (weitere Replika), wird übersprungen."""
+    if not API_ENABLED:
+        return None
+    try:
+        return start_server()
+    except OSError:
+        return None
+
+
+if __name__ == "__main__":
+    # Eigenständig starten: python -m sections.api --port 8765
+    parser = argparse.ArgumentParser(description="Local JSON query API for the tourism dashboard aggregates")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/api/v1/")
+    server.serve_forever()
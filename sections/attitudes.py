@@ -1,11 +1,230 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from sections.utils import prepare_figure_for_export
+from sections.utils import deferred_export
+from sections.figures import show_chart
+from sections.registry import frame_hash, get_model
+from sections.data import compact_dtypes, display_frame
+from sections.metrics import cache_metrics
+from sections.validation import load_dataset
+
+# Abkürzungen für Statements
+SHORT_LABELS = {
+    "A": "Vacation as joy",
+    "B": "Vacation as stress",
+    "C": "Active vacations",
+    "D": "Relaxed vacations",
+    "E": "Risk-taking",
+    "F": "Familiar places",
+    "G": "Eco-conscious",
+    "H": "Luxury travel"
+}
+
+# Gefittete Modelle je Statement-Auswahl: (Daten-Hash, Codes) -> Modelle, LRU-begrenzt.
+# 256 Plätze reichen für alle 255 nichtleeren Teilmengen von A–H.
+SUBSET_CACHE_SIZE = 256
+_subset_models = OrderedDict()
+_subset_lock = threading.Lock()
+
+# Länder lesbar machen
+COUNTRY_MAP = {
+    "Total": "All Countries", "SG": "Singapore", "UK": "United Kingdom",
+    "US": "United States", "CN": "China", "KR": "South Korea",
+    "UAE": "United Arab Emirates", "BR": "Brazil", "FR": "France",
+    "DE": "Germany", "AU": "Australia"
+}
+
+
+@cache_metrics("attitudes", st.cache_data)
+def load_attitudes_data():
+    df = load_dataset("attitudes")
+    df["Country_clean"] = df["Country"].map(COUNTRY_MAP)
+    return compact_dtypes(df)
+
+
+def agreement_by_country(df: pd.DataFrame) -> pd.DataFrame:
+    """Zustimmung (Agree + Strongly agree, in %) je Land und Statement im Long-Format."""
+    return df[["Country", "Country_clean", "Statement_Code", "Agreement"]].reset_index(drop=True)
+
+
+def build_attitude_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """Länder × Statements (A–H) Matrix der Zustimmungswerte, nur echte Länder."""
+    # Eindeutigkeit und Ländercodes sind beim Einlesen geprüft (sections.validation)
+    df_matrix = display_frame(df).pivot(index="Country", columns="Statement_Code", values="Agreement")
+    return df_matrix.drop(index="Total")
+
+
+def fit_attitude_models(df_matrix: pd.DataFrame) -> dict:
+    """Fittet Standardisierung, PCA (2 Komponenten) und KMeans (k=3) auf die Länder-Matrix."""
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.decomposition import PCA
+    from sklearn.cluster import KMeans
+
+    scaler = StandardScaler().fit(df_matrix)
+    scaled = scaler.transform(df_matrix)
+    return {
+        "scaler": scaler,
+        # Bei nur einem Statement gibt es nur eine Komponente
+        "pca": PCA(n_components=min(2, df_matrix.shape[1])).fit(scaled),
+        "kmeans": KMeans(n_clusters=3, n_init=10, random_state=42).fit(scaled)
+    }
+
+
+def _fit_subsets(df_matrix: pd.DataFrame, subsets: list[tuple[str, ...]]) -> list[tuple[tuple[str, ...], dict]]:
+    """Worker: Modelle für mehrere Statement-Teilmengen nacheinander fitten."""
+    return [(codes, fit_attitude_models(df_matrix[list(codes)])) for codes in subsets]
+
+
+def _remember_subset(key: tuple, models: dict) -> None:
+    with _subset_lock:
+        _subset_models[key] = models
+        _subset_models.move_to_end(key)
+        while len(_subset_models) > SUBSET_CACHE_SIZE:
+            _subset_models.popitem(last=False)
+
+
+def subset_models(df_matrix: pd.DataFrame, codes: tuple[str, ...]) -> dict:
+    """
+    Scaler, PCA und KMeans für eine Auswahl von Statements (Tupel von Codes).
+
+    Alle Statements: wie bisher über die Modell-Registry. Teilmengen: im begrenzten
+    Prozess-Cache, bei Bedarf gefittet (wenige Millisekunden pro Teilmenge).
+    """
+    codes = tuple(sorted(codes))
+    if codes == tuple(df_matrix.columns):
+        return get_model("attitudes_clusters", frame_hash(df_matrix), lambda: fit_attitude_models(df_matrix))
+
+    key = (frame_hash(df_matrix), codes)
+    with _subset_lock:
+        if key in _subset_models:
+            _subset_models.move_to_end(key)
+            return _subset_models[key]
+    models = fit_attitude_models(df_matrix[list(codes)])
+    _remember_subset(key, models)
+    return models
+
+
+def precompute_all_subsets(df_matrix: pd.DataFrame, n_workers: int | None = None) -> int:
+    """
+    Fittet alle nichtleeren Teilmengen der Statements parallel in einem Thread-Pool
+    und legt sie im Teilmengen-Cache ab. Gibt die Anzahl neu berechneter Teilmengen zurück.
+    """
+    data_hash = frame_hash(df_matrix)
+    columns = list(df_matrix.columns)
+    with _subset_lock:
+        missing = [
+            combo
+            for k in range(1, len(columns))  # alle Statements liegen schon in der Registry
+            for combo in combinations(columns, k)
+            if (data_hash, combo) not in _subset_models
+        ]
+    if not missing:
+        return 0
+
+    n_workers = n_workers or min(os.cpu_count() or 1, 8)
+    chunks = [missing[i::n_workers] for i in range(n_workers) if missing[i::n_workers]]
+    if len(chunks) == 1:
+        results = _fit_subsets(df_matrix, chunks[0])
+    else:
+        # Threads statt Prozesse: der Aufruf kommt aus dem Streamlit-Skript (Button), dort würde
+        # spawn app.py neu importieren und fork den mehrfädigen Server kopieren
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="subsets") as pool:
+            results = [r for part in pool.map(_fit_subsets, [df_matrix] * len(chunks), chunks) for r in part]
+    for codes, models in results:
+        _remember_subset((data_hash, codes), models)
+    return len(results)
+
+
+def pca_loadings(models: dict, statement_codes: list[str]) -> pd.DataFrame:
+    """Loadings der Statements auf PC1/PC2 aus dem gefitteten PCA-Modell."""
+    pca = models["pca"]
+    return pd.DataFrame(
+        pca.components_.T,
+        columns=[f"PC{i + 1}" for i in range(pca.n_components_)],
+        index=[SHORT_LABELS.get(c, c) for c in statement_codes]
+    )
+
+
+def radar_matrix(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """Länder (Klarnamen) × Statements der Zustimmung und die Statement-Codes in Reihenfolge."""
+    df_unique = display_frame(df)
+    matrix = df_unique.pivot(index="Country_clean", columns="Statement_Code", values="Agreement")
+    codes = sorted(df_unique["Statement_Code"].unique().tolist())
+    return matrix, codes
+
+
+def statement_choices(df: pd.DataFrame) -> dict[str, str]:
+    """Auswahl-Label ("Vacation as joy (A)") -> Statement-Code, in der Reihenfolge der Daten."""
+    statements = df[["Statement_Code", "Statement_Text"]].drop_duplicates()
+    return {f"{SHORT_LABELS[code]} ({code})": code for code in statements["Statement_Code"]}
+
+
+def statement_agreement(df: pd.DataFrame, code: str) -> pd.DataFrame:
+    """Zustimmung aller Länder zu einem Statement, absteigend."""
+    filtered = display_frame(df[df["Statement_Code"] == code])
+    return filtered.sort_values(by="Agreement", ascending=False)
+
+
+def cluster_projection(df_subset: pd.DataFrame, models: dict) -> pd.DataFrame:
+    """PCA-Koordinaten und KMeans-Cluster je Land (bei einem Statement liegt alles auf PC1)."""
+    pca_data = models["pca"].transform(models["scaler"].transform(df_subset))
+    df_cluster = pd.DataFrame(pca_data, columns=[f"PC{i + 1}" for i in range(pca_data.shape[1])])
+    if "PC2" not in df_cluster:
+        df_cluster["PC2"] = 0.0
+    df_cluster["Country"] = df_subset.index
+    df_cluster["Cluster"] = models["kmeans"].labels_.astype(str)
+    return df_cluster
+
 
+def cluster_centers(df_subset: pd.DataFrame, models: dict) -> pd.DataFrame:
+    """Clusterzentren auf der Originalskala (Zustimmung in %), Spalten mit Kurzlabels."""
+    centers = pd.DataFrame(
+        models["scaler"].inverse_transform(models["kmeans"].cluster_centers_),
+        columns=df_subset.columns
+    ).rename(columns=SHORT_LABELS)
+    centers.index.name = "Cluster"
+    return centers
 
 
+def warm():
+    """Daten, Cluster-Modelle, Bootstrap-Stabilität und Segmente vorab laden."""
+    from sections.stability import load_or_compute_stability
+    from sections.segmentation import load_or_fit_segments
+
+    df_matrix = build_attitude_matrix(load_attitudes_data())
+    get_model("attitudes_clusters", frame_hash(df_matrix), lambda: fit_attitude_models(df_matrix))
+    load_or_compute_stability("attitudes", df_matrix, method="kmeans", n_clusters=3)
+    load_or_fit_segments()
+
+
+def build_profile_radar(profiles: pd.DataFrame, title: str, name_prefix: str = "Cluster") -> go.Figure:
+    """Radar-Chart mit einer Spur pro Zeile (Cluster/Segment), Spalten = Statements in %."""
+    categories = list(profiles.columns)
+    radar_fig = go.Figure()
+
+    for i, row in profiles.iterrows():
+        radar_fig.add_trace(go.Scatterpolar(
+            r=row.values,
+            theta=categories,
+            fill='toself',
+            name=f'{name_prefix} {i}',
+            line=dict(width=2)
+        ))
+
+    radar_fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        title=title,
+        showlegend=True,
+        height=600
+    )
+    return radar_fig
 
 
 def render(_):
@@ -14,28 +233,11 @@ def render(_):
     # ------------------------------
     # 1. Daten einlesen
     # ------------------------------
-    df = pd.read_csv("data/Cleaned_Tourism_Attitudes.csv")
-
-    # Länder lesbar machen
-    country_map = {
-        "Total": "All Countries", "SG": "Singapore", "UK": "United Kingdom",
-        "US": "United States", "CN": "China", "KR": "South Korea",
-        "UAE": "United Arab Emirates", "BR": "Brazil", "FR": "France",
-        "DE": "Germany", "AU": "Australia"
-    }
-    df["Country_clean"] = df["Country"].map(country_map)
+    df = load_attitudes_data()
+    country_map = COUNTRY_MAP
 
     # Abkürzungen für Statements (neu)
-    short_labels = {
-        "A": "Vacation as joy",
-        "B": "Vacation as stress",
-        "C": "Active vacations",
-        "D": "Relaxed vacations",
-        "E": "Risk-taking",
-        "F": "Familiar places",
-        "G": "Eco-conscious",
-        "H": "Luxury travel"
-    }
+    short_labels = SHORT_LABELS
 
     # ------------------------------
     # 2. Radar Chart mit Multi-Select
@@ -52,12 +254,7 @@ def render(_):
         default=default_selection
     )
 
-    # Duplikate entfernen
-    df_unique = df.drop_duplicates(subset=["Country_clean", "Statement_Code"])
-    radar_df = df_unique.pivot(index="Country_clean", columns="Statement_Code", values="Agreement")
-
-    statements = df_unique[["Statement_Code", "Statement_Text"]].drop_duplicates().sort_values("Statement_Code")
-    codes = statements["Statement_Code"].tolist()
+    radar_df, codes = radar_matrix(df)
     theta = [f"{short_labels[c]} ({c})" for c in codes]
 
     fig = go.Figure()
@@ -88,9 +285,9 @@ def render(_):
         legend_orientation="h",
         legend=dict(x=0.5, y=-0.2, xanchor='center')
     )
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig)
 
-    radar_png = prepare_figure_for_export(fig)
+    radar_png = deferred_export(fig)
     st.download_button(
         label="⬇️ Download Radar Chart (PNG)",
         data=radar_png,
@@ -103,21 +300,11 @@ def render(_):
     # ------------------------------
     st.subheader("Compare a single statement across countries")
 
-    # Duplikate vermeiden
-    df_nodup = df.drop_duplicates(subset=["Country_clean", "Statement_Code"])
-
     # Dropdown mit sauberen Labels (kein doppeltes (F) (F))
-    statement_options = df_nodup[["Statement_Code", "Statement_Text"]].drop_duplicates()
-    label_map = {
-        f"{short_labels[row['Statement_Code']]} ({row['Statement_Code']})": row["Statement_Code"]
-        for _, row in statement_options.iterrows()
-    }
+    label_map = statement_choices(df)
 
     selection = st.selectbox("Select a statement:", list(label_map.keys()))
-    selected_code = label_map[selection]
-
-    filtered = df[df["Statement_Code"] == selected_code].copy()
-    filtered = filtered.sort_values(by="Agreement", ascending=False)
+    filtered = statement_agreement(df, label_map[selection])
 
     fig_bar = px.bar(
         filtered,
@@ -128,7 +315,7 @@ def render(_):
         title=f"Agreement with: {selection}"
     )
     fig_bar.update_layout(showlegend=False)
-    st.plotly_chart(fig_bar, use_container_width=True)
+    show_chart(fig_bar)
 
     # ------------------------------
     # 4. Legende unten anzeigen
@@ -150,34 +337,33 @@ def render(_):
     # --- 5. Country Clusters Based on Vacation Attitudes ---
     st.subheader("🌍 Country Clusters Based on Vacation Attitudes")
 
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.decomposition import PCA
-    from sklearn.cluster import KMeans
-
 
     # Daten vorbereiten
-    df_clu = df.drop_duplicates(subset=["Country", "Statement_Code"])
-    df_matrix = df_clu.pivot(index="Country", columns="Statement_Code", values="Agreement").dropna()
-
-    # Länder filtern (nur echte Länder)
-    df_matrix = df_matrix[~df_matrix.index.str.contains("Cluster|Total|nan", case=False)]
-
-    # Standardisierung
-    scaler = StandardScaler()
-    scaled = scaler.fit_transform(df_matrix)
+    df_matrix = build_attitude_matrix(df)
+
+    # Statements für das Clustering auswählen (Standard: alle)
+    statement_labels = {f"{short_labels[c]} ({c})": c for c in df_matrix.columns}
+    chosen = st.multiselect(
+        "Statements used for clustering:",
+        options=list(statement_labels),
+        default=list(statement_labels),
+        key="cluster_statements"
+    )
+    codes = tuple(statement_labels[label] for label in chosen)
+    if not codes:
+        st.info("No statement selected – clustering on all statements.")
+        codes = tuple(df_matrix.columns)
 
-    # PCA zur Visualisierung
-    pca = PCA(n_components=2)
-    pca_data = pca.fit_transform(scaled)
+    if st.button("⚡ Precompute all statement combinations", key="precompute_subsets"):
+        with st.spinner("Fitting all 255 statement combinations..."):
+            created = precompute_all_subsets(df_matrix)
+        st.caption(f"{created} combinations fitted; switching statements is now instant.")
 
-    # KMeans Clustering (k=3)
-    kmeans = KMeans(n_clusters=3, n_init=10, random_state=42)
-    clusters = kmeans.fit_predict(scaled)
+    df_subset = df_matrix[list(sorted(codes))]
 
-    # DataFrame für Scatterplot
-    df_cluster = pd.DataFrame(pca_data, columns=["PC1", "PC2"])
-    df_cluster["Country"] = df_matrix.index
-    df_cluster["Cluster"] = clusters.astype(str)
+    # Scaler, PCA und KMeans je Auswahl (alle Statements: Modell-Registry, sonst Teilmengen-Cache)
+    models = subset_models(df_matrix, codes)
+    df_cluster = cluster_projection(df_subset, models)
 
     # Cluster Scatterplot visualisieren
     fig = px.scatter(
@@ -206,10 +392,10 @@ def render(_):
     )
 
     # Anzeigen
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig)
 
     # Export als PNG
-    cluster_png = prepare_figure_for_export(
+    cluster_png = deferred_export(
         fig,
         title_size=28,
         label_size=22,
@@ -229,24 +415,7 @@ def render(_):
 
 
     # Clusterzentren auf Originalskala
-    original_centers = pd.DataFrame(
-        scaler.inverse_transform(kmeans.cluster_centers_),
-        columns=df_matrix.columns
-    )
-
-    # Klartext-Labels
-    short_labels = {
-        "A": "Vacation as joy",
-        "B": "Vacation as stress",
-        "C": "Active vacations",
-        "D": "Relaxed vacations",
-        "E": "Risk-taking",
-        "F": "Familiar places",
-        "G": "Eco-conscious",
-        "H": "Luxury travel"
-    }
-    original_centers.rename(columns=short_labels, inplace=True)
-    original_centers.index.name = "Cluster"
+    original_centers = cluster_centers(df_subset, models)
 
     st.markdown("### 🔍 Cluster Characteristics (Average Agreement per Statement)")
     st.dataframe(original_centers.style.highlight_max(axis=0, color="lightgreen"))
@@ -256,28 +425,11 @@ def render(_):
 
 
     # Clusterzentren in Originalskala verwenden
-    categories = list(original_centers.columns)
-    radar_fig = go.Figure()
-
-    for i, row in original_centers.iterrows():
-        radar_fig.add_trace(go.Scatterpolar(
-            r=row.values,
-            theta=categories,
-            fill='toself',
-            name=f'Cluster {i}',
-            line=dict(width=2)
-        ))
-
-    radar_fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-        title="Average Agreement by Cluster (Radar View)",
-        showlegend=True,
-        height=600
-    )
-    st.plotly_chart(radar_fig, use_container_width=True)
+    radar_fig = build_profile_radar(original_centers, "Average Agreement by Cluster (Radar View)")
+    show_chart(radar_fig)
 
     # Download als PNG für Radar Chart
-    radar_png = prepare_figure_for_export(
+    radar_png = deferred_export(
         radar_fig,
         title_size=28,
         label_size=22,
@@ -307,18 +459,24 @@ def render(_):
     The radar chart above shows the **mean agreement levels** for each cluster — highlighting typical attitude patterns.
     """)
 
-    # PCA-Loadings (einklappbar)
-    loadings = pd.DataFrame({
-        "PC1": [0.399, -0.228, 0.414, 0.295, 0.404, 0.330, 0.306, 0.407],
-        "PC2": [0.188, 0.549, -0.239, 0.344, -0.049, 0.523, -0.453, 0.082]
-    }, index=[
-        "Vacation as joy", "Vacation as stress", "Active vacations", "Relaxed vacations",
-        "Risk-taking", "Familiar places", "Eco-conscious", "Luxury travel"
-    ])
+    # PCA-Loadings (einklappbar), direkt aus dem gefitteten Modell
+    loadings = pca_loadings(models, list(df_subset.columns))
 
     with st.expander("🔍 View PCA Loadings (Variable Influence on PC1/PC2)"):
         st.dataframe(loadings.round(3).style.highlight_max(axis=0, color="lightgreen"))
 
+    # Bootstrap-Stabilität der KMeans-Cluster
+    from sections.stability import render_stability
+
+    with st.expander("🎲 Cluster Stability (Bootstrap Resampling)"):
+        render_stability("attitudes", df_matrix, method="kmeans", n_clusters=3)
+
+    # --- 7. Segmentierung auf Befragtenebene ---
+    from sections.segmentation import render_segments
+
+    with st.expander("👤 Respondent-Level Segments (MiniBatchKMeans)"):
+        render_segments(short_labels)
+
 
 
 
@@ -0,0 +1,256 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from sections.attitudes import COUNTRY_MAP, SHORT_LABELS, build_attitude_matrix, load_attitudes_data
+from sections.data import data_version, load_last_vacation_data
+from sections.differences import QUESTION_LABELS
+from sections.figures import show_chart
+from sections.utils import deferred_export
+
+ATTITUDES = "Attitudes"
+# Startauswahl der Detailansicht: umweltbewusste Einstellung gegen Urlaub im eigenen Land
+DEFAULT_PAIR = ((ATTITUDES, "Eco-conscious"), ("QWhere", "Domestically, within my country"))
+TOP_PAIRS = 20
+
+
+def build_feature_matrix(last_vacation: pd.DataFrame, attitudes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Länder × Merkmale: Anteile aller (Frage, Antwort)-Paare der letzten Reise und Zustimmung
+    (Agree + Strongly agree) zu den Einstellungs-Statements. Spalten (Gruppe, Merkmal), Gruppe
+    ist der Fragecode bzw. "Attitudes"; nur Länder, die in beiden Datensätzen vorkommen.
+    """
+    from sections.Last_Holiday import build_behavior_matrix
+
+    behavior = build_behavior_matrix(last_vacation)
+    agreement = build_attitude_matrix(attitudes)
+    agreement.columns = pd.MultiIndex.from_tuples(
+        [(ATTITUDES, SHORT_LABELS.get(code, code)) for code in agreement.columns]
+    )
+    behavior.columns = behavior.columns.set_levels(
+        [level.astype(str) for level in behavior.columns.levels]
+    )
+    matrix = behavior.join(agreement, how="inner")
+    matrix.columns.names = ["Group", "Item"]
+    return matrix
+
+
+def correlation_matrix(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pearson-Korrelation aller Merkmalspaare in einem Matrixprodukt: Spalten standardisieren,
+    dann R = Zᵀ Z / n. Merkmale ohne Streuung über die Länder (überall gleich) fallen weg.
+    """
+    x = matrix.to_numpy(dtype=np.float64)
+    std = x.std(axis=0)
+    keep = std > 0
+    z = (x[:, keep] - x[:, keep].mean(axis=0)) / std[keep]
+    r = np.clip(z.T @ z / len(z), -1.0, 1.0)
+    np.fill_diagonal(r, 1.0)
+    columns = matrix.columns[keep]
+    return pd.DataFrame(r, index=columns, columns=columns)
+
+
+def correlation_pvalues(corr: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Zweiseitige p-Werte (t-Test, n - 2 Freiheitsgrade) für alle Einträge der Korrelationsmatrix."""
+    from scipy.stats import t
+
+    r = corr.to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_values = r * np.sqrt((n - 2) / (1.0 - np.square(r)))
+    p = 2 * t.sf(np.abs(t_values), n - 2)
+    return pd.DataFrame(np.nan_to_num(p, nan=0.0), index=corr.index, columns=corr.columns)
+
+
+def cluster_order(corr: pd.DataFrame) -> np.ndarray:
+    """Reihenfolge der Merkmale nach hierarchischem Clustering (Average Linkage, Distanz 1 - r)."""
+    from scipy.cluster.hierarchy import leaves_list, linkage, optimal_leaf_ordering
+    from scipy.spatial.distance import squareform
+
+    if len(corr) < 3:
+        return np.arange(len(corr))
+    distances = squareform(1.0 - corr.to_numpy(), checks=False)
+    tree = linkage(distances, method="average")
+    return leaves_list(optimal_leaf_ordering(tree, distances))
+
+
+def strongest_pairs(corr: pd.DataFrame, pvalues: pd.DataFrame, n: int = TOP_PAIRS, across_groups: bool = True) -> pd.DataFrame:
+    """
+    Die n Paare mit dem größten |r| aus dem oberen Dreieck. across_groups blendet Paare derselben
+    Frage aus – deren Anteile summieren sich zu 100 % und hängen schon deshalb negativ zusammen.
+    """
+    i, j = np.triu_indices(len(corr), k=1)
+    groups = corr.index.get_level_values("Group")
+    if across_groups:
+        mask = groups[i] != groups[j]
+        i, j = i[mask], j[mask]
+    r = corr.to_numpy()[i, j]
+    top = np.argsort(-np.abs(r), kind="stable")[:n]
+    i, j = i[top], j[top]
+    return pd.DataFrame({
+        "Feature A": [feature_label(key) for key in corr.index[i]],
+        "Feature B": [feature_label(key) for key in corr.index[j]],
+        "r": r[top].round(2),
+        "p": pvalues.to_numpy()[i, j].round(4)
+    })
+
+
+def feature_label(key) -> str:
+    group, item = key
+    if group == ATTITUDES:
+        return f"Agree: {item}"
+    return f"{QUESTION_LABELS.get(group, group)}: {item}"
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_correlations(version):
+    """Merkmalsmatrix, Korrelationen, p-Werte und Cluster-Reihenfolge pro Datenversion (nur lesend verwendet)."""
+    matrix = build_feature_matrix(load_last_vacation_data(), load_attitudes_data())
+    corr = correlation_matrix(matrix)
+    return {
+        "matrix": matrix[corr.columns],
+        "corr": corr,
+        "pvalues": correlation_pvalues(corr, len(matrix)),
+        "order": cluster_order(corr)
+    }
+
+
+def build_correlation_heatmap(corr: pd.DataFrame) -> go.Figure:
+    """Korrelationsmatrix in der gegebenen Reihenfolge; auf 2 Nachkommastellen gerundet (kleinere Figure)."""
+    labels = [feature_label(key) for key in corr.index]
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy().round(2), x=labels, y=labels,
+        colorscale="RdBu", zmin=-1, zmax=1, zmid=0, colorbar=dict(title="r"),
+        hovertemplate="%{y}<br>%{x}<br>r = %{z:.2f}<extra></extra>"
+    ))
+    size = min(400 + 11 * len(labels), 1400)
+    fig.update_layout(
+        title="Correlation of Country Shares Across Questions and Attitudes (clustered)",
+        height=size, margin=dict(t=60, l=20, r=20, b=20),
+        xaxis=dict(showticklabels=len(labels) <= 40, tickangle=-45),
+        yaxis=dict(autorange="reversed", tickfont=dict(size=9))
+    )
+    return fig
+
+
+def build_pair_scatter(matrix: pd.DataFrame, a, b, r: float) -> go.Figure:
+    """Länder als Punkte für ein Merkmalspaar, mit Regressionsgerade."""
+    df = pd.DataFrame({
+        "x": matrix[a].to_numpy(dtype=np.float64),
+        "y": matrix[b].to_numpy(dtype=np.float64),
+        "Country": [COUNTRY_MAP.get(code, code) for code in matrix.index]
+    })
+    fig = px.scatter(
+        df, x="x", y="y", text="Country",
+        labels={"x": f"{feature_label(a)} (%)", "y": f"{feature_label(b)} (%)"},
+        title=f"r = {r:.2f} across {len(df)} countries"
+    )
+    fig.update_traces(textposition="top center", marker=dict(size=12))
+    slope, intercept = np.polyfit(df["x"], df["y"], 1)
+    xs = np.array([df["x"].min(), df["x"].max()])
+    fig.add_trace(go.Scatter(
+        x=xs, y=slope * xs + intercept, mode="lines", line=dict(dash="dash", color="gray"),
+        name="Linear fit", hoverinfo="skip"
+    ))
+    fig.update_layout(height=550, showlegend=False)
+    return fig
+
+
+def _critical_r(n, alpha=0.05):
+    """Kleinstes |r|, das bei n Ländern zweiseitig signifikant ist."""
+    from scipy.stats import t
+
+    t_crit = t.ppf(1 - alpha / 2, n - 2)
+    return t_crit / np.sqrt(n - 2 + t_crit ** 2)
+
+
+def warm():
+    """Korrelationen und Cluster-Reihenfolge vorab berechnen."""
+    load_correlations(data_version())
+
+
+def render():
+    st.subheader("🔗 Cross-question Correlations")
+    st.markdown(
+        "How do countries' answer shares move together? Each cell is the correlation (Pearson r) "
+        "between two features across countries: the share of an answer to a last-vacation question, "
+        "or the agreement with an attitude statement. Features are ordered by hierarchical "
+        "clustering, so blocks of red or blue show groups of answers that rise and fall together."
+    )
+
+    data = load_correlations(data_version())
+    corr, pvalues, matrix = data["corr"], data["pvalues"], data["matrix"]
+    n_countries = len(matrix)
+
+    groups = list(dict.fromkeys(corr.index.get_level_values("Group")))
+    selected_groups = st.multiselect(
+        "Questions and attitudes to include:", groups, default=groups,
+        format_func=lambda g: g if g == ATTITUDES else QUESTION_LABELS.get(g, g),
+        key="corr_groups"
+    )
+    if not selected_groups:
+        st.info("Select at least one question.")
+        return
+
+    if selected_groups == groups:
+        ordered = corr.iloc[data["order"], data["order"]]
+    else:
+        subset = corr.loc[corr.index.get_level_values("Group").isin(selected_groups)]
+        subset = subset[subset.index]
+        order = cluster_order(subset)
+        ordered = subset.iloc[order, order]
+
+    fig = build_correlation_heatmap(ordered)
+    show_chart(fig, key="corr_heatmap")
+    st.download_button(
+        label="📥 Download Heatmap as PNG",
+        data=deferred_export(fig, width=1800, height=1800),
+        file_name="cross_question_correlations.png",
+        mime="image/png"
+    )
+    st.caption(
+        f"⚠️ Correlations across {n_countries} countries: with so few data points only |r| above about "
+        f"{_critical_r(n_countries):.2f} is significant at p < 0.05, and correlation says nothing about "
+        "individual respondents. Answers to the same question are negatively related by construction "
+        "(shares add up to 100%)."
+    )
+
+    st.subheader("🔍 Drill-down")
+    keys = {feature_label(key): key for key in corr.index}
+    labels = list(keys)
+    defaults = [feature_label(key) for key in DEFAULT_PAIR]
+    c1, c2 = st.columns(2)
+    with c1:
+        label_a = st.selectbox(
+            "Feature A", labels, index=labels.index(defaults[0]) if defaults[0] in labels else 0, key="corr_feature_a"
+        )
+    with c2:
+        label_b = st.selectbox(
+            "Feature B", labels, index=labels.index(defaults[1]) if defaults[1] in labels else 1, key="corr_feature_b"
+        )
+    a, b = keys[label_a], keys[label_b]
+    r, p = corr.loc[[a], [b]].iat[0, 0], pvalues.loc[[a], [b]].iat[0, 0]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Correlation r", f"{r:.2f}")
+    m2.metric("p-value", f"{p:.3f}")
+    m3.metric("Countries", n_countries)
+    show_chart(build_pair_scatter(matrix, a, b, r), key="corr_scatter")
+
+    st.markdown(f"**Strongest correlates of _{label_a}_** (other questions only)")
+    others = corr.index.get_level_values("Group") != a[0]
+    correlates = corr.loc[others, [a]].iloc[:, 0]
+    correlates = correlates.reindex(correlates.abs().sort_values(ascending=False).index).head(10)
+    st.dataframe(
+        pd.DataFrame({
+            "Feature": [feature_label(key) for key in correlates.index],
+            "r": correlates.to_numpy().round(2),
+            "p": pvalues.loc[correlates.index, [a]].iloc[:, 0].to_numpy().round(4)
+        }),
+        use_container_width=True, hide_index=True
+    )
+
+    with st.expander("📋 Strongest pairs overall"):
+        across = st.checkbox("Only pairs from different questions", True, key="corr_across_groups")
+        st.dataframe(strongest_pairs(corr, pvalues, across_groups=across), use_container_width=True, hide_index=True)
+
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from sections.data import data_version, load_last_vacation_data
+from sections.figures import show_chart
+
+N_COMPONENTS = 2
+# Ab dieser Matrixgröße (kleinere Dimension) randomisierte statt vollständiger SVD
+RANDOMIZED_SVD_MIN_DIM = 200
+
+
+def _truncated_svd(matrix, n_components):
+    """
+    Erste n Singulärwerte/-vektoren.
+
+    Bei wenigen Ländern (Zeilen) ist die dünne SVD linear in der Spaltenzahl und damit auch für
+    tausende Antwortspalten billig; erst wenn beide Dimensionen groß sind, randomisiert.
+    """
+    if min(matrix.shape) >= RANDOMIZED_SVD_MIN_DIM:
+        from sklearn.utils.extmath import randomized_svd
+
+        return randomized_svd(matrix, n_components, random_state=42)
+    u, s, vt = np.linalg.svd(matrix, full_matrices=False)
+    return u[:, :n_components], s[:n_components], vt[:n_components]
+
+
+def correspondence_analysis(table, n_components=N_COMPONENTS):
+    """
+    Korrespondenzanalyse einer nichtnegativen Kontingenztabelle (Zeilen × Spalten).
+
+    Zeilen- und Spaltenkoordinaten (Hauptkoordinaten) entstehen in einem Durchgang aus der SVD
+    der standardisierten Residuen S = D_r^-1/2 (P - r c^T) D_c^-1/2.
+
+    Rückgabe: dict mit rows, columns (DataFrames mit Dim1..n, Masse und Beitrag) und inertia
+    (Anteil der Gesamtträgheit je Dimension).
+    """
+    table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+    n = table.to_numpy(dtype=np.float64)
+    p = n / n.sum()
+    r, c = p.sum(axis=1), p.sum(axis=0)
+    s = (p - np.outer(r, c)) / np.sqrt(np.outer(r, c))
+
+    k = min(n_components, min(s.shape) - 1)
+    u, sigma, vt = _truncated_svd(s, k)
+    total_inertia = np.square(s).sum()
+
+    dims = [f"Dim{i + 1}" for i in range(k)]
+    row_coords = u * sigma / np.sqrt(r)[:, None]
+    col_coords = vt.T * sigma / np.sqrt(c)[:, None]
+
+    rows = pd.DataFrame(row_coords, index=table.index, columns=dims)
+    rows["Mass"] = r
+    rows["Contribution"] = np.square(u).sum(axis=1)
+    columns = pd.DataFrame(col_coords, index=table.columns, columns=dims)
+    columns["Mass"] = c
+    # Beitrag der Spalte zu den dargestellten Dimensionen (Summe der quadrierten Singulärvektoren)
+    columns["Contribution"] = np.square(vt.T).sum(axis=1)
+    return {
+        "rows": rows,
+        "columns": columns,
+        "inertia": np.square(sigma) / total_inertia
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_correspondence(version):
+    """Korrespondenzanalyse Land × (Frage, Antwort) pro Datenversion (nur lesend verwendet)."""
+    from sections.Last_Holiday import build_behavior_matrix
+
+    return correspondence_analysis(build_behavior_matrix(load_last_vacation_data()))
+
+
+def build_biplot(ca, n_answers, question_labels=None):
+    """
+    Symmetrischer Biplot: Länder als beschriftete Punkte, dazu die n Antworten mit dem größten Beitrag
+    über alle Fragen hinweg, farbig nach Frage. Braucht mindestens zwei Dimensionen (Dim1, Dim2).
+    """
+    rows, columns = ca["rows"], ca["columns"]
+    top = columns.nlargest(n_answers, "Contribution").reset_index()
+    top.columns = ["Question_Code", "Answer"] + list(top.columns[2:])
+    if question_labels:
+        top["Question"] = top["Question_Code"].map(question_labels).fillna(top["Question_Code"])
+    else:
+        top["Question"] = top["Question_Code"]
+
+    fig = px.scatter(
+        top, x="Dim1", y="Dim2", color="Question", hover_name="Answer",
+        hover_data={"Dim1": ":.2f", "Dim2": ":.2f", "Question": False, "Contribution": ":.3f"},
+        opacity=0.7
+    )
+    fig.update_traces(marker=dict(size=8, symbol="diamond"))
+    fig.add_trace(go.Scatter(
+        x=rows["Dim1"], y=rows["Dim2"], mode="markers+text", text=rows.index,
+        textposition="top center", name="Country",
+        marker=dict(size=13, color="black"), hovertemplate="%{text}<extra></extra>"
+    ))
+    inertia = ca["inertia"]
+    fig.update_layout(
+        title="Correspondence Analysis: Countries and Answers",
+        xaxis_title=f"Dim 1 ({100 * inertia[0]:.1f}% of inertia)",
+        yaxis_title=f"Dim 2 ({100 * inertia[1]:.1f}% of inertia)",
+        height=650
+    )
+    fig.add_hline(y=0, line_width=1, line_color="lightgray")
+    fig.add_vline(x=0, line_width=1, line_color="lightgray")
+    return fig
+
+
+def render_correspondence(question_labels=None):
+    ca = load_correspondence(data_version())
+    if "Dim2" not in ca["rows"]:
+        # Rang < 3 (z. B. nach Filtern nur zwei Länder): kein zweidimensionaler Biplot möglich
+        st.info("Not enough countries or answers for a two-dimensional correspondence map.")
+        return
+    n_total = len(ca["columns"])
+    n_answers = st.slider(
+        "Answers shown (strongest contribution first):", 5, n_total, min(30, n_total), key="ca_answers"
+    )
+    show_chart(build_biplot(ca, n_answers, question_labels))
+    st.caption(
+        "Countries close to each other answer similarly; an answer close to a country is over-represented "
+        f"there. {n_total} answer columns, {len(ca['rows'])} countries."
+    )
@@ -0,0 +1,220 @@
+import hashlib
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from sections.figures import show_chart
+from sections.sql_engine import TABLES, QueryError, get_engine, normalize_sql, quote_identifier, quote_literal, run_query
+from sections.utils import deferred_export
+
+AGGREGATIONS = {"Average": "AVG", "Sum": "SUM", "Minimum": "MIN", "Maximum": "MAX", "Count": "COUNT"}
+MAX_FILTERS = 3
+NO_COLUMNS = "(none)"
+
+# Startansicht je Tabelle (Zeilen, Spalten, Kennzahl, Filter); sonst Land × erste Textspalte
+DEFAULT_VIEWS = {
+    "last_vacation": ("Country_clean", "Answer", "Percentage", {"Question_Code": ["QAccom"]}),
+    "attitudes": ("Country_clean", "Statement_Code", "Agreement", {}),
+    "descriptions": ("Country_clean", "Adjective", "Percentage", {}),
+    "ratings": ("Country_clean", "Rating", "Percentage", {}),
+    "adjectives": ("Adjective", "Rating_Level", "Percentage", {"Country_clean": ["Total"]}),
+}
+
+# Die Daten sind Länderanteile, keine Befragten – bedingte Anteile ("Hotel unter Familienreisenden")
+# lassen sich nicht berechnen, aber Anteile verschiedener Fragen je Land nebeneinanderstellen
+EXAMPLE_QUERY = """SELECT Country_clean,
+       SUM(Percentage) FILTER (WHERE Question_Code = 'QAccom' AND Answer = 'Hotel or resort') AS hotel_or_resort,
+       SUM(Percentage) FILTER (WHERE Question_Code = 'QWhowith' AND Answer LIKE 'With % family') AS with_family
+FROM last_vacation
+WHERE Country_clean <> 'Total'
+GROUP BY Country_clean
+ORDER BY hotel_or_resort DESC"""
+
+
+def build_crosstab_sql(table, rows, columns, measure, aggregation, filters):
+    """
+    Aggregations-Abfrage für die Kreuztabelle. Bezeichner in Anführungszeichen, Filterwerte als
+    maskierte Literale (keine Parameter: der Abfragetext ist zugleich der Cache-Schlüssel).
+    """
+    dimensions = [rows] if columns == NO_COLUMNS else [rows, columns]
+    select = [f"{quote_identifier(d)} AS {quote_identifier(d)}" for d in dimensions]
+    function = AGGREGATIONS[aggregation]
+    value = f"{function}({quote_identifier(measure)})"
+    select.append(f"ROUND({value}, 1) AS value" if function != "COUNT" else f"{value} AS value")
+    sql = f"SELECT {', '.join(select)}\nFROM {quote_identifier(table)}"
+    conditions = [
+        f"{quote_identifier(column)} IN ({', '.join(quote_literal(v) for v in values)})"
+        for column, values in filters if values
+    ]
+    if conditions:
+        sql += "\nWHERE " + "\n  AND ".join(conditions)
+    positions = ", ".join(str(i + 1) for i in range(len(dimensions)))
+    return f"{sql}\nGROUP BY {positions}\nORDER BY {positions}"
+
+
+def crosstab_pivot(result, rows, columns):
+    """Ergebnis der Abfrage als Matrix Zeilen × Spalten (ohne Spaltendimension: eine Spalte "value")."""
+    if columns == NO_COLUMNS:
+        return result.set_index(rows)[["value"]]
+    return result.pivot(index=rows, columns=columns, values="value")
+
+
+def distinct_values(table, column):
+    """Werte einer Spalte für die Filter – über run_query, also ebenfalls gecacht."""
+    result, _ = run_query(f"SELECT DISTINCT {quote_identifier(column)} FROM {quote_identifier(table)} ORDER BY 1")
+    return result.iloc[:, 0].dropna().tolist()
+
+
+def warm():
+    """Engine laden und die Startansicht vorab abfragen."""
+    engine = get_engine()
+    table = "last_vacation"
+    rows, columns, measure, filters = DEFAULT_VIEWS[table]
+    if table in engine.schema:
+        run_query(build_crosstab_sql(table, rows, columns, measure, "Average", list(filters.items())))
+
+
+def _crosstab_heatmap(pivot, title):
+    fig = px.imshow(
+        pivot.values, x=[str(c) for c in pivot.columns], y=[str(i) for i in pivot.index],
+        text_auto=".1f", aspect="auto", color_continuous_scale="Blues", title=title
+    )
+    fig.update_layout(height=min(160 + 32 * len(pivot.index), 1400), xaxis_title=None, yaxis_title=None)
+    fig.update_xaxes(tickangle=-30)
+    return fig
+
+
+def render():
+    st.subheader("🧮 Crosstab Builder")
+    st.markdown(
+        "Build your own cut of the survey data: pick a table, the dimensions for rows and columns, "
+        "a measure and filters. The query runs on an embedded SQL engine; identical queries are "
+        "answered from the cache."
+    )
+    st.caption(
+        "ℹ️ All tables hold country-level shares (% of respondents), not individual answers. "
+        "Conditional cuts such as *hotel among those travelling with family* need respondent-level "
+        "data; you can put shares of different questions side by side per country (see the example below)."
+    )
+
+    engine = get_engine()
+    tables = [name for name in TABLES if name in engine.schema]
+    table = st.selectbox(
+        "Table", tables, format_func=lambda name: f"{name} – {TABLES[name][2]}", key="crosstab_table"
+    )
+    schema = engine.schema[table]
+    text_columns = [column for column, kind in schema if kind == "text"]
+    dimensions = [column for column, _ in schema]
+    measures = [column for column, kind in schema if kind == "number"]
+    default_rows, default_columns, default_measure, default_filters = DEFAULT_VIEWS.get(
+        table, (text_columns[0], NO_COLUMNS, measures[0], {})
+    )
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        rows = st.selectbox("Rows", dimensions, index=dimensions.index(default_rows), key=f"crosstab_rows_{table}")
+    column_options = [NO_COLUMNS] + [d for d in dimensions if d != rows]
+    with c2:
+        columns = st.selectbox(
+            "Columns", column_options,
+            index=column_options.index(default_columns) if default_columns in column_options else 0,
+            key=f"crosstab_columns_{table}"
+        )
+    with c3:
+        measure = st.selectbox("Measure", measures, index=measures.index(default_measure), key=f"crosstab_measure_{table}")
+    with c4:
+        aggregation = st.selectbox("Aggregation", list(AGGREGATIONS), key=f"crosstab_aggregation_{table}")
+
+    filters = []
+    filter_defaults = list(default_filters.items())
+    with st.expander("Filters", expanded=bool(filter_defaults)):
+        for i in range(MAX_FILTERS):
+            default_column, default_values = filter_defaults[i] if i < len(filter_defaults) else (NO_COLUMNS, [])
+            options = [NO_COLUMNS] + text_columns
+            f1, f2 = st.columns([1, 3])
+            with f1:
+                column = st.selectbox(
+                    f"Filter {i + 1}", options, index=options.index(default_column), key=f"crosstab_filter_{table}_{i}"
+                )
+            if column == NO_COLUMNS:
+                continue
+            values = distinct_values(table, column)
+            with f2:
+                selected = st.multiselect(
+                    f"Values of {column}", values,
+                    default=[v for v in default_values if v in values] if column == default_column else [],
+                    key=f"crosstab_filter_values_{table}_{i}_{column}"
+                )
+            filters.append((column, selected))
+
+    sql = build_crosstab_sql(table, rows, columns, measure, aggregation, filters)
+    st.code(sql, language="sql")
+
+    try:
+        result, truncated = run_query(sql)
+    except QueryError as exc:
+        st.error(f"❌ {exc}")
+        return
+
+    if result.empty:
+        st.info("No rows match the selected filters.")
+    else:
+        pivot = crosstab_pivot(result, rows, columns)
+        title = f"{aggregation} of {measure} by {rows}" + ("" if columns == NO_COLUMNS else f" × {columns}")
+        fig = _crosstab_heatmap(pivot, title)
+        show_chart(fig, key="crosstab_heatmap")
+        st.download_button(
+            label="📥 Download Heatmap as PNG",
+            data=deferred_export(fig),
+            file_name=f"crosstab_{table}.png",
+            mime="image/png"
+        )
+        st.dataframe(pivot, use_container_width=True)
+        if truncated:
+            st.warning("The query returned more rows than shown; narrow it down with filters.")
+        st.download_button(
+            label="📥 Download Crosstab (CSV)",
+            data=pivot.to_csv().encode("utf-8"),
+            file_name=f"crosstab_{table}.csv",
+            mime="text/csv"
+        )
+
+    with st.expander("✏️ Edit as SQL"):
+        st.markdown(
+            "Read-only `SELECT` queries over the tables "
+            + ", ".join(f"`{name}` ({engine.rows[name]} rows)" for name in tables)
+            + f". Results are limited to the first rows; the engine is {engine.backend}."
+        )
+        # Schlüssel hängt an der erzeugten Abfrage: geänderte Auswahl oben setzt den Text zurück
+        query = st.text_area(
+            "SQL", value=sql, height=180,
+            key=f"crosstab_sql_{hashlib.sha1(sql.encode()).hexdigest()[:12]}"
+        )
+        if normalize_sql(query) == normalize_sql(sql):
+            st.caption("Edit the query to run your own cut. Example – hotel stays next to family trips per country:")
+            st.code(EXAMPLE_QUERY, language="sql")
+        else:
+            try:
+                own_result, own_truncated = run_query(query)
+            except QueryError as exc:
+                st.error(f"❌ {exc}")
+            else:
+                if own_truncated:
+                    st.warning(f"Only the first {len(own_result):,} rows are shown.")
+                st.dataframe(own_result, use_container_width=True, hide_index=True)
+                st.download_button(
+                    label="📥 Download Result (CSV)",
+                    data=own_result.to_csv(index=False).encode("utf-8"),
+                    file_name="query_result.csv",
+                    mime="text/csv"
+                )
+
+    with st.expander("📋 Table columns"):
+        st.dataframe(
+            pd.DataFrame(
+                [(name, column, kind) for name in tables for column, kind in engine.schema[name]],
+                columns=["Table", "Column", "Type"]
+            ),
+            use_container_width=True, hide_index=True
+        )
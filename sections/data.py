@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sections.metrics import cache_metrics
+from sections.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = "data"
+DATA_EXTENSIONS = (".csv", ".xlsx")
+LAST_VACATION_FILE = os.path.join(DATA_DIR, "Cleaned_LastVacation_FINAL_FIXED.csv")
+
+# Gemeinsame Wörterbücher für Spalten, die in mehreren Datensätzen vorkommen
+# (alphabetisch, damit groupby/sort dieselbe Reihenfolge wie bei Strings liefert)
+COUNTRY_NAMES = sorted([
+    "Total", "All Countries", "Singapore", "United Kingdom", "United States", "China",
+    "South Korea", "United Arab Emirates", "Brazil", "France", "Germany", "Australia"
+])
+QUESTION_CODES = sorted([
+    "QWhen", "QWhyno", "QDuration", "QWhere", "QAccom", "QFeat", "QWhowith",
+    "QReasons", "QDescribe_E", "QDescribe_B", "QRate"
+])
+SHARED_CATEGORIES = {"Country_clean": COUNTRY_NAMES, "Question_Code": QUESTION_CODES}
+
+# Normalisierung der Antworttexte beim Einlesen: (Frage, Regex auf die ganze Antwort, kanonische Antwort).
+# Kanonische Antworten gelten automatisch als Treffer; für Fragen ohne Regeln bleibt alles unverändert.
+ANSWER_RULES = [
+    ("QDuration", r"Overnight stay|1 night", "Overnight stay / 1 night"),
+    ("QDuration", r"Short trip|2-4 nights", "Short trip / 2-4 nights"),
+    ("QDuration", r"Medium trip|5-7 nights", "Medium trip / 5-7 nights"),
+    ("QDuration", r"Long trip|8-14 nights", "Long trip / 8-14 nights"),
+    ("QDuration", r"Extra long trip|15 or more nights", "Extra long trip / 15 or more nights"),
+    ("QWhere", r"Domestically.*", "Domestically, within my country"),
+    ("QWhere", r"International.*", "Internationally, outside my country"),
+    ("QWhere", r"Both domest.*", "Both domestically and internationally"),
+]
+
+# Weitere Textspalten, die als Kategorie gespeichert werden (Wörterbuch pro Datensatz)
+CATEGORY_COLUMNS = (
+    "Country", "Answer", "Adjective", "Rating_Level", "Statement_Code", "Statement_Text", "Question_Text"
+)
+
+
+def data_files():
+    """Alle Datendateien, die von den Sektionen gelesen werden (ohne Office-Lockfiles)."""
+    return sorted(
+        os.path.join(DATA_DIR, name)
+        for name in os.listdir(DATA_DIR)
+        if name.endswith(DATA_EXTENSIONS) and not name.startswith("~$")
+    )
+
+
+def data_version():
+    """
+    Kurzer Hash über Name, Größe und Änderungszeit aller Datendateien.
+
+    Ändert sich eine Datei, ändert sich die Version – abgeleitete Caches (API-Antworten,
+    vorberechnete Ansichten) werden daran gebunden.
+    """
+    h = hashlib.sha256()
+    for path in data_files():
+        stat = os.stat(path)
+        h.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+_fingerprints = {}
+
+
+def data_fingerprint():
+    """
+    Hash über Namen und Inhalt aller Datendateien, einmal pro data_version berechnet.
+
+    Anders als data_version auf jeder Replika gleich, solange die Daten gleich sind – Schlüssel
+    der geteilten Platten-Caches (sections.shared_cache) hängen daran.
+    """
+    version = data_version()
+    if version not in _fingerprints:
+        h = hashlib.sha256()
+        for path in data_files():
+            h.update(os.path.basename(path).encode())
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        _fingerprints[version] = h.hexdigest()[:16]
+    return _fingerprints[version]
+
+
+# Load Excel data (used for sociodemographics and possibly others)
+@cache_metrics("workbook", st.cache_data(show_spinner=True))
+@shared_cache("datasets")
+def load_workbook():
+    return pd.read_excel(os.path.join(DATA_DIR, "DATA_TourismCommunity2025_Countries.xlsx"), sheet_name=None, header=None)
+
+
+def _shared_dtype(column, values):
+    """Feste Kategorien für gemeinsame Spalten; unbekannte Werte werden hinten angehängt statt NaN."""
+    categories = SHARED_CATEGORIES[column]
+    extra = sorted(set(values.dropna().unique()) - set(categories))
+    return pd.CategoricalDtype(categories + extra)
+
+
+def compact_dtypes(df):
+    """
+    Speichersparende Typen für gecachte Datensätze.
+
+    Textspalten werden Kategorien (Country_clean und Question_Code mit gemeinsamen Wörterbüchern
+    über alle Datensätze), float64 wird float32. Für Plots und Tabellen kleine Ausschnitte mit
+    display_frame zurückwandeln.
+    """
+    for col in df.columns:
+        if col in SHARED_CATEGORIES:
+            df[col] = df[col].astype(_shared_dtype(col, df[col]))
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif df[col].dtype == np.float64:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def to_float64(values, decimals=1):
+    """float32-Werte für Berechnungen zurück auf float64 mit der gespeicherten Genauigkeit (1 Nachkommastelle)."""
+    return values.astype(np.float64).round(decimals)
+
+
+def display_frame(df, decimals=1):
+    """Ausschnitt für Plotly/Tabellen: Kategorien als str, float32 als float64 auf Anzeige-Genauigkeit."""
+    out = df.copy()
+    for col in out.columns:
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(object)
+        elif out[col].dtype == np.float32:
+            out[col] = to_float64(out[col], decimals)
+    return out
+
+
+@st.cache_data
+def load_question_texts():
+    """Lookup-Tabelle Question_Code -> Question_Text (der lange Text steht nicht mehr in jeder Zeile)."""
+    texts = pd.read_csv(LAST_VACATION_FILE, usecols=["Question_Code", "Question_Text"])
+    return texts.drop_duplicates("Question_Code").set_index("Question_Code")["Question_Text"]
+
+
+def compile_answer_rules(rules=ANSWER_RULES):
+    """Regeln einmal kompilieren: Frage -> Liste (Regex, kanonische Antwort), kanonische Antworten zuerst."""
+    compiled = {}
+    for question, pattern, canonical in rules:
+        compiled.setdefault(question, []).append((re.compile(pattern), canonical))
+    for question, entries in compiled.items():
+        identities = [(re.compile(re.escape(canonical)), canonical) for _, canonical in entries]
+        compiled[question] = identities + entries
+    return compiled
+
+
+_COMPILED_ANSWER_RULES = compile_answer_rules()
+
+
+def normalize_answers(df, compiled=_COMPILED_ANSWER_RULES):
+    """
+    Bringt Antworttexte per Regeltabelle in eine kanonische Form.
+
+    Die Regeln werden nur auf die eindeutigen (Frage, Antwort)-Paare angewendet; das Ergebnis
+    wird in einem einzigen vektorisierten Mapping-Schritt auf alle Zeilen übertragen.
+
+    Rückgabe:
+    - df mit normalisierter Answer-Spalte
+    - Zeilen von Fragen mit Regeln, deren Antwort keine Regel getroffen hat
+    """
+    pairs = df[["Question_Code", "Answer"]].drop_duplicates()
+    mapping, unmatched = {}, set()
+    for question, answer in pairs.itertuples(index=False):
+        rules = compiled.get(question)
+        if rules is None:
+            continue
+        canonical = next((c for pattern, c in rules if pattern.fullmatch(answer)), None)
+        if canonical is None:
+            unmatched.add((question, answer))
+        elif canonical != answer:
+            mapping[(question, answer)] = canonical
+
+    keys = pd.MultiIndex.from_frame(df[["Question_Code", "Answer"]])
+    is_unmatched = keys.isin(list(unmatched)) if unmatched else np.zeros(len(df), dtype=bool)
+    if mapping:
+        lookup = pd.Series(list(mapping.values()), index=pd.MultiIndex.from_tuples(list(mapping)))
+        mapped = lookup.reindex(keys).to_numpy()
+        df = df.assign(Answer=np.where(pd.isna(mapped), df["Answer"].to_numpy(), mapped))
+    return df, df[is_unmatched]
+
+
+@cache_metrics("last_vacation", st.cache_data)
+def _load_last_vacation():
+    from sections.validation import load_dataset
+
+    # Summenzeilen ("Count", "Total") entfernt und Werte geprüft beim Einlesen (sections.validation)
+    df = load_dataset("last_vacation")
+    df["Answer"] = df["Answer"].str.strip()
+    df["Percentage"] = (df["Percentage"] * 100).round(1)
+
+    df, unmatched = normalize_answers(df)
+    if len(unmatched):
+        logger.warning(
+            "%d rows in %s matched no answer rule: %s", len(unmatched), LAST_VACATION_FILE,
+            sorted(set(zip(unmatched["Question_Code"], unmatched["Answer"])))
+        )
+
+    # Question_Text liegt als Lookup-Tabelle vor (load_question_texts), nicht in jeder Zeile
+    df = df.groupby(["Question_Code", "Country", "Answer"], as_index=False).agg({"Percentage": "mean"})
+
+    country_map = {
+        "SG": "Singapore", "UK": "United Kingdom", "US": "United States",
+        "CN": "China", "KR": "South Korea", "UAE": "United Arab Emirates",
+        "BR": "Brazil", "FR": "France", "DE": "Germany", "AU": "Australia",
+        "Total": "Total"
+    }
+    df["Country_clean"] = df["Country"].map(country_map)
+    return compact_dtypes(df), unmatched[["Question_Code", "Country", "Answer"]].reset_index(drop=True)
+
+
+def load_last_vacation_data():
+    """Last-Vacation-Daten mit normalisierten Antworten – gemeinsame Quelle für alle Sektionen."""
+    return _load_last_vacation()[0]
+
+
+def unmatched_answers():
+    """Zeilen, die beim Einlesen keine Normalisierungsregel getroffen haben (Frage, Land, Antwort)."""
+    return _load_last_vacation()[1]
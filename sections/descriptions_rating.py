@@ -1,26 +1,92 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sections.utils import prepare_figure_for_export  
+from sections.utils import deferred_export  
+from sections.figures import show_chart
+from sections.data import compact_dtypes, display_frame
+from sections.metrics import cache_metrics
+from sections.validation import load_dataset
 
+# Ländercodes (Buchstabe in Klammern) zu Ländernamen
+COUNTRY_MAP = {
+    "A": "Total", "B": "Singapore", "C": "United Kingdom", "D": "United States",
+    "E": "China", "F": "South Korea", "G": "United Arab Emirates",
+    "H": "Brazil", "I": "France", "J": "Germany", "K": "Australia"
+}
 
-@st.cache_data
+
+@cache_metrics("descriptions", st.cache_data)
 def load_description_data():
-    df = pd.read_csv("data/Adjective_2_Long_Format_Final.csv")
+    df = load_dataset("descriptions")
 
     # Ländercodes extrahieren und zu Ländernamen mappen
     df["Country_clean"] = df["Country"].str.extract(r"\((.)\)").iloc[:, 0]
-    country_map = {
-        "A": "Total", "B": "Singapore", "C": "United Kingdom", "D": "United States",
-        "E": "China", "F": "South Korea", "G": "United Arab Emirates",
-        "H": "Brazil", "I": "France", "J": "Germany", "K": "Australia"
-    }
-    df["Country_clean"] = df["Country_clean"].map(country_map)
+    df["Country_clean"] = df["Country_clean"].map(COUNTRY_MAP)
 
     # ✅ Prozentangaben richtig skalieren
     df["Percentage"] = (df["Percentage"] * 100).round(1)
 
-    return df
+    return compact_dtypes(df)
+
+
+@cache_metrics("ratings", st.cache_data)
+def load_rating_data():
+    df_rating = load_dataset("ratings")
+
+    # Länderzuordnung
+    df_rating["Country_clean"] = df_rating["Country"].str.extract(r"\((.)\)").iloc[:, 0]
+    df_rating["Country_clean"] = df_rating["Country_clean"].map(COUNTRY_MAP)
+
+    # Prozentangaben skalieren
+    df_rating["Percentage"] = (df_rating["Percentage"] * 100).round(1)
+    df_rating["Rating"] = pd.to_numeric(df_rating["Rating"], errors="coerce")
+    return compact_dtypes(df_rating)
+
+
+def total_sample_adjectives(df: pd.DataFrame) -> pd.DataFrame:
+    """Adjektive des Total Sample, nach Anteil absteigend."""
+    df_total = display_frame(df[df["Country_clean"] == "Total"])
+    return df_total.sort_values("Percentage", ascending=False)
+
+
+def comparable_countries(df: pd.DataFrame) -> list[str]:
+    """Länder für den Vergleich (ohne Total), alphabetisch."""
+    return sorted(c for c in df["Country_clean"].dropna().unique().tolist() if c != "Total")
+
+
+def country_adjectives(df: pd.DataFrame, countries: list[str]) -> pd.DataFrame:
+    """Adjektiv-Anteile der ausgewählten Länder für den gruppierten Balkenvergleich."""
+    return display_frame(df[df["Country_clean"].isin(countries)])
+
+
+def compute_nps(df_rating: pd.DataFrame) -> pd.DataFrame:
+    """Net Promoter Score je Land: Anteil 9–10 minus Anteil 0–6 (in Prozentpunkten)."""
+    share = df_rating["Percentage"]
+    by_country = df_rating["Country_clean"]
+    promoters = share.where(df_rating["Rating"] >= 9).groupby(by_country, observed=True).sum()
+    detractors = share.where(df_rating["Rating"] <= 6).groupby(by_country, observed=True).sum()
+
+    nps_df = (promoters - detractors).rename("NPS").reset_index()
+    return display_frame(nps_df.sort_values("NPS", ascending=False))
+
+
+def weighted_rating_rows(df_rating: pd.DataFrame) -> pd.DataFrame:
+    """Ratings duplizieren gemäß Prozentwerten (für realistische Verteilung), z. B. 45 → 45 Ratings."""
+    counts = df_rating["Percentage"].astype(int)
+    df_weighted = df_rating.loc[df_rating.index.repeat(counts), ["Country_clean", "Rating"]]
+    return display_frame(df_weighted.reset_index(drop=True))
+
+
+@st.cache_data(show_spinner=False)
+def expand_weighted_ratings(df_rating):
+    """Gecachte Boxplot-Basis (weighted_rating_rows), einmal pro Rating-Datensatz."""
+    return weighted_rating_rows(df_rating)
+
+
+def warm():
+    """Beschreibungs- und Rating-Daten inkl. gewichteter Boxplot-Basis vorab laden."""
+    load_description_data()
+    expand_weighted_ratings(load_rating_data())
 
 
 def render():
@@ -30,36 +96,34 @@ def render():
     df = load_description_data()
 
     # Total Sample
-    df_total = df[df["Country_clean"] == "Total"].copy()
+    df_total = total_sample_adjectives(df)
 
     if df_total.empty:
         st.warning("⚠️ No data available for Total Sample.")
     else:
-        df_total = df_total.sort_values("Percentage", ascending=False)
         fig = px.bar(
             df_total, x="Adjective", y="Percentage", text="Percentage",
             title="Total Sample",
             color_discrete_sequence=["#5DADE2"]
         )
         fig.update_layout(showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig)
 
     # Country Comparison
     st.markdown("### Country Comparison")
 
-    available_countries = df["Country_clean"].dropna().unique().tolist()
-    available_countries = [c for c in available_countries if c != "Total"]
+    available_countries = comparable_countries(df)
     default_countries = [c for c in ["Germany", "United Arab Emirates"] if c in available_countries]
 
     selected_countries = st.multiselect(
         "Select countries:",
-        options=sorted(available_countries),
+        options=available_countries,
         default=default_countries,
         key="compare_adjectives"
     )
 
     if selected_countries:
-        compare_df = df[df["Country_clean"].isin(selected_countries)].copy()
+        compare_df = country_adjectives(df, selected_countries)
 
         if not compare_df.empty:
             fig2 = px.bar(
@@ -68,7 +132,7 @@ def render():
                 color_discrete_sequence=px.colors.qualitative.Set2
             )
             fig2.update_layout(showlegend=True)
-            st.plotly_chart(fig2, use_container_width=True)
+            show_chart(fig2)
         else:
             st.warning("No comparison data available for selected countries.")
 
@@ -80,37 +144,17 @@ def render():
     st.markdown("### Overall Rating of Your Vacation")
 
     # Daten laden
-    df_rating = pd.read_csv("data/QRate_Long_Format_Clean.csv")
-
-    # Länderzuordnung
-    df_rating["Country_clean"] = df_rating["Country"].str.extract(r"\((.)\)").iloc[:, 0]
-    country_map = {
-        "A": "Total", "B": "Singapore", "C": "United Kingdom", "D": "United States",
-        "E": "China", "F": "South Korea", "G": "United Arab Emirates",
-        "H": "Brazil", "I": "France", "J": "Germany", "K": "Australia"
-    }
-    df_rating["Country_clean"] = df_rating["Country_clean"].map(country_map)
-
-    # Prozentangaben skalieren
-    df_rating["Percentage"] = (df_rating["Percentage"] * 100).round(1)
+    df_rating = load_rating_data()
 
     # 🎯 NPS-Berechnung
-    df_rating["Rating"] = pd.to_numeric(df_rating["Rating"], errors="coerce")
-
-    def calculate_nps(group):
-        promoters = group[group["Rating"] >= 9]["Percentage"].sum()
-        detractors = group[group["Rating"] <= 6]["Percentage"].sum()
-        return promoters - detractors
-
-    nps_df = df_rating.groupby("Country_clean").apply(calculate_nps).reset_index(name="NPS")
-    nps_df = nps_df.sort_values("NPS", ascending=False)
+    nps_df = compute_nps(df_rating)
 
     fig_nps = px.bar(nps_df, x="Country_clean", y="NPS", text="NPS",
                      color="NPS", color_continuous_scale="Blues")
     fig_nps.update_layout(showlegend=False, yaxis_title="Net Promoter Score")
-    st.plotly_chart(fig_nps, use_container_width=True)
+    show_chart(fig_nps)
 
-    nps_png = prepare_figure_for_export(
+    nps_png = deferred_export(
     fig_nps,
     title_size=26,
     label_size=22,
@@ -135,22 +179,13 @@ def render():
 
     st.markdown("### Distribution of Vacation Ratings by Country")
 
-    # Ratings duplizieren gemäß Prozentwerten (für realistische Verteilung)
-    weighted_rows = []
-    for _, row in df_rating.iterrows():
-        n = int(row["Percentage"])  # z. B. 45 → 45 Ratings
-        weighted_rows.extend([{
-            "Country_clean": row["Country_clean"],
-            "Rating": row["Rating"]
-        }] * n)
-
-    df_weighted = pd.DataFrame(weighted_rows)
+    df_weighted = expand_weighted_ratings(df_rating)
 
     fig_box = px.box(df_weighted, x="Country_clean", y="Rating", points="outliers", color="Country_clean")
     fig_box.update_layout(showlegend=False, yaxis_title="Rating (1–10)")
-    st.plotly_chart(fig_box, use_container_width=True)
+    show_chart(fig_box)
 
-    box_png = prepare_figure_for_export(
+    box_png = deferred_export(
     fig_box,
     title_size=26,
     label_size=22,
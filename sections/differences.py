@@ -1,57 +1,69 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sections.utils import prepare_figure_for_export
-
-@st.cache_data
-def load_last_vacation_data():
-    df = pd.read_csv("data/Cleaned_LastVacation_FINAL_FIXED.csv")
-    df = df.dropna(subset=["Percentage"])
-    df = df[~df["Answer"].str.contains("Count", case=False, na=False)]
-    df["Answer"] = df["Answer"].astype(str).str.strip()
-    df["Percentage"] = (df["Percentage"] * 100).round(1)
-
-    df = df.groupby(["Question_Code", "Question_Text", "Country", "Answer"], as_index=False).agg({"Percentage": "mean"})
-
-    country_map = {
-        "SG": "Singapore", "UK": "United Kingdom", "US": "United States",
-        "CN": "China", "KR": "South Korea", "UAE": "United Arab Emirates",
-        "BR": "Brazil", "FR": "France", "DE": "Germany", "AU": "Australia",
-        "Total": "Total"
-    }
-    df["Country_clean"] = df["Country"].map(country_map)
-    return df
+from sections.utils import deferred_export
+from sections.figures import show_chart
+from sections.data import display_frame, load_last_vacation_data, to_float64
+
+# Mapping von Kurztiteln
+QUESTION_LABELS = {
+    "QFeat": "Visited attractions",
+    "QWhere": "Travel destination",
+    "QReasons": "Motivation for vacation",
+    "QWhowith": "Travel companions",
+    "QDescribe_E": "Description",
+    "QWhyno": "Reasons against vacation",
+    "QDuration": "Duration",
+    "QWhen": "Last vacation timing",
+    "QAccom": "Accommodation type"
+}
+
+# Antworten ohne inhaltliche Aussage, bei den Gemeinsamkeiten ausgeblendet
+NON_ANSWERS = ["Other", "None of the above"]
+TOP_N = 15
+
+def compute_answer_ranges(df: pd.DataFrame) -> pd.DataFrame:
+    """Spannweite (max - min über Länder) je Frage und Antwort, ohne Total."""
+    df_filtered = df[df["Country"] != "Total"].assign(Percentage=lambda d: to_float64(d["Percentage"]))
+    df_grouped = df_filtered.groupby(["Question_Code", "Answer", "Country"], as_index=False, observed=True)["Percentage"].mean()
+    pivot = df_grouped.pivot(index=["Question_Code", "Answer"], columns="Country", values="Percentage")
+    pivot.columns = pivot.columns.astype(str)
+    pivot["Range"] = pivot.max(axis=1) - pivot.min(axis=1)
+    return pivot
+
+def compute_question_ranges(df: pd.DataFrame) -> pd.DataFrame:
+    """Pro Frage: maximale Differenz zwischen zwei Ländern für eine einzelne Antwortoption."""
+    pivot = compute_answer_ranges(df)
+    max_diff_per_question = pivot.reset_index().groupby("Question_Code", observed=True).agg({"Range": "max"}).reset_index()
+    max_diff_per_question = display_frame(max_diff_per_question)
+    max_diff_per_question["Label"] = max_diff_per_question["Question_Code"].map(QUESTION_LABELS)
+    return max_diff_per_question
+
+def question_level_differences(df: pd.DataFrame) -> pd.DataFrame:
+    """Fragen nach größter Länderdifferenz sortiert (ohne Reiseziel – nur drei Antworten, wenig aussagekräftig)."""
+    ranges = compute_question_ranges(df)
+    return ranges[ranges["Label"] != "Travel destination"].sort_values("Range", ascending=False)
+
+def top_differences(answer_ranges: pd.DataFrame, n: int = TOP_N) -> pd.DataFrame:
+    """Die n Antworten mit der größten Spannweite zwischen Ländern."""
+    return display_frame(answer_ranges.sort_values("Range", ascending=False).head(n).reset_index())
+
+def top_similarities(answer_ranges: pd.DataFrame, n: int = TOP_N) -> pd.DataFrame:
+    """Die n Antworten mit der kleinsten (positiven) Spannweite, ohne "Other" / "None of the above"."""
+    ranges = answer_ranges.loc[~answer_ranges.index.get_level_values("Answer").isin(NON_ANSWERS)]
+    return display_frame(ranges[ranges["Range"] > 0].sort_values("Range").head(n).reset_index())
+
+def warm():
+    """Last-Vacation-Daten vorab in den Cache laden."""
+    load_last_vacation_data()
 
 def render():
     st.subheader("📊 Differences and Similarities Between Countries – Question-Level View")
 
     df = load_last_vacation_data()
-    df_filtered = df[df["Country"] != "Total"].copy()
-
-    # Range pro Antwort berechnen
-    df_grouped = df_filtered.groupby(["Question_Code", "Answer", "Country"], as_index=False)["Percentage"].mean()
-    pivot = df_grouped.pivot(index=["Question_Code", "Answer"], columns="Country", values="Percentage")
-    pivot["Range"] = pivot.max(axis=1) - pivot.min(axis=1)
 
-    # Pro Frage: maximale Differenz
-    max_diff_per_question = pivot.reset_index().groupby("Question_Code").agg({"Range": "max"}).reset_index()
-
-    # Mapping von Kurztiteln
-    question_labels = {
-        "QFeat": "Visited attractions",
-        "QWhere": "Travel destination",
-        "QReasons": "Motivation for vacation",
-        "QWhowith": "Travel companions",
-        "QDescribe_E": "Description",
-        "QWhyno": "Reasons against vacation",
-        "QDuration": "Duration",
-        "QWhen": "Last vacation timing",
-        "QAccom": "Accommodation type"
-    }
-    max_diff_per_question["Label"] = max_diff_per_question["Question_Code"].map(question_labels)
-    max_diff_per_question = max_diff_per_question[max_diff_per_question["Label"] != "Travel destination"]
     fig_q_diff = px.bar(
-        max_diff_per_question.sort_values("Range", ascending=False),
+        question_level_differences(df),
         x="Label", y="Range",
         title="🔍 Question-Level: Greatest Differences Between Countries",
         color_discrete_sequence=px.colors.sequential.Reds,
@@ -71,9 +83,9 @@ def render():
         yaxis=dict(range=[0, 60])  # 👈 Hier neu!
 
     )
-    st.plotly_chart(fig_q_diff, use_container_width=True, key="question_diff_chart")
+    show_chart(fig_q_diff, key="question_diff_chart")
 
-    fig_q_diff_png = prepare_figure_for_export(
+    fig_q_diff_png = deferred_export(
         fig_q_diff, title_size=24, label_size=20, tick_size=18, legend_size=18,
         width=1800, height=1000, scale=2
     )
@@ -95,11 +107,9 @@ def render():
 
     st.subheader("📊 Country Differences and Similarities")
 
-    df_grouped = df[df["Country"] != "Total"].groupby(["Question_Code", "Answer", "Country"], as_index=False)["Percentage"].mean()
-    df_pivot = df_grouped.pivot_table(index=["Question_Code", "Answer"], columns="Country", values="Percentage")
-    df_pivot["Range"] = df_pivot.max(axis=1) - df_pivot.min(axis=1)
+    df_pivot = compute_answer_ranges(df)
 
-    top_diff = df_pivot.sort_values("Range", ascending=False).head(15).reset_index()
+    top_diff = top_differences(df_pivot)
     fig_diff = px.bar(
         top_diff, x="Answer", y="Range", color="Question_Code",
         title="🔍 Greatest Differences Between Countries",
@@ -118,10 +128,9 @@ def render():
         xaxis_title="",
         yaxis=dict(range=[0, 70])
     )
-    st.plotly_chart(fig_diff, use_container_width=True, key="country_diff_chart")
+    show_chart(fig_diff, key="country_diff_chart")
 
-    df_sim_filtered = df_pivot.loc[~df_pivot.index.get_level_values("Answer").isin(["Other", "None of the above"])]
-    top_sim = df_sim_filtered[df_sim_filtered["Range"] > 0].sort_values("Range").head(15).reset_index()
+    top_sim = top_similarities(df_pivot)
     fig_sim = px.bar(
         top_sim, x="Answer", y="Range", color="Question_Code",
         title="🤝 Highest Similarities Between Countries",
@@ -140,9 +149,9 @@ def render():
         xaxis_title="",
         yaxis=dict(range=[0, 12])
     )
-    st.plotly_chart(fig_sim, use_container_width=True, key="country_sim_chart")
+    show_chart(fig_sim, key="country_sim_chart")
 
-    fig_diff_png = prepare_figure_for_export(
+    fig_diff_png = deferred_export(
         fig_diff, title_size=24, label_size=20, tick_size=18, legend_size=18,
         width=1800, height=1000, scale=2
     )
@@ -154,7 +163,7 @@ def render():
         key="dl_diff_chart"
     )
 
-    fig_sim_png = prepare_figure_for_export(
+    fig_sim_png = deferred_export(
         fig_sim, title_size=24, label_size=20, tick_size=18, legend_size=18,
         width=1800, height=1000, scale=2
     )
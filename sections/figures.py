@@ -0,0 +1,263 @@
+import logging
+import os
+import re
+import time
+
+import numpy as np
+import plotly.io as pio
+import streamlit as st
+
+from sections.metrics import observe_figures, observe_section
+
+logger = logging.getLogger(__name__)
+
+# Signifikante Stellen bezogen auf die Spannweite eines Arrays: mindestens 1000 Schritte, also unter einem Pixel
+DISPLAY_DIGITS = 4
+# Byte-Budget der Figure-JSONs pro Seite und Rerun; TOURISM_FIGURE_BUDGET überschreibt den Standard
+DEFAULT_PAGE_BUDGET = int(os.environ.get("TOURISM_FIGURE_BUDGET", str(48_000)))
+PAGE_BUDGETS = {
+    "3.": 96_000,  # Last Vacation: Dendrogramm(e) plus zwei Charts pro Frage
+}
+# TOURISM_FIGURE_BUDGET_STRICT=1 (Tests, Lasttest): Budgetüberschreitung bricht die Seite ab statt nur zu loggen
+STRICT_BUDGET = os.environ.get("TOURISM_FIGURE_BUDGET_STRICT", "0") == "1"
+
+NUMERIC_KEYS = ("x", "y", "z", "r", "values", "lat", "lon")
+# Nur Farbe bzw. Sektorgröße: hier reicht die Genauigkeit des Formats; Positionen brauchen auch Pixelgenauigkeit
+VALUE_KEYS = ("z", "values")
+# Platzhalter mit d3-Format in hover-/texttemplate, z. B. %{y:.1f} oder %{customdata[1]:.3f}
+_TEMPLATE_FORMAT = re.compile(r"%\{(\w+)(?:\[(\d+)\])?(?::([^}]*))?\}")
+
+
+class FigureBudgetExceeded(RuntimeError):
+    """Figures einer Seite größer als ihr Budget (nur mit TOURISM_FIGURE_BUDGET_STRICT=1)."""
+
+
+def _format_decimals(spec):
+    """Angezeigte Nachkommastellen eines d3-Formats; None, wenn der Wert ungerundet erscheint."""
+    match = re.search(r"\.(\d+)([a-z%]?)$", spec or "")
+    if match:
+        digits, kind = int(match.group(1)), match.group(2)
+        return digits + 2 if kind == "%" else digits if kind == "f" else None
+    return 0 if (spec or "").endswith("d") else None
+
+
+def _template_decimals(trace):
+    """
+    (Schlüssel, Spalte) -> Nachkommastellen aus hover- und texttemplate. Erscheint ein Wert
+    irgendwo ohne Format, steht None – dann gilt die Spannweiten-Regel.
+    """
+    decimals = {}
+    for template in (getattr(trace, "hovertemplate", None), getattr(trace, "texttemplate", None)):
+        if not isinstance(template, str):
+            continue
+        for key, column, spec in _TEMPLATE_FORMAT.findall(template):
+            slot = (key, int(column) if column else None)
+            digits = _format_decimals(spec)
+            if digits is None or decimals.get(slot, 0) is None:
+                decimals[slot] = None
+            else:
+                decimals[slot] = max(decimals.get(slot, 0), digits)
+    return decimals
+
+
+def _span_decimals(arr):
+    """Nachkommastellen für DISPLAY_DIGITS signifikante Stellen der Spannweite (bzw. des Betrags)."""
+    span = float(arr.max() - arr.min()) or float(np.abs(arr).max())
+    if span == 0:
+        return 0
+    return max(0, DISPLAY_DIGITS - 1 - int(np.floor(np.log10(span))))
+
+
+def _rounded_list(arr, decimals):
+    """
+    Gerundete (verschachtelte) Liste; ganzzahlige Werte als int ("40" statt "40.0" im JSON).
+
+    Bewusst keine Typed Arrays: plotly 5.24 schreibt numpy-Arrays ohnehin als JSON-Listen (base64
+    "bdata" kommt erst mit plotly 6), und selbst dann kostet ein float64 in base64 knapp 11 Zeichen,
+    ein gerundeter Wert wie "43.9," nur 5.
+    """
+    def plain(values):
+        return [plain(v) if isinstance(v, list) else int(v) if v.is_integer() else v for v in values]
+
+    return plain(np.round(arr, decimals).tolist())
+
+
+def _compact_array(values, decimals=None, positional=True):
+    """
+    Numerisches Array als gerundete Liste; None für Text oder gemischte Werte (bleiben unverändert).
+    decimals aus dem Anzeigeformat (None: ungerundet angezeigt); Positionen mindestens pixelgenau.
+    """
+    try:
+        arr = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if arr.size == 0 or not np.isfinite(arr).all():
+        return None
+    if decimals is None:
+        decimals = _span_decimals(arr)
+    elif positional:
+        decimals = max(decimals, _span_decimals(arr))
+    return _rounded_list(arr, decimals)
+
+
+def _compact_customdata(customdata, decimals):
+    """Spalten von customdata, die nur formatiert angezeigt werden, auf diese Stellen runden."""
+    columns = {column: digits for (key, column), digits in decimals.items()
+               if key == "customdata" and column is not None and digits is not None}
+    if not columns or np.ndim(customdata) != 2:
+        return None
+    rows = [list(row) for row in customdata]
+    for row in rows:
+        for column, digits in columns.items():
+            value = row[column] if column < len(row) else None
+            if isinstance(value, (float, np.floating)) and np.isfinite(value):
+                value = round(float(value), digits)
+                row[column] = int(value) if value.is_integer() else value
+    return rows
+
+
+def _same_values(text, values):
+    try:
+        return len(text) == len(values) and np.allclose(
+            np.asarray(text, dtype=np.float64), np.asarray(values, dtype=np.float64)
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_dendrogram_link(trace):
+    """Verbindungslinie aus ff.create_dendrogram: Linie, deren Hover höchstens einen Text für das ganze Segment zeigt."""
+    return (
+        trace.type == "scatter" and trace.mode == "lines"
+        and trace.hoverinfo == "text" and (trace.text is None or isinstance(trace.text, str))
+    )
+
+
+def _round_colorscales(node):
+    """Stopp-Positionen von Farbskalen ([[0.1111111111111111, "#000012"], ...]) auf 4 Stellen."""
+    if isinstance(node, dict):
+        return {key: _round_colorscales(value) for key, value in node.items()}
+    if isinstance(node, list):
+        if node and all(isinstance(stop, list) and len(stop) == 2 and isinstance(stop[0], float) for stop in node):
+            return [[round(position, 4), color] for position, color in node]
+        return [_round_colorscales(value) for value in node]
+    return node
+
+
+def _slim_template(fig):
+    """
+    Das Streamlit-Template enthält Vorgaben für rund zehn Trace-Typen (gut 2 KB pro Figure);
+    Streamlit ersetzt im Browser nur die Platzhalterfarben darin. Behalten werden die Vorgaben
+    der Trace-Typen, die die Figure wirklich enthält.
+    """
+    template = fig.layout.template.to_plotly_json()
+    if not template:
+        return
+    used = {trace.type for trace in fig.data}
+    template["data"] = {kind: traces for kind, traces in template.get("data", {}).items() if kind in used}
+    fig.layout.template = _round_colorscales(template)
+
+
+def slim_figure(fig):
+    """
+    Verkleinert das JSON, das an den Browser geht (ändert die Figure direkt).
+
+    - numerische Arrays auf die angezeigte Genauigkeit runden: Stellen aus dem Format in
+      hover-/texttemplate (%{z:.2f} → 2), sonst DISPLAY_DIGITS signifikante Stellen der Spannweite
+      (Prozentwerte 0–100 → 2 Nachkommastellen; Positionen bleiben in jedem Fall pixelgenau)
+    - formatiert angezeigte customdata-Spalten genauso runden
+    - Box-Traces mit nur einer Kategorie: Positions-Array durch x0/y0 ersetzen
+    - Dendrogramm-Linien ohne Hovertext (ff.create_dendrogram hängt die Blattnamen der Reihe
+      nach an die Verbindungen, nicht an die Blätter – die Blattnamen stehen an der Achse)
+    - text-Arrays, die nur die Balkenwerte wiederholen, durch texttemplate ersetzen
+    - hovertext entfernen, wenn er text wiederholt
+    - Template-Vorgaben für nicht enthaltene Trace-Typen weglassen (_slim_template)
+    """
+    _slim_template(fig)
+    for trace in fig.data:
+        decimals = _template_decimals(trace)
+        for key in NUMERIC_KEYS:
+            values = trace[key] if key in trace else None
+            if values is None or isinstance(values, str) or np.ndim(values) == 0:
+                continue
+            compact = _compact_array(values, decimals.get((key, None)), positional=key not in VALUE_KEYS)
+            if compact is not None:
+                trace[key] = compact
+        if "customdata" in trace and trace.customdata is not None:
+            compact = _compact_customdata(trace.customdata, decimals)
+            if compact is not None:
+                trace.customdata = compact
+
+        if trace.type == "box":
+            axis = "y" if trace.orientation == "h" else "x"
+            positions = trace[axis]
+            if positions is not None and len(positions) and len(set(positions)) == 1:
+                trace[axis + "0"] = positions[0]
+                trace[axis] = None
+
+        if _is_dendrogram_link(trace):
+            trace.text = None
+            trace.hoverinfo = "skip"
+            continue
+        if "text" not in trace or trace.text is None or isinstance(trace.text, str):
+            continue
+        if "hovertext" in trace and trace.hovertext is not None and list(trace.hovertext) == list(trace.text):
+            trace.hovertext = None
+        axis = "x" if getattr(trace, "orientation", None) == "h" else "y"
+        if trace.type == "bar" and _same_values(trace.text, trace[axis]):
+            # Anzeige unverändert: gleicher Wert, aber aus dem Werte-Array statt doppelt übertragen
+            if trace.hovertemplate:
+                trace.hovertemplate = trace.hovertemplate.replace("%{text}", f"%{{{axis}}}")
+            if not trace.texttemplate:
+                trace.texttemplate = f"%{{{axis}}}"
+            trace.text = None
+    return fig
+
+
+def figure_bytes(fig):
+    """Größe des Figure-JSONs so, wie st.plotly_chart es serialisiert."""
+    return len(pio.to_json(fig, validate=False))
+
+
+def _page_budget(page):
+    return next((budget for prefix, budget in PAGE_BUDGETS.items() if page.startswith(prefix)), DEFAULT_PAGE_BUDGET)
+
+
+def begin_page(page):
+    """Zähler für die Figure-Bytes und die Renderzeit der aktuellen Seite zurücksetzen (am Anfang jedes Reruns)."""
+    st.session_state["_figure_payload"] = {"page": page, "figures": [], "start": time.perf_counter()}
+
+
+def show_chart(fig, **kwargs):
+    """st.plotly_chart mit slim_figure und Größenmessung für das Seitenbudget."""
+    slim_figure(fig)
+    payload = st.session_state.get("_figure_payload")
+    if payload is not None:
+        payload["figures"].append(figure_bytes(fig))
+    kwargs.setdefault("use_container_width", True)
+    return st.plotly_chart(fig, **kwargs)
+
+
+def end_page():
+    """
+    Prüft die Figures der Seite gegen das Budget; gibt (Bytes, Budget) zurück.
+
+    Überschreitungen landen im Log und im Metrik-Endpunkt (tourism_figure_budget_exceeded_total),
+    mit TOURISM_FIGURE_BUDGET_STRICT=1 bricht die Seite mit FigureBudgetExceeded ab. Meldet außerdem
+    die Renderzeit und die Figure-Bytes der Seite an sections.metrics.
+    """
+    payload = st.session_state.get("_figure_payload")
+    if not payload:
+        return None
+    observe_section(payload["page"], time.perf_counter() - payload["start"])
+    total, budget = sum(payload["figures"]), _page_budget(payload["page"])
+    observe_figures(payload["page"], total, total > budget)
+    if total > budget:
+        message = (
+            f"Figure payload of page {payload['page']!r} is {total} bytes in "
+            f"{len(payload['figures'])} figures (budget {budget} bytes)"
+        )
+        if STRICT_BUDGET:
+            raise FigureBudgetExceeded(message)
+        logger.warning(message)
+    return total, budget
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import time
+
+import streamlit as st
+
+from sections.metrics import observe_section
+
+logger = logging.getLogger(__name__)
+
+# TOURISM_FROZEN=1: Seiten kommen fertig aus dem Build (python tools/freeze.py), ohne Daten und Modelle
+FROZEN_ENABLED = os.environ.get("TOURISM_FROZEN") == "1"
+FROZEN_DIR = os.environ.get("TOURISM_FROZEN_DIR", "frozen")
+MANIFEST_FILE = "manifest.json"
+DEFAULT_STATE = "default"
+
+
+def state_id(widget_id, value):
+    """Name eines Widget-Zustands im Build: eine Abweichung vom Standard, z. B. "n_segments=5"."""
+    return f"{widget_id}={json.dumps(value, ensure_ascii=False)}"
+
+
+def build_dir():
+    """
+    Verzeichnis des aktuellen Builds. FROZEN_DIR ist ein Symlink auf <FROZEN_DIR>.builds/<build_id>,
+    den tools/freeze.py atomar umhängt; der aufgelöste Pfad ist Schlüssel aller Caches unten –
+    ein neuer Build wird beim nächsten Rerun geladen, ohne Neustart.
+    """
+    return os.path.realpath(FROZEN_DIR)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_build(directory):
+    """Manifest des Builds (Seiten, Build-Zeit, Datenversion) oder None, wenn es keinen Build gibt."""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False, max_entries=50)
+def load_frozen_page(directory, file_name):
+    """Widgets und Elementbäume aller Zustände einer Seite."""
+    with open(os.path.join(directory, "pages", file_name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False, max_entries=500)
+def load_frozen_figure(directory, figure_id):
+    """Figure einmal pro Prozess aus dem JSON des Builds (nur lesend verwendet)."""
+    import plotly.io as pio
+
+    with open(os.path.join(directory, "figures", f"{figure_id}.json"), encoding="utf-8") as f:
+        return pio.from_json(f.read())
+
+
+def _png_reader(directory, figure_id):
+    path = os.path.join(directory, "figures", f"{figure_id}.png")
+    if not os.path.exists(path):
+        return None
+
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+
+    return read
+
+
+def _widget_key(page, widget_id):
+    return f"frozen:{page}:{widget_id}"
+
+
+def _reset_other_widgets(page, widgets, changed):
+    """Der Build enthält nur Zustände mit einem geänderten Widget – alle anderen zurück auf Standard."""
+    for widget in widgets:
+        key = _widget_key(page, widget["id"])
+        if widget["id"] != changed and key in st.session_state:
+            del st.session_state[key]
+
+
+def _current_state(page, widgets):
+    for widget in widgets:
+        value = st.session_state.get(_widget_key(page, widget["id"]), widget["default"])
+        if widget["states"] and value != widget["default"]:
+            return state_id(widget["id"], value)
+    return DEFAULT_STATE
+
+
+def _render_widget(page, widgets, widget):
+    key = _widget_key(page, widget["id"])
+    kind, label, default = widget["kind"], widget["label"], widget["default"]
+    common = dict(
+        key=key, disabled=not widget["states"],
+        on_change=_reset_other_widgets, args=(page, widgets, widget["id"]),
+        help=None if widget["states"] else "Fixed to its default in this build."
+    )
+    if kind == "selectbox":
+        st.selectbox(label, widget["options"], index=widget["options"].index(default), **common)
+    elif kind == "radio":
+        st.radio(label, widget["options"], index=widget["options"].index(default), **common)
+    elif kind == "multiselect":
+        st.multiselect(label, widget["options"], default=default, **common)
+    elif kind == "slider":
+        st.slider(label, widget["min"], widget["max"], default, widget["step"], **common)
+    elif kind == "checkbox":
+        st.checkbox(label, default, **common)
+
+
+def _render_items(directory, page, build, items):
+    widgets = build["widgets"]
+    by_id = {widget["id"]: widget for widget in widgets}
+    for item in items:
+        kind = item["kind"]
+        if kind == "text":
+            getattr(st, item["tag"])(item["text"])
+        elif kind == "markdown":
+            st.markdown(item["text"], unsafe_allow_html=item["html"])
+        elif kind == "alert":
+            getattr(st, item["level"])(item["text"])
+        elif kind == "table":
+            st.dataframe(
+                [dict(zip(item["columns"], row)) for row in item["rows"]],
+                use_container_width=True, hide_index=True
+            )
+        elif kind == "figure":
+            st.plotly_chart(load_frozen_figure(directory, item["id"]), use_container_width=True)
+            png = _png_reader(directory, item["id"])
+            if png is not None:
+                st.download_button(
+                    "⬇️ Download PNG", data=png, file_name=f"{item['name']}.png", mime="image/png",
+                    key=f"frozen_png_{item['id']}_{item['n']}"
+                )
+        elif kind == "widget":
+            # Builds älterer Versionen beschreiben nur die Widgets der Standardansicht
+            if item["id"] in by_id:
+                _render_widget(page, widgets, by_id[item["id"]])
+            else:
+                logger.warning("Frozen page %s: no spec for widget %s, left out", page, item["id"])
+        elif kind == "expander":
+            with st.expander(item["label"], expanded=item["expanded"]):
+                _render_items(directory, page, build, item["items"])
+        elif kind == "columns":
+            for column, column_items in zip(st.columns(len(item["columns"])), item["columns"]):
+                with column:
+                    _render_items(directory, page, build, column_items)
+
+
+def serve_frozen_page(menu):
+    """
+    Zeigt eine Seite aus dem Build statt sie zu rechnen; False, wenn der Build die Seite nicht enthält.
+
+    Widgets, deren Zustände der Build aufgezählt hat, bleiben bedienbar (eins zur Zeit);
+    alle anderen stehen fest auf ihrem Standardwert.
+    """
+    directory = build_dir()
+    manifest = load_build(directory)
+    if manifest is None:
+        st.error(f"❌ No frozen build in `{FROZEN_DIR}/`. Run `python tools/freeze.py` before starting with TOURISM_FROZEN=1.")
+        return True
+    if menu not in manifest["pages"]:
+        return False
+
+    start = time.perf_counter()
+    build = load_frozen_page(directory, manifest["pages"][menu])
+    state = _current_state(menu, build["widgets"])
+    _render_items(directory, menu, build, build["states"].get(state, build["states"][DEFAULT_STATE]))
+    observe_section(menu, time.perf_counter() - start)
+    return True
+
+
+def build_caption():
+    manifest = load_build(build_dir())
+    if manifest is None:
+        return "❄️ *Frozen build missing*"
+    return f"❄️ *Frozen build {manifest['built']} (data {manifest['data_version']})*"
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import plotly.express as px
+import plotly.figure_factory as ff
+import streamlit as st
+from scipy.cluster.hierarchy import cophenet, linkage
+from scipy.spatial.distance import pdist
+from sklearn.preprocessing import StandardScaler
+
+from sections.data import data_version, load_last_vacation_data
+from sections.figures import show_chart
+from sections.shared_cache import shared_cache
+
+METHODS = ["ward", "average", "complete", "single"]
+METRICS = ["euclidean", "cityblock", "cosine", "correlation"]
+MAX_SIDE_BY_SIDE = 4
+
+
+def method_grid():
+    """Alle sinnvollen (Methode, Metrik)-Kombinationen – Ward ist nur für euklidische Distanzen definiert."""
+    return [
+        (method, metric)
+        for method in METHODS
+        for metric in METRICS
+        if method != "ward" or metric == "euclidean"
+    ]
+
+
+def _evaluate(scaled, method, metric):
+    distances = pdist(scaled, metric=metric)
+    linkage_matrix = linkage(distances, method=method)
+    score, _ = cophenet(linkage_matrix, distances)
+    return method, metric, linkage_matrix, score
+
+
+def compare_linkages(pivot_df, n_workers=4):
+    """
+    Bewertet alle Kombinationen aus method_grid() auf den standardisierten Länderprofilen.
+
+    Läuft in einem Thread-Pool (SciPy rechnet Distanzen und Linkage ohne GIL).
+    Rückgabe: dict mit scores (DataFrame Method/Metric/Cophenetic, absteigend), linkages
+    ((Methode, Metrik) -> Linkage-Matrix), scaled (standardisierte Daten) und labels.
+    """
+    scaled = StandardScaler().fit_transform(pivot_df)
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        results = list(pool.map(lambda combo: _evaluate(scaled, *combo), method_grid()))
+
+    scores = pd.DataFrame(
+        [(method, metric, score) for method, metric, _, score in results],
+        columns=["Method", "Metric", "Cophenetic"]
+    ).sort_values("Cophenetic", ascending=False, ignore_index=True)
+    return {
+        "scores": scores,
+        "linkages": {(method, metric): z for method, metric, z, _ in results},
+        "scaled": scaled,
+        "labels": pivot_df.index.tolist()
+    }
+
+
+# Ressource: alle Linkages einmal pro Datenversion, Umschalten in der UI rechnet nichts neu
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_linkage_comparison(version):
+    from sections.Last_Holiday import build_behavior_matrix
+
+    return compare_linkages(build_behavior_matrix(load_last_vacation_data()))
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache("figures", codec="figure", ignore=("version",))
+def build_comparison_dendrogram(version, method, metric):
+    comparison = load_linkage_comparison(version)
+    linkage_matrix = comparison["linkages"][(method, metric)]
+    score = comparison["scores"].set_index(["Method", "Metric"]).loc[(method, metric), "Cophenetic"]
+
+    fig = ff.create_dendrogram(
+        comparison["scaled"],
+        orientation="left",
+        labels=comparison["labels"],
+        linkagefun=lambda _: linkage_matrix
+    )
+    fig.update_layout(
+        title=f"{method} / {metric} (cophenetic r = {score:.3f})",
+        height=450, margin=dict(t=60, l=60, r=20, b=30), showlegend=False
+    )
+    return fig
+
+
+def default_selection(scores):
+    """Startauswahl: die zwei besten Kombinationen plus Ward/euklidisch (das Dendrogramm oben auf der Seite)."""
+    options = [f"{m} / {d}" for m, d in zip(scores["Method"], scores["Metric"])]
+    return options, list(dict.fromkeys(options[:2] + ["ward / euclidean"]))
+
+
+def warm_default_dendrograms():
+    """Linkages und die Dendrogramme der Startauswahl vorab berechnen."""
+    version = data_version()
+    _, default = default_selection(load_linkage_comparison(version)["scores"])
+    for label in default:
+        build_comparison_dendrogram(version, *label.split(" / "))
+
+
+def render_linkage_comparison():
+    version = data_version()
+    comparison = load_linkage_comparison(version)
+    scores = comparison["scores"]
+
+    st.markdown(
+        "Cophenetic correlation: how well the dendrogram's merge heights preserve the original "
+        "pairwise distances between countries (1 = perfectly)."
+    )
+    fig_scores = px.bar(
+        scores.assign(Combination=scores["Method"] + " / " + scores["Metric"]),
+        x="Cophenetic", y="Combination", orientation="h", color="Method",
+        title="Cophenetic correlation by linkage method and distance metric"
+    )
+    fig_scores.update_layout(height=450, yaxis=dict(autorange="reversed"), xaxis_range=[0, 1])
+    show_chart(fig_scores)
+
+    options, default = default_selection(scores)
+    chosen = st.multiselect(
+        f"Dendrograms side by side (up to {MAX_SIDE_BY_SIDE}):", options, default=default,
+        max_selections=MAX_SIDE_BY_SIDE, key="linkage_compare"
+    )
+    if not chosen:
+        return
+    for col, label in zip(st.columns(len(chosen)), chosen):
+        method, metric = label.split(" / ")
+        with col:
+            show_chart(build_comparison_dendrogram(version, method, metric), key=f"dendro_{method}_{metric}")
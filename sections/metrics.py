@@ -0,0 +1,253 @@
+import functools
+import os
+import resource
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.environ.get("TOURISM_METRICS_PORT", "9464"))
+# TOURISM_METRICS=0 schaltet den Metrik-Endpunkt ab
+METRICS_ENABLED = os.environ.get("TOURISM_METRICS", "1") != "0"
+
+# Sekunden; Seiten brauchen warm < 1 s, kalt mehrere Sekunden, Exporte bis zum Timeout (60 s)
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Bytes Figure-JSON pro Seite und Rerun (Budgets in sections.figures: 48 KB Standard, 96 KB Last Vacation)
+PAYLOAD_BUCKETS = (16_000, 32_000, 48_000, 64_000, 96_000, 128_000, 160_000, 256_000, 512_000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    """Monoton steigender Zähler je Label-Kombination (Prometheus-Typ counter)."""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name, self.documentation, self.labels = name, documentation, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labels, key)} {value}" for key, value in values]
+        return lines
+
+
+class Histogram:
+    """Verteilung von Dauern mit festen Bucket-Grenzen je Label-Kombination (Prometheus-Typ histogram)."""
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.name, self.documentation, self.labels = name, documentation, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}  # Labels -> [Anzahl je Bucket (nicht kumuliert) ..., Summe, Anzahl]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            state = self._values.setdefault(label_values, [0] * (len(self.buckets) + 1) + [0.0, 0])
+            state[bisect_left(self.buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def expose(self):
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), state[:-2]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {state[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {state[-1]}")
+        return lines
+
+
+class Gauge:
+    """Momentanwert, beim Abruf über eine Funktion ermittelt; None lässt die Metrik weg."""
+
+    def __init__(self, name, documentation, read):
+        self.name, self.documentation, self.read = name, documentation, read
+
+    def expose(self):
+        value = self.read()
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+
+def _rss_bytes():
+    """Aktueller Resident Set Size (Linux: /proc, sonst Peak via getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _active_sessions():
+    """Verbundene Browser-Sessions dieses Serverprozesses (interne Streamlit-API)."""
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return None
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return None
+
+
+CACHE_REQUESTS = Counter(
+    "tourism_cache_requests_total", "Calls of cached dataset loaders by result (hit or miss).", ["dataset", "result"]
+)
+CACHE_LOAD_SECONDS = Histogram(
+    "tourism_cache_load_seconds", "Time to build a dataset on a cache miss.", ["dataset"]
+)
+SECTION_RENDER_SECONDS = Histogram(
+    "tourism_section_render_seconds", "Script time per page rerun, from routing to the end of the page.", ["section"]
+)
+SHARED_CACHE_REQUESTS = Counter(
+    "tourism_shared_cache_requests_total",
+    "Lookups in the shared on-disk cache by namespace and result (hit, waited for another replica, miss).",
+    ["namespace", "result"]
+)
+PAGE_FIGURE_BYTES = Histogram(
+    "tourism_page_figure_bytes", "Figure JSON sent to the browser per page rerun.", ["section"], buckets=PAYLOAD_BUCKETS
+)
+FIGURE_BUDGET_EXCEEDED = Counter(
+    "tourism_figure_budget_exceeded_total", "Page reruns whose figures exceeded the page's byte budget.", ["section"]
+)
+EXPORTS = Counter(
+    "tourism_exports_total", "Static image exports by format and outcome (ok, timeout, fallback).", ["format", "outcome"]
+)
+EXPORT_SECONDS = Histogram(
+    "tourism_export_seconds", "Image export duration including queue wait in the renderer pool.", ["format"]
+)
+METRICS = [
+    CACHE_REQUESTS, CACHE_LOAD_SECONDS, SHARED_CACHE_REQUESTS, SECTION_RENDER_SECONDS,
+    PAGE_FIGURE_BYTES, FIGURE_BUDGET_EXCEEDED, EXPORTS, EXPORT_SECONDS,
+    Gauge("tourism_active_sessions", "Connected browser sessions.", _active_sessions),
+    Gauge("tourism_process_resident_memory_bytes", "Resident set size of the server process.", _rss_bytes),
+]
+
+_local = threading.local()
+
+
+def cache_metrics(dataset, cache):
+    """
+    Wie ein Streamlit-Cache-Dekorator, zählt aber Treffer und Fehlschläge je Datensatz.
+
+    Beispiel:
+        @cache_metrics("attitudes", st.cache_data)
+        def load_attitudes_data(): ...
+
+    Ob der Aufruf ein Fehlschlag war, merkt sich der Funktionsrumpf (er läuft nur ohne Treffer);
+    ein Stapel pro Thread hält verschachtelte Loader (ein Loader ruft einen anderen) auseinander.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _local.stack[-1] = True
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            CACHE_LOAD_SECONDS.observe(time.perf_counter() - start, dataset)
+            return result
+
+        cached = cache(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = _local.__dict__.setdefault("stack", [])
+            stack.append(False)
+            try:
+                result = cached(*args, **kwargs)
+            finally:
+                missed = stack.pop()
+            CACHE_REQUESTS.inc(dataset, "miss" if missed else "hit")
+            return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorate
+
+
+def observe_section(section, seconds):
+    SECTION_RENDER_SECONDS.observe(seconds, section)
+
+
+def observe_figures(section, nbytes, over_budget=False):
+    PAGE_FIGURE_BYTES.observe(nbytes, section)
+    if over_budget:
+        FIGURE_BUDGET_EXCEEDED.inc(section)
+
+
+def observe_export(fmt, seconds, outcome="ok"):
+    EXPORTS.inc(fmt, outcome)
+    if outcome != "timeout":
+        EXPORT_SECONDS.observe(seconds, fmt)
+
+
+def render_metrics():
+    """Alle Metriken im Prometheus-Textformat (Version 0.0.4)."""
+    lines = []
+    for metric in METRICS:
+        lines += metric.expose()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    server_version = "TourismMetrics/1.0"
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes nicht ins Streamlit-Log schreiben
+        pass
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Startet /metrics in einem Daemon-Thread. port=0 wählt einen freien Port (z. B. für Tests)."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="tourism-metrics", daemon=True).start()
+    return server
+
+
+@st.cache_resource(show_spinner=False)
+def serve_metrics():
+    """Einmal pro Serverprozess starten; ist der Port belegt (weitere Replika), wird übersprungen."""
+    if not METRICS_ENABLED:
+        return None
+    try:
+        return start_metrics_server()
+    except OSError:
+        return None
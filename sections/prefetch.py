@@ -0,0 +1,76 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sections.data import data_version
+
+logger = logging.getLogger(__name__)
+
+# Menü-Präfix -> Modul mit warm()-Funktion, in Menü-Reihenfolge
+SECTION_WARMERS = [
+    ("1.", "sociodemographics"),
+    ("2.", "attitudes"),
+    ("2a.", "differences"),
+    ("2b.", "correlations"),
+    ("3.", "Last_Holiday"),
+    ("4.", "descriptions_rating"),
+    ("4a.", "adjective_ratings"),
+    ("4b.", "crosstab"),
+]
+
+# TOURISM_PREFETCH=0 schaltet das Vorwärmen ab (z. B. für Offline-Renderer, die jede Sektion selbst rendern)
+PREFETCH_ENABLED = os.environ.get("TOURISM_PREFETCH", "1") != "0"
+
+# Wenige Threads reichen: es geht um I/O, Pandas und sklearn, nicht um Durchsatz
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_submitted = set()
+_lock = threading.Lock()
+
+
+def _warm(module_name):
+    import importlib
+
+    from sections.validation import DataValidationError
+
+    try:
+        importlib.import_module(f"sections.{module_name}").warm()
+    except DataValidationError as exc:
+        # Die Seite zeigt den Prüfbericht; nichts vorzuwärmen
+        logger.warning("Prefetch of section %s skipped: %s", module_name, exc)
+    except Exception:
+        # Vorwärmen ist optional – Fehler tauchen spätestens beim echten Seitenaufruf auf
+        logger.exception("Prefetch of section %s failed", module_name)
+
+
+def sections_to_prefetch(current_menu):
+    """Alle anderen Sektionen, beginnend mit der nächsten im Menü (wahrscheinlichster nächster Klick)."""
+    prefixes = [prefix for prefix, _ in SECTION_WARMERS]
+    current = next((i for i, p in enumerate(prefixes) if current_menu.startswith(p)), -1)
+    ordered = SECTION_WARMERS[current + 1:] + SECTION_WARMERS[:max(current, 0)]
+    return [module for _, module in ordered]
+
+
+def prefetch_other_sections(current_menu):
+    """
+    Wärmt Daten und abgeleitete Artefakte der anderen Sektionen in einem Thread-Pool vor.
+
+    Kehrt sofort zurück und blockiert die aktive Session nicht. Jede Sektion wird pro
+    Serverprozess und Datenversion nur einmal eingereiht.
+    """
+    if not PREFETCH_ENABLED:
+        return
+    version = data_version()
+    for module_name in sections_to_prefetch(current_menu):
+        key = (module_name, version)
+        with _lock:
+            if key in _submitted:
+                continue
+            _submitted.add(key)
+        _executor.submit(_warm, module_name)
+
+
+def reset_prefetch():
+    """Nach einem Force Reload (Caches geleert) wieder alle Sektionen einreihen."""
+    with _lock:
+        _submitted.clear()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from sections.shared_cache import code_version, get_store, input_hash
+
+NAMESPACE = "models"
+# Liegt in der geteilten Ablage neben den Modellen: preload_models sieht, was andere Replikas gefittet haben
+MANIFEST_NAME = "models_manifest.json"
+
+# Artefakte, die in diesem Prozess schon geladen oder gefittet wurden: name -> (Schlüssel, Objekt)
+_loaded = {}
+# _lock schützt nur die beiden Dicts; gefittet und geladen wird unter der Sperre des jeweiligen Namens,
+# damit ein langsamer Fit die übrigen Artefakte nicht blockiert
+_lock = threading.Lock()
+_name_locks = {}
+
+
+def frame_hash(df, *params):
+    """Stabiler Hash über Werte, Index und Spalten eines DataFrames plus optionale Parameter."""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    h.update(repr(list(df.columns)).encode())
+    h.update(repr(params).encode())
+    return h.hexdigest()
+
+
+def manifest_path():
+    """Manifest im Wurzelverzeichnis der geteilten Ablage; None ohne Plattenstufe."""
+    root = get_store().root
+    return None if root is None else os.path.join(root, MANIFEST_NAME)
+
+
+def read_manifest():
+    path = manifest_path()
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _record(name, data_hash, key):
+    """Eintrag im Manifest setzen; unter der Sperre der Ablage, damit Replikas sich nicht überschreiben."""
+    path = manifest_path()
+    if path is None or read_manifest().get(name, {}).get("key") == key:
+        return
+    store = get_store()
+    with store.lock(NAMESPACE, "manifest"):
+        manifest = read_manifest()
+        manifest[name] = {"data_hash": data_hash, "key": key, "created": time.strftime("%Y-%m-%d %H:%M:%S")}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def get_model(name, data_hash, fit):
+    """
+    Liefert ein gefittetes Artefakt aus der Registry.
+
+    Reihenfolge: Prozess-Speicher → geteilte Platten-Ablage (sections.shared_cache, Schlüssel aus
+    Name, Daten-Hash und code_version(fit)) → fit(). Gefittet wird nur, wenn noch keine Replika
+    diese Eingangsdaten mit diesem Code gesehen hat; das Manifest in der geteilten Ablage merkt
+    sich den letzten Stand je Name für preload_models.
+
+    Parameter:
+    - name: eindeutiger Name des Artefakts, z. B. "attitudes_clusters"
+    - data_hash: Hash der Eingangsdaten (siehe frame_hash)
+    - fit: Funktion ohne Argumente, die das Artefakt erzeugt
+    """
+    key = input_hash(name, data_hash, code_version(fit))
+    with _lock:
+        cached = _loaded.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+        name_lock = _name_locks.setdefault(name, threading.Lock())
+
+    with name_lock:
+        # Ein anderer Thread kann denselben Stand inzwischen geladen haben
+        with _lock:
+            cached = _loaded.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        model = get_store().get_or_compute(NAMESPACE, key, fit)
+        _record(name, data_hash, key)
+
+        with _lock:
+            _loaded[name] = (key, model)
+        return model
+
+
+@st.cache_resource(show_spinner=False)
+def preload_models():
+    """Lädt beim Serverstart alle registrierten Artefakte in den Prozess-Speicher."""
+    store = get_store()
+    if store.root is None:
+        return []
+    loaded = []
+    for name, entry in read_manifest().items():
+        # Einträge älterer Manifeste (eine Datei pro Name, ohne Schlüssel) werden beim nächsten Fit ersetzt
+        model = store.get(NAMESPACE, entry["key"], "joblib") if "key" in entry else None
+        if model is None:
+            continue
+        with _lock:
+            _loaded[name] = (entry["key"], model)
+        loaded.append(name)
+    return loaded
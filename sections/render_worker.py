@@ -0,0 +1,54 @@
+"""
+Eigenständiger Kaleido-Worker für sections.renderer.
+
+Wird als eigener Interpreter gestartet (python -m sections.render_worker <host> <port>) und
+verbindet sich über multiprocessing.connection mit dem Dashboard-Prozess. Der Worker importiert
+nur Plotly – nie app.py oder andere Sektionen, egal unter welchem Hauptmodul das Dashboard läuft.
+Schlüssel für die Verbindung kommt über die Umgebungsvariable TOURISM_RENDER_AUTHKEY (hex).
+"""
+import os
+import sys
+import time
+from multiprocessing.connection import Client
+
+AUTHKEY_ENV = "TOURISM_RENDER_AUTHKEY"
+
+
+def probe_figure():
+    import plotly.graph_objects as go
+
+    return go.Figure(go.Scatter(x=[0, 1], y=[0, 1])).to_json()
+
+
+def render(spec, fmt, width, height, scale):
+    """Kaleido bleibt zwischen den Jobs gestartet, nur der erste Job zahlt den Start."""
+    import plotly.io as pio
+
+    start = time.perf_counter()
+    data = pio.from_json(spec).to_image(format=fmt, width=width, height=height, scale=scale)
+    return data, time.perf_counter() - start
+
+
+def main(argv=None):
+    host, port = (argv or sys.argv[1:])[:2]
+    conn = Client((host, int(port)), authkey=bytes.fromhex(os.environ[AUTHKEY_ENV]))
+    # Chromium-Prozess von Kaleido sofort hochfahren statt beim ersten echten Export
+    render(probe_figure(), "png", 10, 10, 1)
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            # Dashboard-Prozess beendet oder Verbindung geschlossen
+            break
+        if job is None:
+            break
+        try:
+            conn.send(("ok",) + render(*job))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
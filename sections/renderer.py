@@ -0,0 +1,324 @@
+import logging
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Listener
+
+from sections.metrics import observe_export
+from sections.render_worker import AUTHKEY_ENV, probe_figure, render
+from sections.shared_cache import get_store, input_hash
+
+logger = logging.getLogger(__name__)
+
+# Anzahl Render-Prozesse; 0 rendert wie früher direkt im aufrufenden Thread
+RENDER_WORKERS = int(os.environ.get("TOURISM_RENDER_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Obergrenze pro Bild (inklusive Wartezeit auf einen freien Worker), danach wird der Worker ersetzt
+RENDER_TIMEOUT_S = float(os.environ.get("TOURISM_RENDER_TIMEOUT", "60"))
+HEALTH_TIMEOUT_S = 15.0
+# Sekunden zwischen zwei Probe-Exporten im Hintergrund; 0 schaltet die regelmäßige Prüfung ab
+HEALTH_INTERVAL_S = float(os.environ.get("TOURISM_RENDER_HEALTH_INTERVAL", "60"))
+# Start eines Workers inklusive Kaleido-Warmup
+STARTUP_TIMEOUT_S = 60.0
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_pool = None
+_lock = threading.Lock()
+_recent = deque(maxlen=200)  # (Wartezeit, Renderzeit) der letzten Jobs
+_stats = {
+    "submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "restarts": 0, "fallbacks": 0,
+    "health_checks": 0, "health_failures": 0
+}
+
+
+class WorkerError(RuntimeError):
+    """Worker-Prozess beendet oder Verbindung abgebrochen."""
+
+
+class _Worker:
+    """
+    Ein Kaleido-Prozess (python -m sections.render_worker) mit eigener Verbindung.
+
+    Die Worker sind eigene Interpreter statt multiprocessing-Kinder: spawn würde im Kind das
+    Hauptmodul neu importieren, unter Streamlit also app.py, und fork kopiert den
+    mehrfädigen Serverprozess.
+    """
+
+    def __init__(self):
+        authkey = secrets.token_bytes(16)
+        # Eigener Listener pro Worker: die Verbindung gehört eindeutig zu diesem Prozess
+        with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+            host, port = listener.address
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "sections.render_worker", host, str(port)],
+                cwd=ROOT, env={**os.environ, AUTHKEY_ENV: authkey.hex()}, stdin=subprocess.DEVNULL
+            )
+            # accept() kennt kein Timeout – stirbt der Worker vor dem Verbinden, schließt der Timer den Listener
+            timer = threading.Timer(STARTUP_TIMEOUT_S, listener.close)
+            timer.start()
+            try:
+                self.conn = listener.accept()
+            except OSError:
+                self.process.kill()
+                raise WorkerError("render worker did not connect") from None
+            finally:
+                timer.cancel()
+        try:
+            if not self.conn.poll(STARTUP_TIMEOUT_S):
+                raise WorkerError("render worker did not warm up in time")
+            self.conn.recv()
+        except (EOFError, OSError, WorkerError) as exc:
+            self.kill()
+            raise WorkerError(str(exc) or "render worker died during warm-up") from None
+
+    def run(self, job, timeout):
+        """(Bilddaten, Renderzeit); TimeoutError nach timeout Sekunden, WorkerError bei Absturz."""
+        try:
+            self.conn.send(job)
+            ready = self.conn.poll(max(timeout, 0))
+            if ready:
+                status, *result = self.conn.recv()
+        except (EOFError, OSError):
+            raise WorkerError("render worker died") from None
+        if not ready:
+            raise TimeoutError
+        if status == "error":
+            raise RuntimeError(result[0])
+        return result
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def kill(self):
+        self.process.kill()
+        self.conn.close()
+
+
+class _Pool:
+    """Feste Zahl Worker; freie Worker warten in einer Queue, ersetzte starten im Hintergrund."""
+
+    def __init__(self, size):
+        self.size = size
+        self.idle = queue.Queue()
+        self.closed = False
+        self.workers = 0  # laufende und startende Worker
+        self._lock = threading.Lock()  # nicht das Modul-Lock: der Pool entsteht, während es gehalten wird
+        for _ in range(size):
+            self.spawn()
+
+    def spawn(self):
+        with self._lock:
+            self.workers += 1
+        threading.Thread(target=self._start_worker, name="renderer-start", daemon=True).start()
+
+    def _start_worker(self):
+        try:
+            worker = _Worker()
+        except Exception:
+            logger.exception("Could not start render worker")
+            with self._lock:
+                self.workers -= 1
+            return
+        if self.closed:
+            worker.kill()
+        else:
+            self.idle.put(worker)
+
+    def acquire(self, timeout):
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError from None
+
+    def release(self, worker):
+        self.idle.put(worker)
+
+    def replace(self, worker, reason):
+        """Hängenden oder abgestürzten Worker beenden und einen frischen starten."""
+        logger.warning("Replacing render worker: %s", reason)
+        with _lock:
+            _stats["restarts"] += 1
+        with self._lock:
+            self.workers -= 1
+        worker.kill()
+        if not self.closed:
+            self.spawn()
+
+    def reap(self):
+        """Freie Worker, deren Prozess nicht mehr läuft, ersetzen."""
+        for _ in range(self.idle.qsize()):
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker.alive():
+                self.idle.put(worker)
+            else:
+                self.replace(worker, "worker process exited")
+
+    def shutdown(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+
+def _health_loop(pool):
+    while not pool.closed:
+        time.sleep(HEALTH_INTERVAL_S)
+        pool.reap()
+        check_health()
+
+
+def _start_pool():
+    """Neuer Pool; Worker starten und wärmen Kaleido im Hintergrund vor, ohne den Aufrufer zu blockieren."""
+    pool = _Pool(RENDER_WORKERS)
+    if HEALTH_INTERVAL_S > 0:
+        threading.Thread(target=_health_loop, args=(pool,), name="renderer-health", daemon=True).start()
+    return pool
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = _start_pool()
+        return _pool
+
+
+def start_renderer_pool():
+    """Pool einmal pro Prozess anlegen und alle Worker vorwärmen, ohne zu blockieren."""
+    global _pool
+    if RENDER_WORKERS <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = _start_pool()
+        return _pool
+
+
+def render_image(fig, *, format="png", width=None, height=None, scale=None, timeout=RENDER_TIMEOUT_S):
+    """
+    Statischer Export einer Figure über den Pool warmer Kaleido-Prozesse.
+
+    Mehrere Exporte (z. B. Download-Klicks verschiedener Sessions) laufen parallel auf
+    mehreren Kernen. Ein Job, der das Timeout überschreitet, löst TimeoutError aus und
+    sein Worker wird ersetzt; stürzt ein Worker ab, wird einmal lokal gerendert.
+    Fertige Bilder liegen in der geteilten Ablage (sections.shared_cache, Schlüssel aus Figure-JSON
+    und Exportparametern) – dieselbe Grafik rendert keine Replika ein zweites Mal.
+
+    Parameter:
+    - fig: Plotly-Figure oder Figure-JSON
+    - format, width, height, scale: wie Figure.to_image
+    - timeout: Sekunden bis zum Abbruch (inklusive Wartezeit in der Queue)
+    """
+    spec = fig if isinstance(fig, str) else fig.to_json()
+    return get_store().get_or_compute(
+        "exports", input_hash(spec, format, width, height, scale),
+        lambda: _render_image(spec, format, width, height, scale, timeout), codec="bytes"
+    )
+
+
+def _render_image(spec, format, width, height, scale, timeout):
+    if RENDER_WORKERS <= 0:
+        data, render_s = render(spec, format, width, height, scale)
+        observe_export(format, render_s)
+        return data
+
+    submitted = time.perf_counter()
+    with _lock:
+        _stats["submitted"] += 1
+    pool = _get_pool()
+    if pool.workers <= 0:
+        # kein Worker ließ sich starten (z. B. Kaleido fehlt im Worker-Interpreter): lokal rendern
+        with _lock:
+            _stats["fallbacks"] += 1
+        data, render_s = render(spec, format, width, height, scale)
+        observe_export(format, time.perf_counter() - submitted, "fallback")
+        return data
+    worker = None
+    try:
+        worker = pool.acquire(timeout)
+        data, render_s = worker.run((spec, format, width, height, scale), timeout - (time.perf_counter() - submitted))
+    except TimeoutError:
+        with _lock:
+            _stats["timeouts"] += 1
+        if worker is not None:
+            pool.replace(worker, f"export exceeded {timeout:.0f}s")
+        observe_export(format, timeout, "timeout")
+        raise TimeoutError(f"Image export exceeded {timeout:.0f}s") from None
+    except WorkerError:
+        with _lock:
+            _stats["failed"] += 1
+            _stats["fallbacks"] += 1
+        pool.replace(worker, "worker process died")
+        data, render_s = render(spec, format, width, height, scale)
+        observe_export(format, time.perf_counter() - submitted, "fallback")
+        return data
+    except Exception:
+        # Fehler in der Figure selbst: Worker ist gesund und geht zurück in den Pool
+        with _lock:
+            _stats["failed"] += 1
+        pool.release(worker)
+        raise
+    pool.release(worker)
+
+    total_s = time.perf_counter() - submitted
+    with _lock:
+        _stats["completed"] += 1
+        _recent.append((total_s - render_s, render_s))
+    observe_export(format, total_s)
+    return data
+
+
+def check_health(timeout=HEALTH_TIMEOUT_S):
+    """
+    Rendert eine Mini-Figure über einen Worker; ein hängender Worker wird dabei ersetzt.
+    Läuft nach dem Start alle HEALTH_INTERVAL_S Sekunden im Hintergrund.
+    """
+    if RENDER_WORKERS <= 0:
+        return True
+    with _lock:
+        _stats["health_checks"] += 1
+    try:
+        # am geteilten Cache vorbei: die Probe soll wirklich einen Worker erreichen
+        _render_image(probe_figure(), "png", 10, 10, 1, timeout)
+        return True
+    except Exception:
+        logger.warning("Renderer health check failed", exc_info=True)
+        with _lock:
+            _stats["health_failures"] += 1
+        return False
+
+
+def renderer_metrics():
+    """Zähler, Queue-Tiefe und Renderzeiten (Mittel/p95 der letzten Jobs in ms)."""
+    with _lock:
+        stats = dict(_stats)
+        recent = list(_recent)
+    in_flight = stats["submitted"] - stats["completed"] - stats["timeouts"] - stats["failed"]
+    metrics = {
+        "workers": RENDER_WORKERS,
+        "running": _pool is not None,
+        "idle": _pool.idle.qsize() if _pool is not None else 0,
+        "in_flight": in_flight,
+        "queue_depth": max(0, in_flight - RENDER_WORKERS),
+        **stats
+    }
+    if recent:
+        waits = sorted(w for w, _ in recent)
+        renders = sorted(r for _, r in recent)
+        p95 = int(0.95 * (len(recent) - 1))
+        metrics.update({
+            "render_ms_mean": 1000 * sum(renders) / len(renders),
+            "render_ms_p95": 1000 * renders[p95],
+            "queue_wait_ms_mean": 1000 * sum(waits) / len(waits),
+            "queue_wait_ms_p95": 1000 * waits[p95]
+        })
+    return metrics
@@ -0,0 +1,166 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.cluster import MiniBatchKMeans
+
+from sections.figures import show_chart
+from sections.shared_cache import code_version, get_store, input_hash
+from sections.validation import load_dataset
+
+ATTITUDES_FILE = "data/Cleaned_Tourism_Attitudes.csv"
+# Optionale Befragtendaten: eine Zeile pro Person, Spalten A–H mit Likert-Werten 1–5
+RESPONDENT_FILE = "data/Respondents_Attitudes.csv"
+
+STATEMENT_CODES = ["A", "B", "C", "D", "E", "F", "G", "H"]
+LIKERT_COLUMNS = ["Strongly disagree", "Disagree", "Neither agree nor disagree", "Agree", "Strongly agree"]
+
+N_SEGMENTS = 4
+CHUNK_SIZE = 5000
+SEED = 42
+
+
+# ------------------------------
+# Befragten-Chunks
+# ------------------------------
+def read_respondent_chunks(path=RESPONDENT_FILE, chunk_size=CHUNK_SIZE):
+    """Liest Befragtendaten blockweise, es liegen nie mehr als chunk_size Zeilen im Speicher."""
+    for chunk in pd.read_csv(path, usecols=STATEMENT_CODES, chunksize=chunk_size):
+        yield chunk.dropna()
+
+
+def synthetic_respondent_chunks(n_per_country=1000, chunk_size=CHUNK_SIZE, seed=SEED):
+    """
+    Erzeugt Befragte aus den Likert-Verteilungen je Land und Statement.
+
+    Die Statements werden unabhängig voneinander gezogen, die Daten dienen also nur als
+    Platzhalter, solange keine Befragtendaten vorliegen.
+    """
+    df = load_dataset("attitudes")
+    df = df[df["Country"] != "Total"]
+    rng = np.random.default_rng(seed)
+
+    for country, group in df.groupby("Country"):
+        probs = group.set_index("Statement_Code").loc[STATEMENT_CODES, LIKERT_COLUMNS].to_numpy(dtype=float)
+        probs = probs / probs.sum(axis=1, keepdims=True)
+
+        for start in range(0, n_per_country, chunk_size):
+            n = min(chunk_size, n_per_country - start)
+            # inverse CDF: eine Zufallszahl pro Person und Statement
+            u = rng.random((n, len(STATEMENT_CODES), 1))
+            scores = (u > probs.cumsum(axis=1)[None, :, :]).sum(axis=2) + 1
+            yield pd.DataFrame(np.minimum(scores, 5), columns=STATEMENT_CODES)
+
+
+def respondent_chunks(chunk_size=CHUNK_SIZE):
+    if os.path.exists(RESPONDENT_FILE):
+        return read_respondent_chunks(RESPONDENT_FILE, chunk_size)
+    return synthetic_respondent_chunks(chunk_size=chunk_size)
+
+
+# ------------------------------
+# Fit & Zuordnung
+# ------------------------------
+def fit_segments(make_chunks, n_segments=N_SEGMENTS, seed=SEED):
+    """
+    Segmentiert Befragte mit MiniBatchKMeans über einen Strom von Chunks.
+
+    Parameter:
+    - make_chunks: Funktion ohne Argumente, die einen neuen Chunk-Iterator liefert
+      (es gibt zwei Durchläufe: Fit und Profil-Berechnung)
+    - n_segments: Anzahl Segmente
+
+    Rückgabe:
+    - centroids: Array (Segmente × Statements) auf der Likert-Skala
+    - profiles: DataFrame (Segment × Statement) mit Zustimmung in % (Agree + Strongly agree)
+    - sizes: Array mit der Anzahl Befragter je Segment
+    """
+    model = MiniBatchKMeans(n_clusters=n_segments, random_state=seed, n_init=3)
+    for chunk in make_chunks():
+        if len(chunk) >= n_segments:
+            model.partial_fit(chunk[STATEMENT_CODES].to_numpy(dtype=np.float32))
+
+    centroids = model.cluster_centers_.astype(np.float32)
+
+    # zweiter Durchlauf: Zustimmung je Segment mit festen Zentren zählen
+    agree = np.zeros((n_segments, len(STATEMENT_CODES)))
+    sizes = np.zeros(n_segments, dtype=np.int64)
+    for chunk in make_chunks():
+        values = chunk[STATEMENT_CODES].to_numpy(dtype=np.float32)
+        labels = assign_segments(values, centroids)
+        np.add.at(agree, labels, values >= 4)
+        sizes += np.bincount(labels, minlength=n_segments)
+
+    profiles = pd.DataFrame(
+        100 * agree / np.maximum(sizes, 1)[:, None],
+        columns=STATEMENT_CODES
+    )
+    profiles.index.name = "Segment"
+    return centroids, profiles, sizes
+
+
+def assign_segments(values, centroids):
+    """Ordnet Befragte dem nächsten Zentrum zu – O(k) pro Person, ohne Refit."""
+    values = np.asarray(values, dtype=np.float32)
+    distances = ((values[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+    return distances.argmin(axis=1)
+
+
+# ------------------------------
+# Persistenz der Zentren
+# ------------------------------
+def _source_hash(n_segments, seed):
+    h = hashlib.sha256()
+    source = RESPONDENT_FILE if os.path.exists(RESPONDENT_FILE) else ATTITUDES_FILE
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(f"{source}|{n_segments}|{seed}".encode())
+    return h.hexdigest()[:16]
+
+
+def load_or_fit_segments(n_segments=N_SEGMENTS, seed=SEED):
+    """Zentren aus der geteilten Ablage (sections.shared_cache), sonst fitten und ablegen."""
+    def fit():
+        centroids, profiles, sizes = fit_segments(respondent_chunks, n_segments, seed)
+        return {"centroids": centroids, "profiles": profiles.to_numpy(), "sizes": sizes}
+
+    key = input_hash("segments", _source_hash(n_segments, seed), code_version(fit))
+    stored = get_store().get_or_compute("segments", key, fit, codec="npz")
+    profiles = pd.DataFrame(stored["profiles"], columns=STATEMENT_CODES)
+    profiles.index.name = "Segment"
+    return stored["centroids"], profiles, stored["sizes"]
+
+
+# ------------------------------
+# Darstellung
+# ------------------------------
+def render_segments(short_labels):
+    from sections.attitudes import build_profile_radar
+
+    n_segments = st.slider("Number of segments", min_value=2, max_value=8, value=N_SEGMENTS, key="n_segments")
+    with st.spinner("Fitting respondent segments..."):
+        centroids, profiles, sizes = load_or_fit_segments(n_segments)
+
+    profiles = profiles.rename(columns=short_labels)
+    radar_fig = build_profile_radar(profiles, "Agreement by Respondent Segment (Radar View)", name_prefix="Segment")
+    show_chart(radar_fig)
+
+    summary = profiles.round(1)
+    summary.insert(0, "Share of respondents (%)", (100 * sizes / max(sizes.sum(), 1)).round(1))
+    st.dataframe(summary.style.highlight_max(axis=0, color="lightgreen"))
+
+    if not os.path.exists(RESPONDENT_FILE):
+        st.caption(
+            "No respondent-level file found – segments are fitted on synthetic respondents drawn from "
+            "the country-level answer distributions (statements sampled independently)."
+        )
+
+
+if __name__ == "__main__":
+    # Vorberechnung ohne Streamlit-Server: python -m sections.segmentation
+    for k in range(2, 9):
+        load_or_fit_segments(k)
+    print(f"Segment centroids stored in the shared cache ({get_store().root})")
@@ -0,0 +1,371 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from sections.metrics import SHARED_CACHE_REQUESTS
+
+try:
+    import fcntl
+except ImportError:  # Windows: ohne Dateisperre, gleichzeitige Replikas rechnen dann doppelt
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Gemeinsames Verzeichnis aller Replikas (z. B. ein geteiltes Volume); TOURISM_SHARED_CACHE=0 schaltet die Stufe ab
+SHARED_CACHE_DIR = os.environ.get("TOURISM_SHARED_CACHE", os.path.join("cache", "shared"))
+
+
+def _dump_npz(value, f):
+    np.savez(f, **value)
+
+
+def _load_npz(f):
+    with np.load(f, allow_pickle=False) as stored:
+        return {name: stored[name] for name in stored.files}
+
+
+def _dump_figure(fig, f):
+    f.write(fig.to_json().encode())
+
+
+def _load_figure(f):
+    import plotly.io as pio
+
+    return pio.from_json(f.read().decode())
+
+
+def _dump_joblib(value, f):
+    import joblib
+
+    joblib.dump(value, f)
+
+
+def _load_joblib(f):
+    import joblib
+
+    return joblib.load(f)
+
+
+# Codec -> (Dateiendung, schreiben, lesen); Dateien werden binär geöffnet
+CODECS = {
+    "joblib": ("joblib", _dump_joblib, _load_joblib),  # Modelle, DataFrames, beliebige Python-Objekte
+    "npz": ("npz", _dump_npz, _load_npz),  # dict aus Numpy-Arrays, ohne Pickle
+    "figure": ("json", _dump_figure, _load_figure),  # Plotly-Figure als JSON
+    "bytes": ("bin", lambda value, f: f.write(value), lambda f: f.read()),  # fertige Exporte (PNG, SVG, ...)
+}
+
+
+def input_hash(*parts):
+    """
+    Inhaltsadresse aus beliebigen Eingaben: DataFrames und Arrays über ihre Werte, Bytes und
+    Texte direkt, alles andere über repr(). Gleiche Eingaben ergeben auf jeder Replika denselben Schlüssel.
+    """
+    # erst hier: die Kaleido-Worker importieren sections.renderer und sollen Pandas nicht laden
+    import pandas as pd
+
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            data = pd.util.hash_pandas_object(part, index=True).values.tobytes()
+            data += repr(list(part.columns) if isinstance(part, pd.DataFrame) else part.name).encode()
+        elif isinstance(part, np.ndarray):
+            data = part.tobytes() + repr((part.shape, part.dtype.str)).encode()
+        elif isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode()
+        else:
+            data = repr(part).encode()
+        # Länge vorneweg: ("ab", "c") und ("a", "bc") ergeben verschiedene Schlüssel
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+# (Code-Objekt, Modul) -> Version; Code-Objekte gleichen Inhalts sind gleich, rufen aber je Modul andere Funktionen
+_code_versions = {}
+
+
+def _bytecode_text(code):
+    """Bytecode, Konstanten und Namen (rekursiv) – ohne Dateiname und Zeilennummern, die je Replika abweichen können."""
+    parts = [code.co_code.hex(), repr(code.co_names)]
+    for const in code.co_consts:
+        parts.append(_bytecode_text(const) if inspect.iscode(const) else repr(const))
+    return "\n".join(parts)
+
+
+def code_version(func):
+    """
+    Hash über den Quelltext einer Funktion und aller sections-Funktionen, die sie – auch aus
+    Lambdas im Rumpf – über einen globalen Namen aufruft. Ändert sich die Rechnung, ändert sich
+    der Schlüssel; alte Einträge bleiben liegen, bis prune sie abräumt. Funktionen, die nur über
+    Closures erreichbar sind, zählen nicht mit.
+    """
+    unwrapped = inspect.unwrap(func)
+    memo_key = (unwrapped.__code__, id(unwrapped.__globals__))
+    if memo_key not in _code_versions:
+        h = hashlib.sha256()
+        seen, pending = set(), [func]
+        while pending:
+            current = inspect.unwrap(pending.pop())
+            if (current.__code__, id(current.__globals__)) in seen:
+                continue
+            seen.add((current.__code__, id(current.__globals__)))
+            try:
+                source = inspect.getsource(current)
+            except (OSError, TypeError):
+                # ohne Quelltext (z. B. nur .pyc ausgeliefert): Bytecode statt Text
+                source = _bytecode_text(current.__code__)
+            h.update(source.encode())
+            names, codes = set(), [current.__code__]
+            while codes:
+                block = codes.pop()
+                names.update(block.co_names)
+                codes += [const for const in block.co_consts if inspect.iscode(const)]
+            for name in sorted(names, reverse=True):
+                callee = current.__globals__.get(name)
+                if callable(callee):
+                    callee = inspect.unwrap(callee)
+                if inspect.isfunction(callee) and callee.__module__.startswith("sections."):
+                    pending.append(callee)
+        _code_versions[memo_key] = h.hexdigest()[:16]
+    return _code_versions[memo_key]
+
+
+class DirectoryStore:
+    """
+    Inhaltsadressierte Ablage in einem Verzeichnis: <root>/<namespace>/<key[:2]>/<key>.<endung>.
+
+    Schreiben ist atomar (temporäre Datei, dann os.replace), Leser brauchen keine Sperre.
+    Berechnet wird unter einer exklusiven Dateisperre pro Schlüssel: Fragen mehrere Replikas
+    gleichzeitig nach demselben Eintrag, rechnet eine, die anderen warten und lesen ihr Ergebnis.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, namespace, key, codec):
+        return os.path.join(self.root, namespace, key[:2], f"{key}.{CODECS[codec][0]}")
+
+    def get(self, namespace, key, codec):
+        """Gespeicherter Wert oder None; ein Treffer frischt die Änderungszeit auf (für prune)."""
+        path = self.path(namespace, key, codec)
+        try:
+            with open(path, "rb") as f:
+                value = CODECS[codec][2](f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # z. B. mit einer anderen Bibliotheksversion geschrieben – neu berechnen und überschreiben
+            logger.warning("Unreadable shared cache entry %s, recomputing", path, exc_info=True)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return value
+
+    def put(self, namespace, key, value, codec):
+        path = self.path(namespace, key, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                CODECS[codec][1](value, f)
+            os.replace(tmp, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+
+    @contextlib.contextmanager
+    def lock(self, namespace, key):
+        """Exklusive Sperre über Prozesse und Threads hinweg (flock; fällt mit dem Prozess automatisch)."""
+        path = os.path.join(self.root, namespace, key[:2], f"{key}.lock")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Änderungszeit = letzte Benutzung; prune räumt nur lange unbenutzte Sperrdateien ab
+                with contextlib.suppress(OSError):
+                    os.utime(path)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get_or_compute(self, namespace, key, compute, codec="joblib"):
+        value = self.get(namespace, key, codec)
+        if value is not None:
+            SHARED_CACHE_REQUESTS.inc(namespace, "hit")
+            return value
+        with self.lock(namespace, key):
+            # Während wir gewartet haben, kann eine andere Replika den Eintrag geschrieben haben
+            value = self.get(namespace, key, codec)
+            if value is not None:
+                SHARED_CACHE_REQUESTS.inc(namespace, "waited")
+                return value
+            value = compute()
+            try:
+                self.put(namespace, key, value, codec)
+            except OSError:
+                # Volle oder schreibgeschützte Ablage: Ergebnis trotzdem liefern
+                logger.warning("Could not write shared cache entry %s/%s", namespace, key, exc_info=True)
+        SHARED_CACHE_REQUESTS.inc(namespace, "miss")
+        return value
+
+    def entries(self):
+        """(Namespace, Pfad, Bytes, Änderungszeit) aller Einträge (ohne Sperr- und temporäre Dateien)."""
+        if not os.path.isdir(self.root):
+            return
+        for namespace in sorted(os.listdir(self.root)):
+            for directory, _, names in os.walk(os.path.join(self.root, namespace)):
+                for name in names:
+                    if name.endswith((".lock", ".tmp")):
+                        continue
+                    path = os.path.join(directory, name)
+                    stat = os.stat(path)
+                    yield namespace, path, stat.st_size, stat.st_mtime
+
+    def _leftovers(self):
+        """Pfade aller Sperrdateien und temporären Dateien (abgebrochene Schreibvorgänge)."""
+        if not os.path.isdir(self.root):
+            return
+        for namespace in sorted(os.listdir(self.root)):
+            for directory, _, names in os.walk(os.path.join(self.root, namespace)):
+                for name in names:
+                    if name.endswith((".lock", ".tmp")):
+                        yield os.path.join(directory, name)
+
+    @staticmethod
+    def _remove_lock(path):
+        """Sperrdatei löschen, aber nur, wenn gerade niemand sie hält."""
+        try:
+            with open(path, "a") as f:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return False
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def prune(self, max_age_s):
+        """
+        Löscht Einträge, die seit max_age_s Sekunden niemand gelesen oder geschrieben hat, dazu
+        ebenso alte Sperrdateien und Reste abgebrochener Schreibvorgänge. Rückgabe: gelöschte Einträge.
+        """
+        cutoff = time.time() - max_age_s
+        removed = 0
+        for _, path, _, mtime in list(self.entries()):
+            if mtime < cutoff:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                removed += 1
+        leftovers = 0
+        for path in list(self._leftovers()):
+            try:
+                if os.stat(path).st_mtime >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if path.endswith(".lock"):
+                leftovers += self._remove_lock(path)
+            else:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                leftovers += 1
+        if leftovers:
+            logger.info("Removed %d stale lock and temporary files from %s", leftovers, self.root)
+        return removed
+
+
+class NullStore:
+    """Ohne Plattenstufe: jeder Aufruf rechnet (nur noch die Streamlit-Caches im Prozess)."""
+
+    root = None
+
+    def get_or_compute(self, namespace, key, compute, codec="joblib"):
+        return compute()
+
+    def entries(self):
+        return iter(())
+
+    def prune(self, max_age_s):
+        return 0
+
+
+_store = NullStore() if SHARED_CACHE_DIR == "0" else DirectoryStore(SHARED_CACHE_DIR)
+
+
+def get_store():
+    return _store
+
+
+def set_store(store):
+    """Andere Ablage einsetzen (gleiche Schnittstelle wie DirectoryStore, z. B. für Tests oder Tools)."""
+    global _store
+    _store = store
+
+
+def shared_cache(namespace, codec="joblib", ignore=()):
+    """
+    Plattenstufe unter einem Streamlit-Cache: was eine Replika berechnet hat, lesen die anderen.
+
+    Beispiel:
+        @st.cache_data
+        @shared_cache("figures", codec="figure", ignore=("version",))
+        def build_figure(version, method): ...
+
+    Schlüssel: Funktion, ihr Quelltext samt aufgerufener sections-Funktionen (code_version),
+    Inhalt der Datendateien (sections.data.data_fingerprint) und die Argumente. Nach einem
+    Deployment mit geänderter Rechnung liest also keine Replika mehr alte Ergebnisse.
+    Argumente in ignore zählen nicht mit – etwa data_version(), das auf Änderungszeiten
+    beruht und sich zwischen Replikas mit denselben Daten unterscheiden kann.
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from sections.data import data_fingerprint
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            inputs = [value for name, value in bound.arguments.items() if name not in ignore]
+            # erst beim Aufruf: aufgerufene Funktionen weiter unten im Modul sind dann definiert
+            key = input_hash(func.__module__, func.__qualname__, code_version(func), data_fingerprint(), *inputs)
+            return get_store().get_or_compute(namespace, key, lambda: func(*args, **kwargs), codec)
+
+        return wrapper
+
+    return decorate
+
+
+if __name__ == "__main__":
+    # Übersicht und Aufräumen der geteilten Ablage: python -m sections.shared_cache [--prune-days 30]
+    parser = argparse.ArgumentParser(description="Show or prune the shared on-disk cache")
+    parser.add_argument("--prune-days", type=float, help="delete entries not used for this many days")
+    args = parser.parse_args()
+
+    store = get_store()
+    if store.root is None:
+        parser.exit(message="Shared cache disabled (TOURISM_SHARED_CACHE=0)\n")
+    if args.prune_days is not None:
+        print(f"Removed {store.prune(args.prune_days * 86400)} entries older than {args.prune_days:g} days")
+
+    totals = {}
+    for namespace, _, size, _ in store.entries():
+        count, total = totals.get(namespace, (0, 0))
+        totals[namespace] = (count + 1, total + size)
+    print(f"Shared cache in {store.root}/")
+    for namespace, (count, total) in sorted(totals.items()):
+        print(f"    {namespace:<12}{count:>6} entries{total / 1024 ** 2:>10.1f} MB")
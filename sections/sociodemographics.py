@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from .utils import prepare_figure_for_export
+from .utils import deferred_export, deferred_image
+from .figures import show_chart
 import plotly.io as pio
 pio.kaleido.scope.default_format = "png"
 
@@ -21,36 +22,62 @@ country_label_map = {
 }
 
 
-def render(sociodemo_df):
-    st.title("Socio-demographics & distribution")
+GENDER_COLUMNS = [
+    "Gender", "Total (A)", "KR (F)", "UAE (G)", "SG (B)", "UK (C)", "US (D)",
+    "CN (E)", "BR (H)", "FR (I)", "DE (J)", "AU (K)"
+]
+DEFAULT_GENDER_COUNTRIES = ["South Korea", "United Arab Emirates", "All Countries"]
 
-    # GENDER =======================================
-    st.subheader("Gender distribution – Total vs. Korea & UAE")
 
-    gender_data = sociodemo_df.iloc[2:4, 0:12].copy()
-    gender_data.columns = [
-        "Gender", "Total (A)", "KR (F)", "UAE (G)", "SG (B)", "UK (C)", "US (D)",
-        "CN (E)", "BR (H)", "FR (I)", "DE (J)", "AU (K)"
-    ]
+def _percent_values(values: pd.Series) -> pd.Series:
+    """Zellen wie "48%" oder 0.48 als Zahl (Anteil), nicht lesbare Werte als NaN."""
+    return pd.to_numeric(values.astype(str).str.replace("%", "").str.strip(), errors="coerce")
+
 
-    for col in gender_data.columns[1:]:
-        gender_data[col] = pd.to_numeric(
-            gender_data[col].astype(str).str.replace("%", "").str.strip(), errors="coerce"
-        )
+def gender_distribution(sociodemo_df: pd.DataFrame, countries: list[str] = DEFAULT_GENDER_COUNTRIES) -> pd.DataFrame:
+    """Geschlechterverteilung aus dem Sociodemographics-Sheet im Long-Format (Gender, Country, Country_clean, Percentage in %)."""
+    gender_data = sociodemo_df.iloc[2:4, 0:12].copy()
+    gender_data.columns = GENDER_COLUMNS
+    for col in GENDER_COLUMNS[1:]:
+        gender_data[col] = _percent_values(gender_data[col])
 
     gender_long = gender_data.melt(id_vars="Gender", var_name="Country", value_name="Percentage")
-    gender_long.dropna(subset=["Percentage"], inplace=True)
+    gender_long = gender_long.dropna(subset=["Percentage"])
     gender_long["Country_clean"] = gender_long["Country"].map(country_label_map)
-    default_visible = ["South Korea", "United Arab Emirates", "All Countries"]
-    gender_long = gender_long[gender_long["Country_clean"].isin(default_visible)]
+    gender_long["Percentage"] = gender_long["Percentage"] * 100
+    return gender_long[gender_long["Country_clean"].isin(countries)].reset_index(drop=True)
+
+
+def age_distribution(sociodemo_df: pd.DataFrame) -> pd.DataFrame:
+    """Altersverteilung des Total Sample (Age Group, Total in %)."""
+    age_data = sociodemo_df.iloc[10:17, [0, 1]].copy()
+    age_data.columns = ["Age Group", "Total"]
+    age_data["Total"] = _percent_values(age_data["Total"]) * 100
+    return age_data.dropna(subset=["Total"]).reset_index(drop=True)
+
+
+def warm():
+    """Excel-Workbook (Sociodemographics-Sheet) vorab laden."""
+    from sections.data import load_workbook
+
+    load_workbook()
+
+
+def render(sociodemo_df):
+    st.title("Socio-demographics & distribution")
+
+    # GENDER =======================================
+    st.subheader("Gender distribution – Total vs. Korea & UAE")
+
+    gender_long = gender_distribution(sociodemo_df)
 
     fig_gender = px.bar(
         gender_long,
         x="Gender",
-        y=gender_long["Percentage"] * 100,
+        y="Percentage",
         color="Country_clean",
         barmode="group",
-        text=(gender_long["Percentage"] * 100).round(1).astype(str) + "%",
+        text=gender_long["Percentage"].round(1).astype(str) + "%",
         color_discrete_sequence=px.colors.qualitative.Bold
     )
     fig_gender.update_layout(
@@ -61,10 +88,10 @@ def render(sociodemo_df):
         bargap=0.15,
         bargroupgap=0.05
     )
-    st.plotly_chart(fig_gender, use_container_width=True)
+    show_chart(fig_gender)
 
     # ⬇️ Download Gender Chart
-    gender_png = prepare_figure_for_export(fig_gender)
+    gender_png = deferred_export(fig_gender)
     st.download_button(
         label="⬇️ Download Gender Chart (PNG)",
         data=gender_png,
@@ -75,18 +102,13 @@ def render(sociodemo_df):
     # AGE ==========================================
     st.subheader("Age distribution – Total sample")
 
-    age_data = sociodemo_df.iloc[10:17, [0, 1]].copy()
-    age_data.columns = ["Age Group", "Total"]
-    age_data["Total"] = pd.to_numeric(
-        age_data["Total"].astype(str).str.replace("%", "").str.strip(), errors="coerce"
-    )
-    age_data.dropna(subset=["Total"], inplace=True)
+    age_data = age_distribution(sociodemo_df)
 
     fig_age = px.bar(
         age_data,
         x="Age Group",
-        y=age_data["Total"] * 100,
-        text=(age_data["Total"] * 100).round(1).astype(str) + "%",
+        y="Total",
+        text=age_data["Total"].round(1).astype(str) + "%",
         color_discrete_sequence=["#AB63FA"]
     )
     fig_age.update_layout(
@@ -94,10 +116,10 @@ def render(sociodemo_df):
         yaxis_title="%",
         xaxis_title="Age group"
     )
-    st.plotly_chart(fig_age, use_container_width=True)
+    show_chart(fig_age)
 
     # ⬇️ Download Age Chart
-    age_png = fig_age.to_image(format="png", width=1600, height=900, scale=2)
+    age_png = deferred_image(fig_age, width=1600, height=900, scale=2)
     st.download_button(
         label="⬇️ Download Age Chart (PNG)",
         data=age_png,
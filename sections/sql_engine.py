@@ -0,0 +1,220 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from sections.data import data_version, display_frame
+from sections.metrics import cache_metrics
+from sections.validation import DataValidationError
+
+try:
+    import duckdb
+except ImportError:  # ohne DuckDB: SQLite im Speicher (zeilenorientiert, ohne Pushdown in Spaltenblöcke)
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# Mehr Zeilen zeigt keine Tabelle sinnvoll an; die Abfrage wird entsprechend begrenzt
+MAX_ROWS = 5000
+# Sekunden, danach wird die Abfrage abgebrochen
+QUERY_TIMEOUT = float(os.environ.get("TOURISM_SQL_TIMEOUT", "10"))
+
+# Tabellenname -> (Modul, Loader, Beschreibung); Daten wie auf den Seiten (bereinigt, validiert)
+TABLES = {
+    "last_vacation": ("sections.data", "load_last_vacation_data", "Share (%) per country, question and answer (last vacation)"),
+    "attitudes": ("sections.attitudes", "load_attitudes_data", "Agreement scale (%) per country and attitude statement"),
+    "descriptions": ("sections.descriptions_rating", "load_description_data", "Share (%) per country describing their vacation with an adjective"),
+    "ratings": ("sections.descriptions_rating", "load_rating_data", "Share (%) per country and overall rating (1–10)"),
+    "adjectives": ("sections.adjective_ratings", "load_adjective_data", "Share (%) per country, adjective and rating level"),
+}
+
+# Kommentare, Strings ('...'), Bezeichner in Anführungszeichen ("...") und Leerraum
+_TOKEN = re.compile(r"""(--[^\n]*|/\*.*?\*/)|('(?:[^']|'')*'|"(?:[^"]|"")*")|(\s+)""", re.DOTALL)
+
+
+class QueryError(ValueError):
+    """Abfrage abgelehnt (nicht lesend), fehlerhaft oder abgebrochen – die Meldung ist für Nutzer gedacht."""
+
+
+def normalize_sql(sql):
+    """
+    Kanonische Form einer Abfrage als Cache-Schlüssel: ohne Kommentare und abschließendes ";",
+    Leerraum zu einem Leerzeichen, außerhalb von Strings und Bezeichnern in Anführungszeichen
+    klein geschrieben. "SELECT  *\\nFROM Ratings;" und "select * from ratings" treffen denselben Eintrag.
+    """
+    parts, pos = [], 0
+    for match in _TOKEN.finditer(sql):
+        parts.append(sql[pos:match.start()].lower())
+        quoted = match.group(2)
+        parts.append(quoted if quoted else " ")
+        pos = match.end()
+    parts.append(sql[pos:].lower())
+    normalized = re.sub(r" +", " ", "".join(parts)).strip()
+    while normalized.endswith(";"):
+        normalized = normalized[:-1].rstrip()
+    return normalized
+
+
+def statement_body(sql):
+    """Originaltext ohne abschließende Kommentare, Leerraum und ";" – zum Einbetten als Unterabfrage."""
+    end, pos = 0, 0
+    for match in _TOKEN.finditer(sql):
+        code = sql[pos:match.start()].rstrip(" \t\r\n;")
+        if code:
+            end = pos + len(code)
+        if match.group(2):
+            end = match.end()
+        pos = match.end()
+    code = sql[pos:].rstrip(" \t\r\n;")
+    if code:
+        end = pos + len(code)
+    return sql[:end]
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class SqlEngine:
+    """
+    Eingebettete SQL-Engine über den bereinigten Datensätzen, nur lesend.
+
+    DuckDB (spaltenorientiert): die Datensätze werden als native Tabellen angelegt, Scans lesen
+    nur die benötigten Spalten und überspringen Blöcke anhand von Min/Max-Statistiken
+    (Projection- und Filter-Pushdown). Ohne DuckDB dient SQLite im Speicher als Ersatz.
+    Dateizugriffe, Erweiterungen und Konfigurationsänderungen sind gesperrt.
+    """
+
+    def __init__(self, frames):
+        self.schema = {
+            name: [(column, "number" if pd.api.types.is_numeric_dtype(df[column]) else "text") for column in df.columns]
+            for name, df in frames.items()
+        }
+        self.rows = {name: len(df) for name, df in frames.items()}
+        self._lock = threading.Lock()
+        if duckdb is not None:
+            self.backend = "duckdb"
+            self._con = duckdb.connect(":memory:")
+            for name, df in frames.items():
+                self._con.register("_frame", df)
+                self._con.execute(f"CREATE TABLE {quote_identifier(name)} AS SELECT * FROM _frame")
+                self._con.unregister("_frame")
+            self._con.execute("SET enable_external_access = false")
+            self._con.execute("SET lock_configuration = true")
+        else:
+            self.backend = "sqlite"
+            self._con = sqlite3.connect(":memory:", check_same_thread=False)
+            for name, df in frames.items():
+                df.to_sql(name, self._con, index=False)
+            self._con.execute("PRAGMA query_only = ON")
+
+    def check_read_only(self, sql):
+        """Genau eine SELECT-Anweisung (auch mit WITH), sonst QueryError."""
+        if self.backend == "duckdb":
+            try:
+                statements = duckdb.extract_statements(sql)
+            except duckdb.Error as exc:
+                raise QueryError(str(exc)) from None
+            if len(statements) != 1:
+                raise QueryError("Please enter exactly one statement.")
+            if statements[0].type != duckdb.StatementType.SELECT:
+                raise QueryError("Only read-only SELECT queries are allowed.")
+        else:
+            normalized = normalize_sql(sql)
+            if ";" in _TOKEN.sub(lambda m: m.group(2) and "''" or " ", normalized):
+                raise QueryError("Please enter exactly one statement.")
+            if not re.match(r"(select|with)\b", normalized):
+                raise QueryError("Only read-only SELECT queries are allowed.")
+
+    def execute(self, sql, timeout=QUERY_TIMEOUT):
+        """
+        Führt eine Abfrage im Originaltext aus: (DataFrame mit höchstens MAX_ROWS Zeilen, abgeschnitten?).
+        Nach timeout Sekunden wird die Abfrage abgebrochen.
+        """
+        self.check_read_only(sql)
+        # Zeilenumbruch vor der Klammer, falls der Text mit einem Zeilenkommentar endet
+        limited = f"SELECT * FROM (\n{statement_body(sql)}\n) AS q LIMIT {MAX_ROWS + 1}"
+        timed_out = threading.Event()
+        if self.backend == "duckdb":
+            # Eigener Cursor pro Abfrage: parallele Sessions teilen die Datenbank, nicht den Zustand
+            cursor = self._con.cursor()
+            timer = threading.Timer(timeout, lambda: (timed_out.set(), cursor.interrupt()))
+            try:
+                timer.start()
+                df = cursor.execute(limited).df()
+            except duckdb.Error as exc:
+                raise QueryError(f"Query stopped after {timeout:g} s." if timed_out.is_set() else str(exc)) from None
+            finally:
+                timer.cancel()
+                cursor.close()
+        else:
+            # Eine SQLite-Verbindung verträgt keine parallelen Abfragen
+            with self._lock:
+                timer = threading.Timer(timeout, lambda: (timed_out.set(), self._con.interrupt()))
+                try:
+                    timer.start()
+                    df = pd.read_sql_query(limited, self._con)
+                except (sqlite3.Error, pd.errors.DatabaseError) as exc:
+                    raise QueryError(f"Query stopped after {timeout:g} s." if timed_out.is_set() else str(exc)) from None
+                finally:
+                    timer.cancel()
+        return df.head(MAX_ROWS), len(df) > MAX_ROWS
+
+
+def load_frames():
+    """
+    Alle Tabellen der Engine als einfache DataFrames (Kategorien als Text, Anzeige-Genauigkeit).
+    Datensätze, die die Prüfung beim Einlesen nicht bestehen, fehlen in der Engine.
+    """
+    import importlib
+
+    frames = {}
+    for name, (module, loader, _) in TABLES.items():
+        try:
+            frames[name] = display_frame(getattr(importlib.import_module(module), loader)())
+        except DataValidationError as exc:
+            logger.warning("SQL table %s left out: %s", name, exc)
+    return frames
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_engine(version):
+    """Eine Engine pro Serverprozess und Datenversion (von allen Sessions geteilt)."""
+    engine = SqlEngine(load_frames())
+    logger.info("SQL engine (%s) loaded with %d tables for data version %s", engine.backend, len(engine.schema), version)
+    return engine
+
+
+def get_engine():
+    return load_engine(data_version())
+
+
+@cache_metrics("sql_query", st.cache_data(max_entries=256, show_spinner=False))
+def _cached_query(normalized, version, _sql):
+    # Schlüssel ist nur der normalisierte Text; ausgeführt wird der Originaltext (_sql zählt nicht zum Schlüssel)
+    return load_engine(version).execute(_sql)
+
+
+def run_query(sql):
+    """
+    Nur lesende Abfrage über den Datensätzen: (DataFrame, abgeschnitten?). Fehler als QueryError.
+
+    Ergebnisse werden nach normalisiertem Abfragetext (normalize_sql) und Datenversion gecacht –
+    gleiche Abfragen in anderer Schreibweise oder aus anderen Sessions rechnen nicht erneut.
+    Ausgeführt wird der Originaltext, Aliasse behalten also ihre Schreibweise; bei einem Treffer
+    kommen sie aus der Abfrage, die den Eintrag angelegt hat.
+    """
+    normalized = normalize_sql(sql)
+    if not normalized:
+        raise QueryError("Please enter a query.")
+    return _cached_query(normalized, data_version(), sql)
@@ -0,0 +1,185 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from scipy.cluster.hierarchy import fcluster, linkage
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+from sections.figures import show_chart
+from sections.shared_cache import code_version, get_store, input_hash
+
+N_BOOTSTRAP = 500
+N_CLUSTERS = 3
+SEED = 42
+
+
+# ------------------------------
+# Clustering-Varianten (wie auf den Seiten)
+# ------------------------------
+def _fit_labels(matrix, method, n_clusters, random_state):
+    scaled = StandardScaler().fit_transform(matrix)
+    if method == "kmeans":
+        return KMeans(n_clusters=n_clusters, n_init=10, random_state=random_state).fit_predict(scaled)
+    if method == "ward":
+        return fcluster(linkage(scaled, method="ward"), t=n_clusters, criterion="maxclust")
+    raise ValueError(f"Unknown clustering method: {method}")
+
+
+def _bootstrap_chunk(args):
+    """Worker: zählt Ko-Zuordnungen über einen Block von Bootstrap-Replikaten."""
+    matrix, method, n_clusters, seeds = args
+    n_rows, n_cols = matrix.shape
+    co_assign = np.zeros((n_rows, n_rows), dtype=np.int32)
+
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        # Merkmale (Statements bzw. Antwortoptionen) mit Zurücklegen ziehen
+        cols = rng.choice(n_cols, size=n_cols, replace=True)
+        sample = matrix[:, cols]
+        # konstante Spalten würden bei der Standardisierung zu NaN führen
+        sample = sample[:, sample.std(axis=0) > 0]
+        labels = _fit_labels(sample, method, n_clusters, int(rng.integers(2**31 - 1)))
+        co_assign += labels[:, None] == labels[None, :]
+
+    return co_assign
+
+
+def _bootstrap_chunk_single_threaded(args):
+    """Worker im Pool: OpenMP (KMeans) auf einen Thread je Worker, sonst überbucht jeder Worker alle Kerne."""
+    # die OpenMP-Grenze gilt je Thread und muss deshalb im Worker gesetzt werden
+    with threadpool_limits(limits=1, user_api="openmp"):
+        return _bootstrap_chunk(args)
+
+
+def bootstrap_stability(matrix, method="kmeans", n_clusters=N_CLUSTERS,
+                        n_boot=N_BOOTSTRAP, seed=SEED, n_workers=None):
+    """
+    Bootstrap-Stabilität einer Länder-Clusterung.
+
+    Die Merkmalsspalten werden n_boot-mal mit Zurücklegen gezogen und die Clusterung
+    jeweils neu gefittet, verteilt auf einen Thread-Pool, dessen Worker BLAS und OpenMP
+    auf je einen Thread beschränken. Jedes Replikat bekommt einen
+    eigenen Seed aus einer SeedSequence, das Ergebnis hängt also nicht von der Anzahl
+    der Worker ab.
+
+    Rückgabe:
+    - consensus: DataFrame (Land × Land) mit dem Anteil gemeinsamer Zuordnungen
+    - scores: DataFrame mit Referenz-Cluster und Stabilitätswert je Land
+    """
+    values = matrix.to_numpy(dtype=float)
+    countries = matrix.index.tolist()
+
+    seeds = np.random.SeedSequence(seed).spawn(n_boot)
+    n_workers = n_workers or min(os.cpu_count() or 1, 8)
+    chunks = [seeds[i::n_workers] for i in range(n_workers)]
+    jobs = [(values, method, n_clusters, chunk) for chunk in chunks if chunk]
+
+    if len(jobs) > 1:
+        # Threads statt Prozesse: läuft im Streamlit-Server, wo spawn app.py neu importieren und
+        # fork den mehrfädigen Server kopieren würde; KMeans und Linkage rechnen ohne GIL.
+        # Die BLAS-Grenze gilt prozessweit und wird einmal um den ganzen Pool gesetzt.
+        with threadpool_limits(limits=1, user_api="blas"), \
+                ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="bootstrap") as pool:
+            counts = sum(pool.map(_bootstrap_chunk_single_threaded, jobs))
+    else:
+        counts = _bootstrap_chunk(jobs[0])
+
+    consensus = pd.DataFrame(counts / n_boot, index=countries, columns=countries)
+
+    # Referenz-Clusterung auf den vollständigen Daten
+    reference = _fit_labels(values, method, n_clusters, SEED)
+    scores = []
+    for i, country in enumerate(countries):
+        same = (reference == reference[i])
+        same[i] = False
+        if same.any():
+            # mittlere Ko-Zuordnung mit den Ländern des eigenen Clusters
+            score = consensus.iloc[i, same].mean()
+        else:
+            # Einzelcluster: wie oft bleibt das Land von allen anderen getrennt
+            others = np.arange(len(countries)) != i
+            score = 1 - consensus.iloc[i, others].mean()
+        scores.append({"Country": country, "Cluster": str(reference[i]), "Stability": score})
+
+    return consensus, pd.DataFrame(scores)
+
+
+# ------------------------------
+# Persistenz (einmal rechnen, danach von Platte laden)
+# ------------------------------
+def load_or_compute_stability(name, matrix, method="kmeans", n_clusters=N_CLUSTERS,
+                              n_boot=N_BOOTSTRAP, seed=SEED):
+    """Bootstrap-Ergebnis aus der geteilten Ablage (sections.shared_cache), sonst berechnen und ablegen."""
+    def compute():
+        consensus, scores = bootstrap_stability(matrix, method, n_clusters, n_boot, seed)
+        return {
+            "countries": np.array(consensus.index, dtype=str),
+            "consensus": consensus.to_numpy(),
+            "clusters": scores["Cluster"].to_numpy(dtype=str),
+            "stability": scores["Stability"].to_numpy()
+        }
+
+    key = input_hash(name, matrix, method, n_clusters, n_boot, seed, code_version(compute))
+    stored = get_store().get_or_compute("stability", key, compute, codec="npz")
+    countries = stored["countries"].tolist()
+    consensus = pd.DataFrame(stored["consensus"], index=countries, columns=countries)
+    scores = pd.DataFrame({
+        "Country": countries,
+        "Cluster": stored["clusters"].astype(str),
+        "Stability": stored["stability"]
+    })
+    return consensus, scores
+
+
+# ------------------------------
+# Darstellung
+# ------------------------------
+def render_stability(name, matrix, method="kmeans", n_clusters=N_CLUSTERS, n_boot=N_BOOTSTRAP):
+    with st.spinner("Computing bootstrap cluster stability..."):
+        consensus, scores = load_or_compute_stability(name, matrix, method, n_clusters, n_boot)
+
+    # Länder nach Referenz-Cluster sortieren, damit Blöcke sichtbar werden
+    order = scores.sort_values(["Cluster", "Stability"], ascending=[True, False])["Country"].tolist()
+    fig_heat = px.imshow(
+        consensus.loc[order, order],
+        color_continuous_scale="Blues",
+        zmin=0, zmax=1,
+        text_auto=".2f",
+        title=f"Co-assignment across {n_boot} bootstrap resamples"
+    )
+    fig_heat.update_layout(height=600, coloraxis_colorbar=dict(title="Share"))
+    show_chart(fig_heat)
+
+    fig_scores = px.bar(
+        scores.sort_values("Stability", ascending=False),
+        x="Country", y="Stability", color="Cluster", text="Stability",
+        color_discrete_sequence=px.colors.qualitative.Set2,
+        title="Per-country stability (mean co-assignment within own cluster)"
+    )
+    fig_scores.update_traces(texttemplate="%{y:.2f}", textposition="outside")
+    fig_scores.update_layout(yaxis=dict(range=[0, 1.1]))
+    show_chart(fig_scores)
+
+    st.markdown("""
+    Features (statements or answer options) are resampled with replacement and the clustering is refitted on every resample.
+    Values close to **1** mean that two countries almost always end up in the same cluster; low per-country scores flag
+    countries whose cluster membership depends on the particular set of questions.
+    """)
+
+
+if __name__ == "__main__":
+    # Vorberechnung ohne Streamlit-Server: python -m sections.stability
+    from sections.attitudes import build_attitude_matrix, load_attitudes_data
+    from sections.data import load_last_vacation_data
+    from sections.Last_Holiday import build_behavior_matrix
+
+    attitudes_matrix = build_attitude_matrix(load_attitudes_data())
+    load_or_compute_stability("attitudes", attitudes_matrix, method="kmeans")
+    behavior_matrix = build_behavior_matrix(load_last_vacation_data())
+    load_or_compute_stability("last_holiday", behavior_matrix, method="ward")
+    print(f"Stability results stored in the shared cache ({get_store().root})")
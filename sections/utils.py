@@ -1,4 +1,10 @@
+import os
+from collections.abc import Callable
+
 import plotly.graph_objects as go
+import plotly.io as pio
+
+from sections.renderer import render_image
 
 
 def prepare_figure_for_export(
@@ -46,4 +52,39 @@ def prepare_figure_for_export(
     if colorway:
         fig.update_layout(colorway=colorway)
 
-    return fig.to_image(format="png", width=width, height=height, scale=scale)
+    # Export über den Pool warmer Kaleido-Prozesse (sections/renderer.py)
+    return render_image(fig, format="png", width=width, height=height, scale=scale)
+
+
+# Nur für Vergleichsmessungen (tools/memory_benchmark.py): PNGs wieder sofort rendern
+EAGER_DOWNLOADS = os.environ.get("TOURISM_EAGER_DOWNLOADS") == "1"
+
+
+def _deferred(render):
+    return render() if EAGER_DOWNLOADS else render
+
+
+def deferred_export(fig: go.Figure, **export_kwargs) -> Callable[[], bytes]:
+    """
+    Wie prepare_figure_for_export, aber für st.download_button(data=...): Es wird nur ein
+    Callable registriert, das PNG entsteht erst beim Klick (in einem eigenen Thread).
+    Bis dahin hält die Session nur die Figure als kompakten JSON-String, keine PNG-Bytes.
+
+    Parameter:
+    - fig: Plotly-Figure (das Original bleibt unverändert)
+    - export_kwargs: Parameter von prepare_figure_for_export
+    """
+    spec = fig.to_json()
+    return _deferred(lambda: prepare_figure_for_export(pio.from_json(spec), **export_kwargs))
+
+
+def deferred_image(fig: go.Figure, *, width: int, height: int, scale: int = 2) -> Callable[[], bytes]:
+    """PNG-Export ohne Export-Styling, erst beim Klick gerendert."""
+    spec = fig.to_json()
+    return _deferred(lambda: render_image(spec, format="png", width=width, height=height, scale=scale))
+
+
+def deferred_html(fig: go.Figure) -> Callable[[], str]:
+    """Eigenständige HTML-Datei der Figure, erst beim Klick erzeugt."""
+    spec = fig.to_json()
+    return _deferred(lambda: pio.from_json(spec).to_html())
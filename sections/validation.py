@@ -0,0 +1,246 @@
+import argparse
+import logging
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from sections.data import DATA_DIR, LAST_VACATION_FILE, data_version
+
+logger = logging.getLogger(__name__)
+
+ERROR = "error"
+WARNING = "warning"
+
+LIKERT_COLUMNS = ["Strongly disagree", "Disagree", "Neither agree nor disagree", "Agree", "Strongly agree"]
+# Ländercodes der Dateien: direkt ("SG") oder als Buchstabe in Klammern ("SG (B)")
+COUNTRY_CODES = ["Total", "SG", "UK", "US", "CN", "KR", "UAE", "BR", "FR", "DE", "AU"]
+COUNTRY_LETTERS = list("ABCDEFGHIJK")
+LETTER_PATTERN = r"\((.)\)$"
+
+# Zeilen aus dem Export, die keine Antworten sind (Summen und Hilfsvariablen) – exakte Texte,
+# ein Teilstring "Count" träfe auch "Countryside" und "Domestically, within my country"
+META_ANSWERS = ["Count", "Total", "hVacationType: AUTOPUNCH FROM QDURATION"]
+# Fragen mit genau einer Antwort pro Person: Anteile summieren sich je Land zu 1.
+# QDuration steht mit zwei Beschriftungen pro Antwort in der Datei (normalize_answers führt sie zusammen).
+SINGLE_CHOICE_QUESTIONS = ["QAccom", "QWhen", "QWhere", "QWhyno"]
+
+
+# Erwartungen je Datensatz:
+# - text / numeric: Pflichtspalten (ohne leere Werte, numeric muss als Zahl lesbar sein)
+# - key: Spalten, die jede Zeile eindeutig machen
+# - country: Spalte mit Ländercode, optional per Regex aus dem Text gezogen
+# - range: erlaubter Wertebereich je Spalte
+# - sums: Anteile je Gruppe (optional nur für Zeilen mit where) summieren sich zu expected ± tolerance
+# - prepare / drop_answers: bekannte Reparaturen und Hilfszeilen, vor der Prüfung angewendet
+# - warn: Prüfungen, die nur warnen
+DATASETS = {
+    "attitudes": {
+        "path": f"{DATA_DIR}/Cleaned_Tourism_Attitudes.csv",
+        "text": ["Country", "Statement_Code", "Statement_Text"],
+        "numeric": LIKERT_COLUMNS + ["Agreement"],
+        "key": ["Country", "Statement_Code"],
+        "country": {"column": "Country", "known": COUNTRY_CODES},
+        "range": {column: (0, 100) for column in LIKERT_COLUMNS + ["Agreement"]},
+        "sums": [{"group": ["Country", "Statement_Code"], "values": LIKERT_COLUMNS, "expected": 100, "tolerance": 0.5}]
+    },
+    # Rohfassung von Cleaned_Tourism_Attitudes.csv: keine Sektion liest sie, nur die CLI prüft sie mit.
+    # Bekannter Exportfehler: die erste Datenzeile steht komplett in Anführungszeichen und landet als
+    # ein Feld in "Country"; 22 Zeilen sind leer. Beides nur als Warnung, bis die Datei neu exportiert ist.
+    "attitudes_long": {
+        "path": f"{DATA_DIR}/Tourism_Attitudes_LongFormat.csv",
+        "text": ["Country", "Statement_Code", "Statement_Text"],
+        "numeric": LIKERT_COLUMNS + ["Agreement"],
+        "key": ["Country", "Statement_Code"],
+        "country": {"column": "Country", "known": COUNTRY_CODES},
+        "warn": ["missing", "country"]
+    },
+    "last_vacation": {
+        "path": LAST_VACATION_FILE,
+        "text": ["Question_Code", "Question_Text", "Country", "Answer"],
+        "numeric": ["Percentage"],
+        "drop_answers": META_ANSWERS,
+        "key": ["Question_Code", "Country", "Answer"],
+        "country": {"column": "Country", "known": COUNTRY_CODES},
+        "range": {"Percentage": (0, 1)},
+        "sums": [{
+            "group": ["Question_Code", "Country"], "values": ["Percentage"], "expected": 1, "tolerance": 0.02,
+            "where": ("Question_Code", SINGLE_CHOICE_QUESTIONS)
+        }]
+    },
+    "descriptions": {
+        "path": f"{DATA_DIR}/Adjective_2_Long_Format_Final.csv",
+        "text": ["Adjective", "Country"],
+        "numeric": ["Percentage"],
+        "key": ["Country", "Adjective"],
+        "country": {"column": "Country", "pattern": LETTER_PATTERN, "known": COUNTRY_LETTERS},
+        "range": {"Percentage": (0, 1)}
+    },
+    "ratings": {
+        "path": f"{DATA_DIR}/QRate_Long_Format_Clean.csv",
+        "text": ["Country"],
+        "numeric": ["Rating", "Percentage"],
+        "key": ["Country", "Rating"],
+        "country": {"column": "Country", "pattern": LETTER_PATTERN, "known": COUNTRY_LETTERS},
+        "range": {"Rating": (1, 10), "Percentage": (0, 1)},
+        "sums": [{"group": ["Country"], "values": ["Percentage"], "expected": 1, "tolerance": 0.03}]
+    },
+    "adjective_ratings": {
+        # aus dem Workbook erzeugt: python tools/export_adjective_ratings.py (nur Total, SG, UK, US)
+        "path": f"{DATA_DIR}/QDescribe_B_2_FIXED.csv",
+        "text": ["Question_Code", "Country", "Adjective", "Rating_Level"],
+        "numeric": ["Percentage"],
+        "key": ["Country", "Adjective", "Rating_Level"],
+        "country": {"column": "Country", "pattern": LETTER_PATTERN, "known": COUNTRY_LETTERS},
+        "range": {"Percentage": (0, 1)},
+        # Jede Person bewertet jedes Adjektiv auf genau einer Stufe
+        "sums": [{"group": ["Adjective", "Country"], "values": ["Percentage"], "expected": 1, "tolerance": 0.03}]
+    }
+}
+
+
+class DataValidationError(ValueError):
+    """Ein Datensatz hat die Prüfung beim Einlesen nicht bestanden; report enthält alle Befunde."""
+
+    def __init__(self, name, report):
+        self.name = name
+        self.report = report
+        errors = report[report["severity"] == ERROR]
+        super().__init__(f"{name}: {len(errors)} failed checks ({', '.join(errors['check'].unique())})")
+
+
+def _examples(values, limit=5, width=40):
+    values = [str(v) if len(str(v)) <= width else str(v)[:width - 1] + "…" for v in values]
+    more = f" … (+{len(values) - limit})" if len(values) > limit else ""
+    return ", ".join(values[:limit]) + more
+
+
+def read_dataset(name):
+    """Liest einen Datensatz roh ein und wendet die bekannten Reparaturen an; Rückgabe (df, entfernte Zeilen)."""
+    spec = DATASETS[name]
+    df = pd.read_csv(spec["path"])
+    if "prepare" in spec:
+        df = spec["prepare"](df)
+    dropped = 0
+    if "drop_answers" in spec:
+        meta = df["Answer"].astype(str).str.strip().isin(spec["drop_answers"])
+        dropped = int(meta.sum())
+        df = df[~meta]
+    return df.reset_index(drop=True), dropped
+
+
+def validate_frame(df, spec):
+    """
+    Prüft einen Datensatz gegen seine Spezifikation aus DATASETS.
+
+    Rückgabe: Liste von Befunden (check, severity, rows, detail); leer, wenn alles passt.
+    """
+    issues = []
+
+    def report(check, rows, detail):
+        severity = WARNING if check in spec.get("warn", ()) else ERROR
+        issues.append({"check": check, "severity": severity, "rows": int(rows), "detail": detail})
+
+    # Schema: fehlende Spalten machen alle weiteren Prüfungen sinnlos
+    required = spec.get("text", []) + spec.get("numeric", [])
+    missing_columns = [column for column in required if column not in df.columns]
+    if missing_columns:
+        report("schema", len(df), f"missing columns: {_examples(missing_columns)}")
+        return issues
+
+    numeric = {column: pd.to_numeric(df[column], errors="coerce") for column in spec.get("numeric", [])}
+    empty = df[required].isna()
+    if empty.any(axis=None):
+        rows = df.index[empty.any(axis=1)]
+        report("missing", len(rows), f"empty {_examples(empty.columns[empty.any()])} in rows {_examples(rows)}")
+    for column, values in numeric.items():
+        bad = values.isna() & df[column].notna()
+        if bad.any():
+            report("schema", bad.sum(), f"{column} not numeric: {_examples(df.loc[bad, column].unique())}")
+
+    key = spec.get("key")
+    if key:
+        duplicated = df.duplicated(subset=key, keep=False)
+        if duplicated.any():
+            pairs = df.loc[duplicated, key].drop_duplicates().itertuples(index=False, name=None)
+            report("duplicates", duplicated.sum(), f"duplicate {'/'.join(key)}: {_examples(pairs)}")
+
+    country = spec.get("country")
+    if country:
+        values = df[country["column"]].astype(str)
+        codes = values.str.extract(country["pattern"]).iloc[:, 0] if "pattern" in country else values
+        unknown = ~codes.isin(country["known"])
+        if unknown.any():
+            report("country", unknown.sum(), f"unknown country codes: {_examples(values[unknown].unique())}")
+
+    for column, (low, high) in spec.get("range", {}).items():
+        outside = ~numeric[column].between(low, high) & numeric[column].notna()
+        if outside.any():
+            report("range", outside.sum(), f"{column} outside [{low}, {high}]: {_examples(numeric[column][outside].unique())}")
+
+    for rule in spec.get("sums", []):
+        rows = df
+        if "where" in rule:
+            column, allowed = rule["where"]
+            rows = df[df[column].isin(allowed)]
+        values = sum(pd.to_numeric(rows[column], errors="coerce") for column in rule["values"])
+        totals = values.groupby([rows[column] for column in rule["group"]]).sum()
+        off = totals[(totals - rule["expected"]).abs() > rule["tolerance"] + 1e-9]
+        if len(off):
+            report(
+                "percentage sum", len(off),
+                f"sum ≠ {rule['expected']} ± {rule['tolerance']} for "
+                f"{_examples(f'{k}: {v:.3f}' for k, v in off.round(3).items())}"
+            )
+    return issues
+
+
+def validate_dataset(name):
+    """Einlesen und prüfen; Rückgabe (df, report) mit einer Zeile pro Befund."""
+    df, dropped = read_dataset(name)
+    report = pd.DataFrame(validate_frame(df, DATASETS[name]), columns=["check", "severity", "rows", "detail"])
+    report.insert(0, "dataset", name)
+    if dropped:
+        logger.info("%s: dropped %d summary rows (%s)", name, dropped, _examples(DATASETS[name]["drop_answers"]))
+    return df, report
+
+
+# Einmal pro Datenversion: Sektionen bekommen nur geprüfte Daten, ohne eigene Bereinigung pro Rerun
+@st.cache_data(show_spinner=False)
+def _ingest(name, version):
+    df, report = validate_dataset(name)
+    for issue in report[report["severity"] == WARNING].itertuples():
+        logger.warning("%s: %s check, %d rows: %s", name, issue.check, issue.rows, issue.detail)
+    if (report["severity"] == ERROR).any():
+        raise DataValidationError(name, report)
+    return df
+
+
+def load_dataset(name):
+    """Geprüfter Datensatz für die aktuelle Datenversion; wirft DataValidationError bei Fehlern."""
+    return _ingest(name, data_version())
+
+
+def validation_report(names=None):
+    """Befunde aller (oder der genannten) Datensätze in einer Tabelle."""
+    return pd.concat([validate_dataset(name)[1] for name in names or DATASETS], ignore_index=True)
+
+
+if __name__ == "__main__":
+    # Vor dem Deploy oder nach einem Daten-Update: python -m sections.validation
+    parser = argparse.ArgumentParser(description="Validate the survey data files")
+    parser.add_argument("datasets", nargs="*", help="datasets to check (default: all)")
+    args = parser.parse_args()
+    unknown = sorted(set(args.datasets) - set(DATASETS))
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    report = validation_report(args.datasets or None)
+    for name in args.datasets or DATASETS:
+        issues = report[report["dataset"] == name]
+        errors = (issues["severity"] == ERROR).sum()
+        print(f"{name:<20}{'FAILED' if errors else 'ok':<8}{errors} errors, {len(issues) - errors} warnings")
+        for issue in issues.itertuples():
+            print(f"    {issue.severity:<8}{issue.check:<16}{issue.rows:>4} rows  {issue.detail}")
+    sys.exit(1 if (report["severity"] == ERROR).any() else 0)
@@ -0,0 +1,132 @@
+import argparse
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import streamlit as st
+
+from sections.prefetch import SECTION_WARMERS
+from sections.validation import DataValidationError
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "cache"
+# TOURISM_WARMUP=0 schaltet das Vorwärmen beim Serverstart ab
+WARMUP_ENABLED = os.environ.get("TOURISM_WARMUP", "1") != "0"
+
+
+def _memory_entries():
+    """Einträge je gecachter Funktion (st.cache_data und st.cache_resource) in diesem Prozess."""
+    try:
+        from streamlit.runtime.caching import cache_data_api, cache_resource_api
+
+        stats = []
+        for caches in (cache_data_api._data_caches, cache_resource_api._resource_caches):
+            for entries in caches.get_stats().values():
+                stats += entries
+    except Exception:
+        # interne Streamlit-API – ohne sie wird nur die Platte protokolliert
+        return Counter()
+    return Counter(stat.cache_name for stat in stats)
+
+
+def _disk_entries():
+    """Dateien der Platten-Caches (Registry-Manifest und geteilte Ablage: Modelle, Stabilität, Segmente, Figures)."""
+    from sections.shared_cache import get_store
+
+    roots = {CACHE_DIR, get_store().root} - {None}
+    return {
+        os.path.relpath(os.path.join(root, name), CACHE_DIR)
+        for cache_dir in roots if os.path.isdir(cache_dir)
+        for root, _, names in os.walk(cache_dir)
+        for name in names if not name.endswith((".tmp", ".lock"))
+    }
+
+
+def warm_all(sections=None, renderer=True):
+    """
+    Wärmt alle Sektionen nacheinander vor und protokolliert Dauer und neu angelegte Cache-Einträge.
+
+    Vorgewärmt werden Daten und Modelle; Figures nur, wo eine Sektion sie cacht (Last Vacation:
+    Dendrogramme und Fragen-Balken der Startauswahl). Alle anderen Figures entstehen beim Rendern.
+
+    Parameter:
+    - sections: Modulnamen aus prefetch.SECTION_WARMERS (Standard: alle)
+    - renderer: zusätzlich den Kaleido-Pool mit einem Probe-Export hochfahren
+
+    Rückgabe:
+    - Liste mit einem Eintrag pro Schritt: name, seconds, ok, memory (neue Einträge je Funktion), disk (neue Dateien)
+    """
+    modules = sections or [module for _, module in SECTION_WARMERS]
+    steps = [(module, importlib.import_module(f"sections.{module}").warm) for module in modules]
+    if renderer:
+        from sections.renderer import check_health, start_renderer_pool
+
+        steps.append(("renderer", lambda: start_renderer_pool() and check_health()))
+
+    results = []
+    start_all = time.perf_counter()
+    for name, warm in steps:
+        memory_before, disk_before = _memory_entries(), _disk_entries()
+        start = time.perf_counter()
+        ok = True
+        try:
+            warm()
+        except DataValidationError as exc:
+            logger.warning("Warm-up of %s skipped, data failed validation: %s", name, exc)
+            ok = False
+        except Exception:
+            logger.exception("Warm-up of %s failed", name)
+            ok = False
+        created_memory = dict(_memory_entries() - memory_before)
+        created_disk = sorted(_disk_entries() - disk_before)
+        results.append({
+            "name": name, "seconds": time.perf_counter() - start, "ok": ok,
+            "memory": created_memory, "disk": created_disk
+        })
+        logger.info(
+            "Warmed %s in %.2fs: %d memory entries %s, %d files %s",
+            name, results[-1]["seconds"], sum(created_memory.values()), sorted(created_memory),
+            len(created_disk), created_disk
+        )
+    logger.info("Warm-up finished in %.2fs", time.perf_counter() - start_all)
+    return results
+
+
+@st.cache_resource(show_spinner=False)
+def warm_on_server_start():
+    """
+    Einmal pro Serverprozess alle Caches im Hintergrund füllen.
+
+    Läuft in einem eigenen Thread, damit schon die erste Session rendern kann; was sie braucht
+    und noch nicht fertig ist, berechnet sie wie bisher selbst (Streamlit-Caches sind threadsicher).
+    """
+    if not WARMUP_ENABLED:
+        return None
+    thread = threading.Thread(target=warm_all, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    # Als eigener Deploy-Schritt (füllt die Platten-Caches für alle Serverprozesse):
+    #   python -m sections.warmup
+    parser = argparse.ArgumentParser(description="Pre-warm dataset, model and figure caches")
+    parser.add_argument("sections", nargs="*", help="section modules to warm (default: all)")
+    parser.add_argument("--no-renderer", action="store_true", help="skip the kaleido probe export")
+    args = parser.parse_args()
+    unknown = sorted(set(args.sections) - {m for _, m in SECTION_WARMERS})
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    total = 0.0
+    for step in warm_all(args.sections or None, renderer=not args.no_renderer):
+        total += step["seconds"]
+        status = "ok" if step["ok"] else "FAILED"
+        print(f"{step['name']:<22}{step['seconds']:>7.2f}s  {status:<7}"
+              f"{sum(step['memory'].values()):>3} memory entries  {len(step['disk']):>3} files")
+    print(f"{'total':<22}{total:>7.2f}s")
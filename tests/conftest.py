@@ -0,0 +1,28 @@
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Die Loader lesen data/ relativ zum Repo-Root (wie beim Start des Dashboards)
+os.chdir(ROOT)
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+@pytest.fixture(scope="session")
+def shipped():
+    """Ausgelieferte Datensätze wie in tools/compute_benchmark.py."""
+    from tools.compute_benchmark import _shipped_frames
+
+    return _shipped_frames()
+
+
+@pytest.fixture(scope="session")
+def synthetic(shipped):
+    """Gleiches Schema mit 20-mal so vielen Ländern."""
+    from tools.compute_benchmark import _synthetic_frames
+
+    return _synthetic_frames(shipped, 20, 42)
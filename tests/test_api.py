@@ -0,0 +1,36 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sections.api import start_server
+
+
+@pytest.fixture
+def api_url():
+    server = start_server("127.0.0.1", port=0)
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_nps_endpoint_answers_304_for_matching_etag(api_url):
+    url = f"{api_url}/api/v1/nps?country=Germany"
+    with urllib.request.urlopen(url, timeout=10) as response:
+        assert response.status == 200
+        etag = response.headers["ETag"]
+        payload = json.load(response)
+    assert etag
+    assert [record["country"] for record in payload["data"]] == ["Germany"]
+
+    # urllib meldet 304 als HTTPError
+    request = urllib.request.Request(url, headers={"If-None-Match": etag})
+    with pytest.raises(urllib.error.HTTPError) as not_modified:
+        urllib.request.urlopen(request, timeout=10)
+    assert not_modified.value.code == 304
+    assert not_modified.value.headers["ETag"] == etag
+    assert not_modified.value.headers["X-Cache"] == "HIT"
+    assert not_modified.value.read() == b""
@@ -0,0 +1,55 @@
+"""
+pytest-benchmark-Suite der reinen Rechenfunktionen auf ausgelieferten und synthetischen Daten
+(20-mal so viele Länder). pytest.ini vergleicht jeden Lauf mit der eingecheckten Baseline
+tests/benchmarks/<Maschine>/0001_baseline.json; ab doppelter Laufzeit im Minimum schlägt er fehl.
+Auf einer Maschine ohne Baseline wird nur gewarnt. Neue Baseline nach einer gewollten Änderung:
+    rm tests/benchmarks/*/0001_baseline.json
+    python -m pytest tests/test_benchmarks.py --benchmark-save=baseline
+"""
+import pytest
+
+from sections.correlations import build_feature_matrix, cluster_order, correlation_matrix
+from sections.crosstab import build_crosstab_sql
+from sections.descriptions_rating import compute_nps
+from sections.differences import compute_answer_ranges, top_similarities
+
+DATASETS = ["shipped", "synthetic"]
+
+
+@pytest.fixture(params=DATASETS)
+def frames(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_compute_nps(benchmark, frames):
+    nps = benchmark(compute_nps, frames["ratings"])
+    assert len(nps) == frames["ratings"]["Country_clean"].nunique()
+
+
+def test_top_similarities(benchmark, frames):
+    ranges = compute_answer_ranges(frames["last_vacation"])
+    top = benchmark(top_similarities, ranges)
+    assert top["Range"].is_monotonic_increasing
+
+
+def test_answer_ranges(benchmark, frames):
+    ranges = benchmark(compute_answer_ranges, frames["last_vacation"])
+    assert (ranges["Range"] >= 0).all()
+
+
+def test_correlation_matrix(benchmark, frames):
+    matrix = build_feature_matrix(frames["last_vacation"], frames["attitudes"])
+    corr = benchmark(correlation_matrix, matrix)
+    assert corr.shape[0] == corr.shape[1]
+
+
+def test_correlation_clustering(benchmark, frames):
+    corr = correlation_matrix(build_feature_matrix(frames["last_vacation"], frames["attitudes"]))
+    order = benchmark(cluster_order, corr)
+    assert sorted(order) == list(range(len(corr)))
+
+
+def test_build_crosstab_sql(benchmark):
+    filters = [("Question_Code", ["QAccom", "QWhere"]), ("Country_clean", ["France", "Germany", "China"])]
+    sql = benchmark(build_crosstab_sql, "last_vacation", "Country_clean", "Answer", "Percentage", "Average", filters)
+    assert sql.startswith("SELECT")
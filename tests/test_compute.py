@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sections.correlations import correlation_matrix
+from sections.crosstab import NO_COLUMNS, build_crosstab_sql
+from sections.descriptions_rating import compute_nps
+from sections.differences import top_similarities
+from tools.compute_benchmark import compare
+
+
+def test_compute_nps_promoters_minus_detractors():
+    ratings = pd.DataFrame({
+        "Country_clean": ["A"] * 4 + ["B"] * 3,
+        "Rating": [10, 9, 7, 3, 10, 6, 0],
+        "Percentage": [20.0, 30.0, 40.0, 10.0, 10.0, 50.0, 40.0],
+    })
+    nps = compute_nps(ratings)
+    assert nps["Country_clean"].tolist() == ["A", "B"]
+    assert nps["NPS"].tolist() == pytest.approx([40.0, -80.0])
+
+
+def test_compute_nps_shipped(shipped):
+    nps = compute_nps(shipped["ratings"])
+    assert nps["Country_clean"].is_unique
+    assert nps["NPS"].between(-100, 100).all()
+    assert nps["NPS"].is_monotonic_decreasing
+
+
+def test_top_similarities_skips_non_answers_and_zero_ranges():
+    index = pd.MultiIndex.from_tuples(
+        [("Q1", "Hotel"), ("Q1", "Other"), ("Q2", "Beach"), ("Q2", "City"), ("Q3", "None of the above")],
+        names=["Question_Code", "Answer"],
+    )
+    ranges = pd.DataFrame({"Range": [5.0, 0.5, 0.0, 2.0, 1.0]}, index=index)
+    top = top_similarities(ranges, n=2)
+    assert top["Answer"].tolist() == ["City", "Hotel"]
+    assert top["Range"].tolist() == [2.0, 5.0]
+
+
+def test_correlation_matrix_matches_pandas_and_drops_constant_columns():
+    rng = np.random.default_rng(0)
+    matrix = pd.DataFrame(rng.normal(size=(12, 4)), columns=["a", "b", "c", "d"])
+    matrix["constant"] = 7.0
+    corr = correlation_matrix(matrix)
+    assert list(corr.columns) == ["a", "b", "c", "d"]
+    np.testing.assert_allclose(corr.to_numpy(), matrix[["a", "b", "c", "d"]].corr().to_numpy(), atol=1e-12)
+    assert np.diag(corr.to_numpy()).tolist() == [1.0] * 4
+
+
+def test_correlation_matrix_shipped(shipped):
+    from sections.correlations import build_feature_matrix
+
+    corr = correlation_matrix(build_feature_matrix(shipped["last_vacation"], shipped["attitudes"]))
+    values = corr.to_numpy()
+    assert values.shape[0] == values.shape[1] > 0
+    np.testing.assert_allclose(values, values.T)
+    assert np.abs(values).max() <= 1.0
+
+
+def test_build_crosstab_sql_quotes_identifiers_and_literals():
+    sql = build_crosstab_sql(
+        "last_vacation", "Country_clean", "Answer", "Percentage", "Average",
+        [("Question_Code", ["QAccom", "O'Hare"]), ("Answer", [])],
+    )
+    assert sql == (
+        'SELECT "Country_clean" AS "Country_clean", "Answer" AS "Answer", ROUND(AVG("Percentage"), 1) AS value\n'
+        'FROM "last_vacation"\n'
+        "WHERE \"Question_Code\" IN ('QAccom', 'O''Hare')\n"
+        "GROUP BY 1, 2\n"
+        "ORDER BY 1, 2"
+    )
+
+
+def test_build_crosstab_sql_without_columns_and_count():
+    sql = build_crosstab_sql("ratings", 'Odd "name"', NO_COLUMNS, "Rating", "Count", [])
+    assert sql == (
+        'SELECT "Odd ""name""" AS "Odd ""name""", COUNT("Rating") AS value\n'
+        'FROM "ratings"\n'
+        "GROUP BY 1\n"
+        "ORDER BY 1"
+    )
+
+
+def test_build_crosstab_sql_runs_on_engine(shipped):
+    from sections.sql_engine import SqlEngine
+
+    engine = SqlEngine({"ratings": shipped["ratings"]})
+    sql = build_crosstab_sql("ratings", "Country_clean", NO_COLUMNS, "Percentage", "Sum", [("Country_clean", ["Total"])])
+    result, truncated = engine.execute(sql)
+    assert not truncated
+    assert result["Country_clean"].tolist() == ["Total"]
+    assert result["value"].iat[0] == pytest.approx(100, abs=1.5)
+
+
+def test_benchmark_gate_ignores_shipped_and_noise():
+    baseline = {
+        "f[shipped]": {"min_ms": 0.1, "median_ms": 0.12},
+        "f[synthetic_x20]": {"min_ms": 10.0, "median_ms": 10.5},
+        "g[synthetic_x20]": {"min_ms": 1.0, "median_ms": 3.0},
+    }
+    results = {
+        "f[shipped]": {"min_ms": 0.3, "median_ms": 0.31},      # 3x, aber nicht im Gate
+        "f[synthetic_x20]": {"min_ms": 20.0, "median_ms": 20.5},  # echte Regression
+        "g[synthetic_x20]": {"min_ms": 2.0, "median_ms": 2.2},    # 2x, aber innerhalb der Streuung
+    }
+    regressed = {row[0]: row[4] for row in compare(results, baseline, tolerance=0.5)}
+    assert regressed == {"f[shipped]": False, "f[synthetic_x20]": True, "g[synthetic_x20]": False}
+    assert compare(results, baseline, 0.5, gate=["shipped"])[0][4]
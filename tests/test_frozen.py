@@ -0,0 +1,30 @@
+import os
+
+from tools.freeze import KEEP_BUILDS, switch_build
+
+
+def _builds(tmp_path, *names):
+    builds_dir = tmp_path / "frozen.builds"
+    for name in names:
+        (builds_dir / name).mkdir(parents=True)
+    return builds_dir
+
+
+def test_switch_build_replaces_symlink_and_keeps_previous(tmp_path):
+    output = tmp_path / "frozen"
+    builds_dir = _builds(tmp_path, "20260101-000000-1", "20260102-000000-1", "20260103-000000-1")
+    switch_build(str(output), str(builds_dir), "20260102-000000-1")
+    switch_build(str(output), str(builds_dir), "20260103-000000-1")
+    assert os.path.realpath(output) == str(builds_dir / "20260103-000000-1")
+    assert sorted(os.listdir(builds_dir)) == ["20260102-000000-1", "20260103-000000-1"][-KEEP_BUILDS:]
+
+
+def test_switch_build_moves_old_layout_directory_aside(tmp_path):
+    output = tmp_path / "frozen"
+    (output / "pages").mkdir(parents=True)
+    builds_dir = _builds(tmp_path, "20260101-000000-1")
+    switch_build(str(output), str(builds_dir), "20260101-000000-1")
+    assert output.is_symlink()
+    assert os.path.realpath(output) == str(builds_dir / "20260101-000000-1")
+    # Altbestand zählt als ältester Build und fällt bei KEEP_BUILDS = 2 noch nicht weg
+    assert any(name.startswith("legacy-") for name in os.listdir(builds_dir))
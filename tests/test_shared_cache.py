@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import types
+
+from sections import registry
+from sections.shared_cache import DirectoryStore, code_version, set_store, get_store
+
+
+def _module(source):
+    """Funktionen in einem Wegwerf-Modul unter sections.* (code_version folgt nur solchen Aufrufen)."""
+    module = types.ModuleType("sections._code_version_test")
+    exec(compile(source, f"<{id(source)}>", "exec"), module.__dict__)
+    return module
+
+
+def test_code_version_follows_called_sections_functions():
+    # ohne Quelltext-Datei hasht code_version den Bytecode – der ändert sich mit dem Rumpf ebenso
+    old = _module("def helper(x):\n    return x + 1\n\ndef compute(x):\n    return helper(x)\n")
+    new = _module("def helper(x):\n    return x + 2\n\ndef compute(x):\n    return helper(x)\n")
+    same = _module("def helper(x):\n    return x + 1\n\ndef compute(x):\n    return helper(x)\n")
+    assert code_version(old.compute) != code_version(new.compute)
+    assert code_version(old.compute) == code_version(same.compute)
+    assert code_version(lambda: old.compute(1)) == code_version(lambda: old.compute(1))
+
+
+def test_prune_removes_stale_locks_but_not_held_ones(tmp_path):
+    store = DirectoryStore(str(tmp_path))
+    store.put("models", "aa11", b"x", "bytes")
+    with store.lock("models", "bb22"):
+        pass
+    stale = time.time() - 3600
+    entry = store.path("models", "aa11", "bytes")
+    lock = os.path.join(str(tmp_path), "models", "bb", "bb22.lock")
+    os.utime(entry, (stale, stale))
+    os.utime(lock, (stale, stale))
+    with store.lock("models", "cc33"):
+        held = os.path.join(str(tmp_path), "models", "cc", "cc33.lock")
+        os.utime(held, (stale, stale))
+        assert store.prune(60) == 1
+        assert os.path.exists(held)
+    assert not os.path.exists(entry)
+    assert not os.path.exists(lock)
+
+
+def test_registry_manifest_lives_in_shared_root(tmp_path, monkeypatch):
+    previous = get_store()
+    set_store(DirectoryStore(str(tmp_path)))
+    monkeypatch.setattr(registry, "_loaded", {})
+    try:
+        def fit():
+            fit.calls += 1
+            return {"fitted": fit.calls}
+
+        fit.calls = 0
+        model = registry.get_model("test_model", "hash1", fit)
+        assert model == {"fitted": 1}
+        assert registry.manifest_path() == os.path.join(str(tmp_path), registry.MANIFEST_NAME)
+        # eine zweite Replika (leerer Prozess-Speicher) lädt den Eintrag über das geteilte Manifest
+        monkeypatch.setattr(registry, "_loaded", {})
+        assert "test_model" in registry.preload_models.__wrapped__()
+        assert registry.get_model("test_model", "hash1", fit) == {"fitted": 1}
+        assert fit.calls == 1
+    finally:
+        set_store(previous)
+
+
+def test_registry_slow_fit_blocks_only_its_own_name(tmp_path, monkeypatch):
+    previous = get_store()
+    set_store(DirectoryStore(str(tmp_path)))
+    monkeypatch.setattr(registry, "_loaded", {})
+    monkeypatch.setattr(registry, "_name_locks", {})
+    started, release = threading.Event(), threading.Event()
+    try:
+        def slow_fit():
+            started.set()
+            release.wait(10)
+            return "slow"
+
+        def fast_fit():
+            return "fast"
+
+        slow = threading.Thread(target=registry.get_model, args=("slow_model", "hash1", slow_fit))
+        slow.start()
+        assert started.wait(10)
+        # während slow_model noch fittet, kommt ein anderer Name ohne Warten durch
+        fast = []
+        other = threading.Thread(target=lambda: fast.append(registry.get_model("fast_model", "hash1", fast_fit)))
+        other.start()
+        other.join(5)
+        assert fast == ["fast"]
+        release.set()
+        slow.join(10)
+        assert registry.get_model("slow_model", "hash1", slow_fit) == "slow"
+    finally:
+        release.set()
+        set_store(previous)
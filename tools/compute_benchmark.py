@@ -0,0 +1,249 @@
+"""
+Micro-Benchmarks der reinen Rechenfunktionen der Sektionen (ohne Streamlit-Rendering),
+auf den ausgelieferten Daten und auf synthetisch vergrößerten Daten (zusätzliche Länder).
+
+Ergebnisse werden mit einer gespeicherten Baseline verglichen. Als Regression zählen nur die
+synthetischen Läufe (die ausgelieferten Daten brauchen oft unter 1 ms, dort schwankt selbst das
+Minimum um Faktor 2): die schnellste Laufzeit liegt mehr als --tolerance über der Baseline und
+der Abstand ist größer als das Rauschen beider Messungen (Median minus Minimum).
+Einzeltests und pytest-benchmark-Suite: tests/ (python -m pytest tests).
+
+Beispiel (aus dem Repo-Root):
+    python tools/compute_benchmark.py                    # gegen tools/compute_benchmark_baseline.json
+    python tools/compute_benchmark.py --save-baseline    # Baseline neu schreiben
+    python tools/compute_benchmark.py --only nps weighted --scale 50
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, "tools", "compute_benchmark_baseline.json")
+
+
+def _shipped_frames():
+    from sections.attitudes import load_attitudes_data
+    from sections.adjective_ratings import load_adjective_data
+    from sections.data import load_last_vacation_data, load_question_texts, load_workbook
+    from sections.descriptions_rating import load_description_data, load_rating_data
+
+    return {
+        "attitudes": load_attitudes_data(),
+        "last_vacation": load_last_vacation_data(),
+        "question_texts": load_question_texts(),
+        "descriptions": load_description_data(),
+        "ratings": load_rating_data(),
+        "sociodemographics": load_workbook()["Sociodemographics"],
+        "adjectives": load_adjective_data()
+    }
+
+
+def _more_countries(df, scale, rng, value_column, upper):
+    """Hängt scale - 1 verrauschte Kopien aller Länder (ohne Total) mit neuen Ländernamen an."""
+    from sections.data import compact_dtypes, display_frame
+
+    df = display_frame(df)
+    countries = df[(df["Country_clean"] != "Total") & (df["Country"] != "Total")]
+    copies = [df]
+    for k in range(1, scale):
+        copy = countries.copy()
+        copy["Country"] = copy["Country"] + f"_{k}"
+        copy["Country_clean"] = copy["Country_clean"] + f" {k}"
+        noise = rng.normal(1.0, 0.1, len(copy))
+        copy[value_column] = np.clip(copy[value_column] * noise, 0, upper).round(1)
+        copies.append(copy)
+    return compact_dtypes(pd.concat(copies, ignore_index=True))
+
+
+def _synthetic_frames(shipped, scale, seed):
+    """
+    Gleiches Schema, scale-mal so viele Länder. Fragebogen, Antworten und Statements bleiben
+    gleich – so wachsen die Länder-Matrizen wie bei weiteren Erhebungswellen.
+    """
+    rng = np.random.default_rng(seed)
+    frames = dict(shipped)
+    frames["attitudes"] = _more_countries(shipped["attitudes"], scale, rng, "Agreement", 100)
+    frames["last_vacation"] = _more_countries(shipped["last_vacation"], scale, rng, "Percentage", 100)
+    frames["descriptions"] = _more_countries(shipped["descriptions"], scale, rng, "Percentage", 100)
+    frames["ratings"] = _more_countries(shipped["ratings"], scale, rng, "Percentage", 100)
+    # Sheet-Layout und Würfel-Achsen sind fest – diese Benchmarks laufen nur auf den Originaldaten
+    frames.pop("adjectives", None)
+    frames.pop("sociodemographics")
+    return frames
+
+
+def _benchmarks():
+    """Name -> (benötigte Datensätze, Funktion der Datensätze, die die zu messende Funktion zurückgibt)."""
+    from sections import (
+        Last_Holiday, adjective_ratings, attitudes, correlations, correspondence, descriptions_rating, differences,
+        linkage_comparison, sociodemographics
+    )
+
+    def attitude_models(f):
+        matrix = attitudes.build_attitude_matrix(f["attitudes"])
+        models = attitudes.fit_attitude_models(matrix)
+        return lambda: attitudes.cluster_projection(matrix, models)
+
+    def behavior_matrix(f):
+        return Last_Holiday.build_behavior_matrix(f["last_vacation"])
+
+    def feature_matrix(f):
+        return correlations.build_feature_matrix(f["last_vacation"], f["attitudes"])
+
+    return {
+        "attitude_matrix": (["attitudes"], lambda f: lambda: attitudes.build_attitude_matrix(f["attitudes"])),
+        "attitude_models": (["attitudes"], lambda f: (
+            lambda matrix=attitudes.build_attitude_matrix(f["attitudes"]): attitudes.fit_attitude_models(matrix)
+        )),
+        "cluster_projection": (["attitudes"], attitude_models),
+        "radar_matrix": (["attitudes"], lambda f: lambda: attitudes.radar_matrix(f["attitudes"])),
+        "answer_ranges": (["last_vacation"], lambda f: lambda: differences.compute_answer_ranges(f["last_vacation"])),
+        "question_ranges": (["last_vacation"], lambda f: lambda: differences.question_level_differences(f["last_vacation"])),
+        "top_similarities": (["last_vacation"], lambda f: (
+            lambda ranges=differences.compute_answer_ranges(f["last_vacation"]): differences.top_similarities(ranges)
+        )),
+        "behavior_matrix": (["last_vacation"], lambda f: lambda: behavior_matrix(f)),
+        "ward_linkage": (["last_vacation"], lambda f: (
+            lambda pivot=behavior_matrix(f): Last_Holiday.fit_behavior_models(pivot)
+        )),
+        "question_views": (["last_vacation", "question_texts"], lambda f: (
+            lambda: Last_Holiday.build_question_views(f["last_vacation"], f["question_texts"])
+        )),
+        "correspondence": (["last_vacation"], lambda f: (
+            lambda pivot=behavior_matrix(f): correspondence.correspondence_analysis(pivot)
+        )),
+        "linkage_comparison": (["last_vacation"], lambda f: (
+            lambda pivot=behavior_matrix(f): linkage_comparison.compare_linkages(pivot)
+        )),
+        "feature_matrix": (["last_vacation", "attitudes"], lambda f: lambda: feature_matrix(f)),
+        "correlation_matrix": (["last_vacation", "attitudes"], lambda f: (
+            lambda matrix=feature_matrix(f): correlations.correlation_matrix(matrix)
+        )),
+        "correlation_clustering": (["last_vacation", "attitudes"], lambda f: (
+            lambda corr=correlations.correlation_matrix(feature_matrix(f)): correlations.cluster_order(corr)
+        )),
+        "nps": (["ratings"], lambda f: lambda: descriptions_rating.compute_nps(f["ratings"])),
+        "weighted_ratings": (["ratings"], lambda f: lambda: descriptions_rating.weighted_rating_rows(f["ratings"])),
+        "total_adjectives": (["descriptions"], lambda f: lambda: descriptions_rating.total_sample_adjectives(f["descriptions"])),
+        "adjective_cube": (["adjectives"], lambda f: lambda: adjective_ratings.build_adjective_cube(f["adjectives"])),
+        "gender_distribution": (["sociodemographics"], lambda f: (
+            lambda: sociodemographics.gender_distribution(f["sociodemographics"])
+        )),
+    }
+
+
+def measure(func, min_time=0.5, max_runs=200):
+    """Median und Minimum in ms; ein Aufwärmlauf, dann wiederholt bis min_time oder max_runs."""
+    func()
+    times = []
+    start = time.perf_counter()
+    while len(times) < 3 or (time.perf_counter() - start < min_time and len(times) < max_runs):
+        t0 = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "runs": len(times)}
+
+
+def run(only=None, scale=20, seed=42, min_time=0.5):
+    shipped = _shipped_frames()
+    datasets = {"shipped": shipped, f"synthetic_x{scale}": _synthetic_frames(shipped, scale, seed)}
+    results = {}
+    for name, (needs, make) in _benchmarks().items():
+        if only and not any(part in name for part in only):
+            continue
+        for dataset, frames in datasets.items():
+            if not all(n in frames for n in needs):
+                continue
+            results[f"{name}[{dataset}]"] = measure(make(frames), min_time=min_time)
+    return results
+
+
+def noise_ms(result):
+    """Streuung einer Messung: Median minus Minimum (bei ruhiger Maschine nahe 0)."""
+    return result["median_ms"] - result["min_ms"]
+
+
+def compare(results, baseline, tolerance, gate=("synthetic",)):
+    """
+    Liste (Name, aktuell, Baseline, Verhältnis, Regression?) für alle Einträge.
+
+    Regression nur für Datensätze, deren Name mit einem Präfix aus gate beginnt, und nur wenn
+    der Abstand zur Baseline größer als die Streuung beider Messungen ist.
+    """
+    rows = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        ratio = result["min_ms"] / base["min_ms"] if base and base["min_ms"] > 0 else None
+        dataset = key[key.index("[") + 1:-1]
+        regressed = (
+            ratio is not None and ratio > 1 + tolerance and dataset.startswith(tuple(gate))
+            and result["min_ms"] - base["min_ms"] > max(noise_ms(result), noise_ms(base))
+        )
+        rows.append((key, result["min_ms"], base and base["min_ms"], ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pure compute functions of the dashboard sections")
+    parser.add_argument("--only", nargs="*", help="substrings of benchmark names to run")
+    parser.add_argument("--scale", type=int, default=20, help="country multiplier for the synthetic dataset")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds of repeated runs per benchmark")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown vs. baseline (0.5 = +50%%)")
+    parser.add_argument(
+        "--gate", nargs="*", default=["synthetic"],
+        help="dataset prefixes that can fail the run (default: synthetic only; 'shipped' is reported, not gated)"
+    )
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    results = run(args.only, args.scale, min_time=args.min_time)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+                    "cpu_count": os.cpu_count(), "scale": args.scale
+                },
+                "results": {
+                    key: {"min_ms": round(r["min_ms"], 4), "median_ms": round(r["median_ms"], 4)}
+                    for key, r in results.items()
+                }
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline with {len(results)} benchmarks written to {os.path.relpath(args.baseline, ROOT)}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    rows = compare(results, baseline, args.tolerance, args.gate)
+
+    print(f"{'benchmark':<44}{'min ms':>11}{'baseline':>11}{'ratio':>8}")
+    for key, current, base, ratio, regressed in rows:
+        base_text = f"{base:>11.3f}" if base is not None else f"{'–':>11}"
+        ratio_text = f"{ratio:>8.2f}" if ratio is not None else f"{'–':>8}"
+        print(f"{key:<44}{current:>11.3f}{base_text}{ratio_text}{'  REGRESSION' if regressed else ''}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond +{args.tolerance:.0%} and noise: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
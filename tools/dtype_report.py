@@ -0,0 +1,158 @@
+"""
+Speicherbedarf der gecachten Datensätze vorher (object/float64) und nachher (Kategorien/float32),
+bei Original-Größe und synthetisch vervielfacht (Standard: 100×).
+
+"Vorher" sind die Loader vor der Typ-Umstellung, hier als legacy_load_* nachgebaut: CSV mit
+Standard-Dtypes, dieselben Zusatzspalten, inklusive mehrfach gecachter Kopien desselben Datensatzes.
+
+Beispiel (aus dem Repo-Root):
+    python tools/dtype_report.py --scale 100
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Länderzuordnungen der alten Loader (Ländercode bzw. Buchstabe in Klammern)
+LEGACY_COUNTRY_MAP = {
+    "Total": "Total", "SG": "Singapore", "UK": "United Kingdom", "US": "United States",
+    "CN": "China", "KR": "South Korea", "UAE": "United Arab Emirates", "BR": "Brazil",
+    "FR": "France", "DE": "Germany", "AU": "Australia"
+}
+LEGACY_LETTER_MAP = {
+    "A": "Total", "B": "Singapore", "C": "United Kingdom", "D": "United States",
+    "E": "China", "F": "South Korea", "G": "United Arab Emirates",
+    "H": "Brazil", "I": "France", "J": "Germany", "K": "Australia"
+}
+LEGACY_DURATIONS = {
+    "Short trip / 2-4 nights": ["Short trip", "2-4 nights"],
+    "Medium trip / 5-7 nights": ["Medium trip", "5-7 nights"],
+    "Long trip / 8-14 nights": ["Long trip", "8-14 nights"],
+    "Extra long trip / 15 or more nights": ["Extra long trip", "15 or more nights"],
+    "Overnight stay / 1 night": ["1 night", "Overnight stay"]
+}
+
+
+def legacy_load_attitudes():
+    """Alter Loader aus sections/attitudes.py."""
+    df = pd.read_csv("data/Cleaned_Tourism_Attitudes.csv")
+    df["Country_clean"] = df["Country"].map({**LEGACY_COUNTRY_MAP, "Total": "All Countries"})
+    return df
+
+
+def legacy_load_last_vacation(merge_answers=True):
+    """
+    Alter Loader aus sections/Last_Holiday.py (merge_answers=True) bzw. sections/differences.py,
+    der die QDuration- und QWhere-Beschriftungen nicht zusammenführte.
+    """
+    df = pd.read_csv("data/Cleaned_LastVacation_FINAL_FIXED.csv")
+    df = df.dropna(subset=["Percentage"])
+    df = df[~df["Answer"].str.contains("Count", case=False, na=False)]
+    df["Answer"] = df["Answer"].astype(str).str.strip()
+    df["Percentage"] = (df["Percentage"] * 100).round(1)
+
+    if merge_answers:
+        duration = df["Question_Code"] == "QDuration"
+        for merged, labels in LEGACY_DURATIONS.items():
+            df.loc[duration & df["Answer"].isin(labels), "Answer"] = merged
+        where = df["Question_Code"] == "QWhere"
+        df.loc[where, "Answer"] = df.loc[where, "Answer"].replace({
+            r"^Domestically.*": "Domestically, within my country",
+            r"^International.*": "Internationally, outside my country",
+            r"^Both domest.*": "Both domestically and internationally"
+        }, regex=True)
+
+    df = df.groupby(["Question_Code", "Question_Text", "Country", "Answer"], as_index=False).agg({"Percentage": "mean"})
+    df["Country_clean"] = df["Country"].map(LEGACY_COUNTRY_MAP)
+    return df
+
+
+def legacy_load_descriptions():
+    """Alter Loader aus sections/descriptions_rating.py."""
+    df = pd.read_csv("data/Adjective_2_Long_Format_Final.csv")
+    df["Country_clean"] = df["Country"].str.extract(r"\((.)\)").iloc[:, 0].map(LEGACY_LETTER_MAP)
+    df["Percentage"] = (df["Percentage"] * 100).round(1)
+    return df
+
+
+def legacy_load_ratings():
+    """Alter Loader aus sections/descriptions_rating.py."""
+    df = pd.read_csv("data/QRate_Long_Format_Clean.csv")
+    df["Country_clean"] = df["Country"].str.extract(r"\((.)\)").iloc[:, 0].map(LEGACY_LETTER_MAP)
+    df["Percentage"] = (df["Percentage"] * 100).round(1)
+    df["Rating"] = pd.to_numeric(df["Rating"], errors="coerce")
+    return df
+
+
+def _legacy_frames():
+    """
+    Datensätze so, wie die alten Loader sie im Cache hielten (Liste je Datensatz): last_vacation
+    wurde von Last_Holiday und differences getrennt geladen und lag doppelt im Speicher.
+    """
+    return {
+        "attitudes": [legacy_load_attitudes()],
+        "last_vacation": [legacy_load_last_vacation(), legacy_load_last_vacation(merge_answers=False)],
+        "descriptions": [legacy_load_descriptions()],
+        "ratings": [legacy_load_ratings()]
+    }
+
+
+def _compact_frames():
+    from sections.attitudes import load_attitudes_data
+    from sections.data import load_last_vacation_data, load_question_texts
+    from sections.descriptions_rating import load_description_data, load_rating_data
+
+    return {
+        "attitudes": load_attitudes_data(),
+        "last_vacation": load_last_vacation_data(),
+        "descriptions": load_description_data(),
+        "ratings": load_rating_data()
+    }, load_question_texts()
+
+
+def _scaled(df, scale):
+    # pd.concat erhält Kategorien nur bei identischen Wörterbüchern – hier immer der Fall
+    return pd.concat([df] * scale, ignore_index=True) if scale > 1 else df
+
+
+def _mb(obj):
+    return obj.memory_usage(deep=True).sum() / 1024 ** 2 if isinstance(obj, pd.DataFrame) \
+        else obj.memory_usage(deep=True) / 1024 ** 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory of cached datasets before/after compact dtypes")
+    parser.add_argument("--scale", type=int, default=100, help="synthetic row multiplier")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    legacy = _legacy_frames()
+    compact, question_texts = _compact_frames()
+
+    print(f"{'dataset':<16}{'rows':>8}{'before MB':>12}{'after MB':>11}"
+          f"{f'{args.scale}x before':>14}{f'{args.scale}x after':>13}")
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for name in legacy:
+        sizes = [
+            sum(_mb(df) for df in legacy[name]), _mb(compact[name]),
+            sum(_mb(_scaled(df, args.scale)) for df in legacy[name]), _mb(_scaled(compact[name], args.scale))
+        ]
+        if name == "last_vacation":
+            # die Lookup-Tabelle wächst nicht mit der Zeilenzahl
+            sizes[1] += _mb(question_texts)
+            sizes[3] += _mb(question_texts)
+        totals = [t + s for t, s in zip(totals, sizes)]
+        print(f"{name:<16}{len(compact[name]):>8}{sizes[0]:>12.3f}{sizes[1]:>11.3f}{sizes[2]:>14.2f}{sizes[3]:>13.2f}")
+    print(f"{'total':<24}{totals[0]:>12.3f}{totals[1]:>11.3f}{totals[2]:>14.2f}{totals[3]:>13.2f}")
+    for name, frames in legacy.items():
+        if len(frames) > 1:
+            print(f"before: {name} was cached {len(frames)} times ({len(frames[0])} rows each) by separate loaders")
+
+
+if __name__ == "__main__":
+    main()
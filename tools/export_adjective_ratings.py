@@ -0,0 +1,73 @@
+"""
+Erzeugt data/QDescribe_B_2_FIXED.csv (Adjektiv × Rating-Level je Land, Long-Format) neu aus dem
+Sheet "Adjektive 1" des Workbooks. QDescribe_B wurde nur in Total, SG, UK und US gestellt; die
+Länderblöcke sind Kreuztabellen mit den Adjektiven als Spalten und den drei Stufen als Zeilen.
+
+Danach muss python -m sections.validation adjective_ratings durchlaufen.
+
+Beispiel (aus dem Repo-Root):
+    python tools/export_adjective_ratings.py
+    python tools/export_adjective_ratings.py --output /tmp/adjectives.csv
+"""
+import argparse
+import os
+import re
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKBOOK = os.path.join(ROOT, "data", "DATA_TourismCommunity2025_Countries.xlsx")
+SHEET = "Adjektive 1"
+OUTPUT = os.path.join(ROOT, "data", "QDescribe_B_2_FIXED.csv")
+QUESTION_CODE = "QDescribe_B"
+
+
+def read_blocks(sheet: pd.DataFrame, levels: list[str], countries: list[str], letters: list[str]) -> pd.DataFrame:
+    """
+    Alle Länderblöcke des Sheets im Long-Format (Question_Code, Country, Adjective, Rating_Level, Percentage).
+
+    Ein Block beginnt mit einer Zeile der Adjektive ("Relaxing (A)", ...), darunter Ländercode und
+    Fallzahlen, dann eine Zeile je Stufe. Land im Format der übrigen Exporte: "SG (B)".
+    """
+    rows = []
+    labels = sheet[0].astype(str).str.strip()
+    for header in sheet.index[sheet[1].astype(str).str.match(r".+ \(.\)$")]:
+        code = labels[header + 1]
+        if code not in countries:
+            raise ValueError(f"Unknown country block {code!r} in row {header + 2}")
+        country = f"{code} ({letters[countries.index(code)]})"
+        level_rows = list(range(header + 2, header + 2 + len(levels)))
+        unexpected = [labels[row] for row in level_rows if labels[row] not in levels]
+        if unexpected:
+            raise ValueError(f"Unexpected rating levels {unexpected} below row {header + 1}")
+        for column, adjective in sheet.loc[header, 1:].dropna().items():
+            for row in level_rows:
+                level = labels[row]
+                rows.append({
+                    "Question_Code": QUESTION_CODE, "Country": country,
+                    "Adjective": re.sub(r" \(.\)$", "", adjective), "Rating_Level": level,
+                    "Percentage": float(sheet.loc[row, column])
+                })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate the adjective x rating-level export from the workbook")
+    parser.add_argument("--workbook", default=WORKBOOK)
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from sections.adjective_ratings import RATING_LEVELS
+    from sections.validation import COUNTRY_CODES, COUNTRY_LETTERS
+
+    sheet = pd.read_excel(args.workbook, sheet_name=SHEET, header=None)
+    df = read_blocks(sheet, RATING_LEVELS, COUNTRY_CODES, COUNTRY_LETTERS)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df)} rows ({df['Country'].nunique()} countries, {df['Adjective'].nunique()} adjectives) "
+          f"written to {os.path.relpath(args.output, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Eingefrorener Build: rechnet alle Sektionen einmal durch und legt jede Seite als fertige
+Elementliste ab (Texte, Tabellen, Plotly-JSON plus PNG pro Grafik). Mit TOURISM_FROZEN=1
+zeigt app.py nur noch diese Artefakte – ohne Pandas-, scikit-learn- oder SciPy-Arbeit pro Rerun.
+
+Gerendert wird app.py selbst (Streamlit-AppTest, wie tools/render_report.py): erst mit den
+Standardwerten aller Widgets, dann für jede Option jedes aufzählbaren Widgets (Selectbox,
+Radio, Checkbox, Slider mit höchstens --max-states Werten) – jeweils eins zur Zeit, die übrigen
+auf Standard. Multiselects und große Slider bleiben im Build fest auf ihrem Standardwert,
+ebenso Widgets, die erst in einem anderen Zustand erscheinen (z. B. die Zeilen-Auswahl einer
+anderen Tabelle im Crosstab Builder) – sie stehen fest auf ihrem Wert in diesem Zustand.
+
+Jeder Build landet in einem eigenen Verzeichnis <output>.builds/<build_id>; <output> ist ein
+Symlink darauf und wird erst am Ende atomar umgehängt. Eine laufende App liest nie einen
+halben Build und lädt beim nächsten Rerun den neuen (der Zielpfad ist ihr Cache-Schlüssel).
+
+Grafiken werden über einen Hash ihres JSONs abgelegt; was in mehreren Zuständen gleich
+aussieht, steht nur einmal auf der Platte.
+
+Beispiel (aus dem Repo-Root):
+    python tools/freeze.py                     # alle Sektionen nach frozen/
+    python tools/freeze.py attitudes --no-png --output /tmp/frozen
+    TOURISM_FROZEN=1 streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, "app.py")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import PAGES  # noqa: E402
+
+TEXT_TYPES = {"title", "header", "subheader", "caption"}
+ALERT_TYPES = {"info", "success", "warning", "error"}
+WIDGET_TYPES = {"selectbox", "radio", "multiselect", "slider", "checkbox"}
+# Mehr Zustände pro Widget werden nicht aufgezählt (z. B. der Antworten-Slider der Korrespondenzanalyse)
+DEFAULT_MAX_STATES = 20
+# Aktueller und vorheriger Build bleiben liegen – Sessions, die noch den alten zeigen, finden ihre PNGs
+KEEP_BUILDS = 2
+
+
+def _widget_id(widget, seen):
+    """Stabile ID über alle Reruns: eigener Key, sonst Typ und Beschriftung (bei Dopplungen durchnummeriert)."""
+    base = widget.key or f"{widget.type}:{widget.label}"
+    seen[base] = seen.get(base, 0) + 1
+    return base if seen[base] == 1 else f"{base}#{seen[base]}"
+
+
+def _walk_widgets(node, seen, found):
+    for child in node.children.values():
+        kind = getattr(child, "type", None)
+        if kind in WIDGET_TYPES:
+            found[_widget_id(child, seen)] = child
+        elif hasattr(child, "children"):
+            _walk_widgets(child, seen, found)
+    return found
+
+
+def find_widgets(at):
+    """Widget-ID -> AppTest-Widget der Hauptseite (ohne Sidebar-Menü), in Anzeigereihenfolge."""
+    return _walk_widgets(at.main, {}, {})
+
+
+def describe_widget(widget_id, widget, max_states):
+    """Beschreibung fürs Manifest; states enthält die aufgezählten Werte (leer = fest auf Standard)."""
+    kind = widget.type
+    spec = {"id": widget_id, "kind": kind, "label": widget.label}
+    if kind in ("selectbox", "radio"):
+        spec["options"] = list(widget.options)
+        spec["default"] = widget.options[widget.index]
+        values = list(widget.options)
+    elif kind == "multiselect":
+        spec["options"] = list(widget.options)
+        spec["default"] = list(widget.values)
+        values = []
+    elif kind == "slider":
+        # Protobuf liefert Grenzen und Schritt als float, auch für ganzzahlige Slider
+        cast = int if isinstance(widget.value, int) else float
+        spec.update(min=cast(widget.min), max=cast(widget.max), step=cast(widget.step), default=widget.value)
+        values = list(range(spec["min"], spec["max"] + 1, spec["step"])) if cast is int else []
+    else:
+        spec["default"] = widget.value
+        values = [False, True]
+    spec["states"] = [v for v in values if v != spec["default"]] if len(values) <= max_states else []
+    return spec
+
+
+def _set_widget(widget, value):
+    # Selectboxen zeigen formatierte Texte – über den Index setzen, nicht über den Rohwert
+    if widget.type == "selectbox":
+        widget.select_index(widget.options.index(value))
+    else:
+        widget.set_value(value)
+
+
+def _table(df):
+    """DataFrame als Spalten und Zeilen in reinem JSON (Index wird zur Spalte, wenn er etwas bedeutet)."""
+    if df.index.name is not None or not df.index.equals(df.index.__class__(range(len(df)))):
+        df = df.reset_index()
+    split = json.loads(df.to_json(orient="split", date_format="iso", index=False))
+    columns = [" / ".join(map(str, c)) if isinstance(c, (list, tuple)) else str(c) for c in split["columns"]]
+    return {"kind": "table", "columns": columns, "rows": split["data"]}
+
+
+def collect(node, figures, seen=None):
+    """
+    Elementbaum einer Seite als JSON-fähige Liste; Grafiken landen (über ihren Hash) in figures.
+
+    Download-Buttons entfallen – im Build bekommt jede Grafik ihren PNG-Download.
+    """
+    seen = {} if seen is None else seen
+    items = []
+    for child in node.children.values():
+        kind = getattr(child, "type", None)
+        if kind in TEXT_TYPES:
+            items.append({"kind": "text", "tag": kind, "text": child.value})
+        elif kind == "markdown":
+            # CSS-Blöcke aus app.py setzt die eingefrorene App selbst
+            if not child.value.lstrip().startswith("<style"):
+                items.append({"kind": "markdown", "text": child.value, "html": child.proto.allow_html})
+        elif kind in ALERT_TYPES:
+            items.append({"kind": "alert", "level": kind, "text": child.value})
+        elif kind == "plotly_chart":
+            spec = child.proto.spec
+            figure_id = hashlib.sha256(spec.encode()).hexdigest()[:16]
+            figures[figure_id] = spec
+            items.append({"kind": "figure", "id": figure_id})
+        elif kind in ("dataframe", "table"):
+            items.append(_table(child.value))
+        elif kind in WIDGET_TYPES:
+            items.append({"kind": "widget", "id": _widget_id(child, seen)})
+        elif kind == "expander":
+            items.append({
+                "kind": "expander", "label": child.label, "expanded": child.proto.expanded,
+                "items": collect(child, figures, seen)
+            })
+        elif kind == "flex_container" and all(getattr(c, "type", None) == "column" for c in child.children.values()):
+            items.append({
+                "kind": "columns",
+                "columns": [collect(c, figures, seen) for c in child.children.values()]
+            })
+        elif hasattr(child, "children"):
+            items += collect(child, figures, seen)
+    return items
+
+
+def _number_figures(items, page, counter):
+    """Dateiname und laufende Nummer je Grafik (für Download-Namen und eindeutige Widget-Keys)."""
+    for item in items:
+        if item["kind"] == "figure":
+            counter[0] += 1
+            item.update(name=f"{page}_{counter[0]:02d}", n=counter[0])
+        elif item["kind"] == "expander":
+            _number_figures(item["items"], page, counter)
+        elif item["kind"] == "columns":
+            for column in item["columns"]:
+                _number_figures(column, page, counter)
+    return items
+
+
+def freeze_section(job):
+    """Rendert eine Sektion in allen aufgezählten Zuständen im Worker-Prozess."""
+    page, timeout, max_states = job
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    at.session_state["password_correct"] = True
+    at.run()
+    at.sidebar.radio[0].set_value(PAGES[page]).run()
+
+    from sections.frozen import DEFAULT_STATE, state_id
+
+    figures = {}
+    # Widget-ID -> Beschreibung, aus allen Zuständen; nur die der Standardansicht werden aufgezählt
+    specs = {}
+
+    def snapshot(state):
+        if at.exception:
+            raise RuntimeError(f"{page} [{state}]: {at.exception[0].value}")
+        for wid, w in find_widgets(at).items():
+            if wid not in specs:
+                specs[wid] = describe_widget(wid, w, max_states if state == DEFAULT_STATE else 0)
+        return _number_figures(collect(at.main, figures), page, [0])
+
+    states = {DEFAULT_STATE: snapshot(DEFAULT_STATE)}
+    for widget in [spec for spec in specs.values() if spec["states"]]:
+        for value in widget["states"]:
+            _set_widget(find_widgets(at)[widget["id"]], value)
+            at.run()
+            states[state_id(widget["id"], value)] = snapshot(state_id(widget["id"], value))
+        _set_widget(find_widgets(at)[widget["id"]], widget["default"])
+        at.run()
+    from sections.data import data_version
+
+    return {
+        "page": page,
+        "data_version": data_version(),
+        "build": {"widgets": list(specs.values()), "states": states},
+        "figures": figures,
+        "render_s": time.perf_counter() - start
+    }
+
+
+def export_pngs(figures, figures_dir):
+    """PNG je Grafik mit dem Export-Styling der Download-Buttons; vorhandene Dateien bleiben."""
+    import plotly.io as pio
+
+    from sections.utils import prepare_figure_for_export
+
+    for figure_id, spec in figures.items():
+        path = os.path.join(figures_dir, f"{figure_id}.png")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(prepare_figure_for_export(pio.from_json(spec)))
+
+
+def switch_build(output, builds_dir, build_id):
+    """
+    Hängt den Symlink output atomar auf builds_dir/build_id um und räumt alte Builds ab.
+
+    Ein echtes Verzeichnis an output (Build im alten Layout) wandert vorher nach builds_dir.
+    """
+    if os.path.isdir(output) and not os.path.islink(output):
+        os.replace(output, os.path.join(builds_dir, "legacy-" + time.strftime("%Y%m%d-%H%M%S")))
+    link = output + ".link.tmp"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.relpath(os.path.join(builds_dir, build_id), os.path.dirname(output)), link)
+    os.replace(link, output)
+
+    # Build-IDs beginnen mit dem Zeitstempel: lexikografisch = chronologisch (Altbestand zuerst)
+    done = sorted((name for name in os.listdir(builds_dir) if not name.endswith(".tmp")),
+                  key=lambda name: (not name.startswith("legacy-"), name))
+    for name in done[:-KEEP_BUILDS]:
+        if name != build_id:
+            shutil.rmtree(os.path.join(builds_dir, name), ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute all dashboard pages for the frozen runtime mode")
+    parser.add_argument("pages", nargs="*", default=[p for p in PAGES if p != "introduction"],
+                        help=f"sections to freeze (default: all but the introduction). Choices: {', '.join(PAGES)}")
+    parser.add_argument("--output", default="frozen", help="build directory (TOURISM_FROZEN_DIR at runtime)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES,
+                        help="widgets with more values stay fixed on their default")
+    parser.add_argument("--no-png", action="store_true", help="skip the PNG exports")
+    parser.add_argument("--timeout", type=float, default=600, help="timeout per rerun in seconds")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.pages) - set(PAGES))
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    output = os.path.abspath(args.output)
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    # Worker brauchen weder API- und Metrik-Server noch das Vorwärmen fremder Sektionen
+    os.environ["TOURISM_API"] = "0"
+    os.environ["TOURISM_PREFETCH"] = "0"
+    os.environ["TOURISM_WARMUP"] = "0"
+    os.environ["TOURISM_METRICS"] = "0"
+    os.environ["TOURISM_RENDER_WORKERS"] = "0"
+    os.environ.pop("TOURISM_FROZEN", None)
+
+    start = time.perf_counter()
+    jobs = [(page, args.timeout, args.max_states) for page in args.pages]
+    context = multiprocessing.get_context("spawn")
+    workers = max(1, min(args.workers, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+        results = list(pool.map(freeze_section, jobs))
+
+    # Neuer Build in ein eigenes Verzeichnis; <output> wird erst am Ende umgehängt
+    build_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    builds_dir = output + ".builds"
+    staging = os.path.join(builds_dir, build_id + ".tmp")
+    os.makedirs(os.path.join(staging, "pages"))
+    figures_dir = os.path.join(staging, "figures")
+    os.makedirs(figures_dir)
+
+    figures = {}
+    for result in results:
+        figures.update(result["figures"])
+        with open(os.path.join(staging, "pages", f"{result['page']}.json"), "w", encoding="utf-8") as f:
+            json.dump(result["build"], f, ensure_ascii=False, separators=(",", ":"))
+    for figure_id, spec in figures.items():
+        with open(os.path.join(figures_dir, f"{figure_id}.json"), "w", encoding="utf-8") as f:
+            f.write(spec)
+    render_s = time.perf_counter() - start
+    if not args.no_png:
+        export_pngs(figures, figures_dir)
+
+    from sections.frozen import MANIFEST_FILE
+
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "build_id": build_id,
+            "built": time.strftime("%Y-%m-%d %H:%M"),
+            "data_version": results[0]["data_version"],
+            "pages": {PAGES[r["page"]]: f"{r['page']}.json" for r in results}
+        }, f, ensure_ascii=False, indent=2)
+
+    os.replace(staging, os.path.join(builds_dir, build_id))
+    switch_build(output, builds_dir, build_id)
+
+    for r in results:
+        states = r["build"]["states"]
+        fixed = [w["id"] for w in r["build"]["widgets"] if not w["states"]]
+        print(f"{r['page']:<22}{len(states):>4} states{len(r['figures']):>5} figures  "
+              f"render {r['render_s']:.1f}s" + (f"  fixed: {', '.join(fixed)}" if fixed else ""))
+    print(f"{len(figures)} figures; frozen build written to {output} in {time.perf_counter() - start:.1f}s "
+          f"(render {render_s:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Lasttest für das Dashboard: simuliert N gleichzeitige Sessions mit zufälliger Navigation
+und Widget-Interaktion und schreibt einen maschinenlesbaren JSON-Report.
+
+Jede Session ist ein eigener Streamlit-AppTest (eigener Session-State), alle Sessions
+teilen sich – wie auf dem Server – die Caches des Prozesses.
+
+Beispiel (aus dem Repo-Root):
+    python tools/loadtest.py --sessions 50 --steps 6 --pages attitudes Last_Holiday
+    python tools/loadtest.py --mode process --workers 4 --sessions 20 --output reports/load.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, "app.py")
+
+# Kurzname -> Menü-Eintrag in app.py
+PAGES = {
+    "introduction": "0. Introduction",
+    "sociodemographics": "1. Socio-demographics & distribution",
+    "attitudes": "2. Attitudes towards vacations",
+    "differences": "2a. Differences and Similarities",
+    "correlations": "2b. Cross-question Correlations",
+    "Last_Holiday": "3. Last Vacation",
+    "descriptions_rating": "4. Descriptions and Rating",
+    "adjective_ratings": "4a. Adjectives and Rating Levels",
+    "crosstab": "4b. Crosstab Builder (SQL)",
+}
+
+
+def rss_mb():
+    """Aktueller Resident Set Size des Prozesses in MB (Linux: /proc, sonst Peak via getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _interact(at, rng):
+    """Eine zufällige Widget-Aktion auf der aktuellen Seite; gibt eine Beschreibung zurück."""
+    candidates = []
+    candidates += [("multiselect", w) for w in at.multiselect if w.options]
+    candidates += [("selectbox", w) for w in at.selectbox if w.options]
+    candidates += [("checkbox", w) for w in at.checkbox]
+    candidates += [("slider", w) for w in at.slider]
+    if not candidates:
+        return None
+
+    kind, widget = rng.choice(candidates)
+    if kind == "multiselect":
+        k = rng.randint(1, min(4, len(widget.options)))
+        widget.set_value(rng.sample(list(widget.options), k))
+    elif kind == "selectbox":
+        widget.set_value(rng.choice(list(widget.options)))
+    elif kind == "checkbox":
+        widget.set_value(not widget.value)
+    else:
+        widget.set_value(rng.randint(widget.min, widget.max))
+    return kind
+
+
+def run_session(session_id, pages, steps, seed, timeout):
+    """Führt eine Session aus und liefert die gemessenen Reruns."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    at.session_state["password_correct"] = True
+    records = []
+
+    def timed(page, action):
+        start = time.perf_counter()
+        error = None
+        try:
+            at.run()
+            if at.exception:
+                error = at.exception[0].value
+        except Exception as exc:  # Timeout o. ä. zählt als Fehler, die Session läuft weiter
+            error = repr(exc)
+        records.append({
+            "session": session_id,
+            "page": page,
+            "action": action,
+            "latency_s": time.perf_counter() - start,
+            "error": error
+        })
+
+    timed("startup", "load")
+    for _ in range(steps):
+        page = rng.choice(pages)
+        at.sidebar.radio[0].set_value(PAGES[page])
+        timed(page, "navigate")
+        # 1–3 Widget-Aktionen pro Seitenbesuch
+        for _ in range(rng.randint(1, 3)):
+            action = _interact(at, rng)
+            if action is None:
+                break
+            timed(page, action)
+    return records
+
+
+def _run_thread_pool(args):
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [
+            pool.submit(run_session, i, args.pages, args.steps, args.seed, args.timeout)
+            for i in range(args.sessions)
+        ]
+        return [r for f in futures for r in f.result()]
+
+
+def _process_worker(job):
+    session_ids, pages, steps, seed, timeout = job
+    os.chdir(ROOT)
+    rss_start = rss_mb()
+    with ThreadPoolExecutor(max_workers=len(session_ids)) as pool:
+        futures = [pool.submit(run_session, i, pages, steps, seed, timeout) for i in session_ids]
+        records = [r for f in futures for r in f.result()]
+    return records, {"pid": os.getpid(), "rss_start_mb": rss_start, "rss_end_mb": rss_mb()}
+
+
+def _run_process_pool(args):
+    chunks = [list(range(args.sessions))[i::args.workers] for i in range(args.workers)]
+    jobs = [(ids, args.pages, args.steps, args.seed, args.timeout) for ids in chunks if ids]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        results = list(pool.map(_process_worker, jobs))
+    return [r for records, _ in results for r in records], [info for _, info in results]
+
+
+def _latency_stats(latencies):
+    if not latencies:
+        return {"count": 0}
+    values = np.array(latencies)
+    return {
+        "count": int(len(values)),
+        "mean_s": float(values.mean()),
+        "p50_s": float(np.percentile(values, 50)),
+        "p95_s": float(np.percentile(values, 95)),
+        "p99_s": float(np.percentile(values, 99)),
+        "max_s": float(values.max())
+    }
+
+
+def build_report(args, records, wall_s, cpu_s, rss_start, rss_end, workers=None):
+    reruns = [r for r in records if r["action"] != "load"]
+    errors = [r for r in records if r["error"]]
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "config": {
+            "mode": args.mode, "sessions": args.sessions, "steps": args.steps,
+            "pages": args.pages, "seed": args.seed, "workers": args.workers if args.mode == "process" else None
+        },
+        "wall_time_s": wall_s,
+        "reruns": len(records),
+        "throughput_reruns_per_s": len(records) / wall_s if wall_s else 0.0,
+        "errors": len(errors),
+        "error_samples": sorted({str(r["error"])[:200] for r in errors})[:5],
+        "latency": _latency_stats([r["latency_s"] for r in reruns]),
+        "latency_by_page": {
+            page: _latency_stats([r["latency_s"] for r in reruns if r["page"] == page])
+            for page in sorted({r["page"] for r in reruns})
+        },
+        "latency_by_action": {
+            action: _latency_stats([r["latency_s"] for r in reruns if r["action"] == action])
+            for action in sorted({r["action"] for r in reruns})
+        },
+        "cpu": {
+            "cpu_time_s": cpu_s,
+            # >100 % bedeutet mehrere Kerne ausgelastet
+            "utilization_percent": 100 * cpu_s / wall_s if wall_s else 0.0,
+            "cores": os.cpu_count()
+        },
+        "memory": {
+            "rss_start_mb": rss_start,
+            "rss_end_mb": rss_end,
+            "rss_growth_mb": rss_end - rss_start,
+            "workers": workers
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent multi-session load test for the tourism dashboard")
+    parser.add_argument("--sessions", type=int, default=10, help="number of simultaneous sessions")
+    parser.add_argument("--steps", type=int, default=5, help="page visits per session")
+    parser.add_argument("--pages", nargs="+", default=["attitudes", "Last_Holiday"], choices=sorted(PAGES))
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes in process mode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=300, help="timeout per rerun in seconds")
+    parser.add_argument("--output", default="loadtest_report.json")
+    args = parser.parse_args(argv)
+
+    # Relative Datenpfade in den Sektionen setzen den Repo-Root als Arbeitsverzeichnis voraus
+    output = os.path.abspath(args.output)
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    rss_start = rss_mb()
+    cpu_start = time.process_time()
+    children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+
+    workers = None
+    if args.mode == "thread":
+        records = _run_thread_pool(args)
+    else:
+        records, workers = _run_process_pool(args)
+
+    wall_s = time.perf_counter() - start
+    children_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_s = (time.process_time() - cpu_start) + (
+        (children_end.ru_utime + children_end.ru_stime) - (children_start.ru_utime + children_start.ru_stime)
+    )
+    if workers:
+        rss_start = sum(w["rss_start_mb"] for w in workers)
+        rss_end = sum(w["rss_end_mb"] for w in workers)
+    else:
+        rss_end = rss_mb()
+
+    report = build_report(args, records, wall_s, cpu_s, rss_start, rss_end, workers)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    lat = report["latency"]
+    print(f"{report['reruns']} reruns in {wall_s:.1f}s ({report['throughput_reruns_per_s']:.2f}/s), "
+          f"{report['errors']} errors")
+    if lat["count"]:
+        print(f"latency p50={lat['p50_s']:.2f}s p95={lat['p95_s']:.2f}s p99={lat['p99_s']:.2f}s")
+    print(f"CPU {report['cpu']['utilization_percent']:.0f}%, RSS growth {report['memory']['rss_growth_mb']:.1f} MB")
+    print(f"Report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
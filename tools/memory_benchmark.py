@@ -0,0 +1,107 @@
+"""
+Speicher-Benchmark für Download-Buttons: vergleicht pro Seite und Session den Payload,
+den st.download_button hält – sofort gerenderte PNG-Bytes (vorher) gegenüber
+Callables, die erst beim Klick rendern (nachher).
+
+Jeder Modus läuft in einem eigenen Prozess, weil TOURISM_EAGER_DOWNLOADS beim Import
+von sections.utils gelesen wird.
+
+Beispiel (aus dem Repo-Root):
+    python tools/memory_benchmark.py --output memory_benchmark.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, "app.py")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import PAGES, rss_mb  # noqa: E402
+
+
+def _payload_bytes(data):
+    """Größe, die ein Download-Button bis zum Klick festhält."""
+    if callable(data):
+        # Callable: der Closure-Inhalt (Figure-JSON) ist alles, was gehalten wird
+        cells = getattr(data, "__closure__", None) or ()
+        return sum(len(c.cell_contents) for c in cells if isinstance(c.cell_contents, (str, bytes)))
+    if isinstance(data, str):
+        return len(data.encode())
+    return len(data)
+
+
+def run_child(pages):
+    """Misst alle Seiten im aktuellen Modus und gibt das Ergebnis als JSON auf stdout aus."""
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+
+    recorded = []
+    original = streamlit.download_button
+
+    def recording_download_button(label, data, *args, **kwargs):
+        recorded.append(_payload_bytes(data))
+        return original(label, data, *args, **kwargs)
+
+    streamlit.download_button = recording_download_button
+
+    at = AppTest.from_file(APP_FILE, default_timeout=600)
+    at.session_state["password_correct"] = True
+    at.run()
+
+    results = {}
+    for page in pages:
+        recorded.clear()
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(PAGES[page]).run()
+        results[page] = {
+            "download_buttons": len(recorded),
+            "payload_bytes": sum(recorded),
+            "rerun_s": time.perf_counter() - start,
+            "rss_growth_mb": rss_mb() - rss_before
+        }
+    print(json.dumps(results))
+
+
+def measure(mode, pages):
+    env = dict(os.environ, TOURISM_EAGER_DOWNLOADS="1" if mode == "before" else "0")
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *pages],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-session download payload before/after deferred PNG export")
+    parser.add_argument("pages", nargs="*", default=[p for p in PAGES if p != "introduction"])
+    parser.add_argument("--output", default="memory_benchmark.json")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        os.chdir(ROOT)
+        return run_child(args.pages)
+
+    report = {"before": measure("before", args.pages), "after": measure("after", args.pages)}
+    before = sum(p["payload_bytes"] for p in report["before"].values())
+    after = sum(p["payload_bytes"] for p in report["after"].values())
+    report["total"] = {"before_bytes": before, "after_bytes": after}
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'page':<22}{'buttons':>8}{'before KB':>12}{'after KB':>11}{'rerun before':>14}{'rerun after':>13}")
+    for page in args.pages:
+        b, a = report["before"][page], report["after"][page]
+        print(f"{page:<22}{b['download_buttons']:>8}{b['payload_bytes'] / 1024:>12.0f}{a['payload_bytes'] / 1024:>11.0f}"
+              f"{b['rerun_s']:>13.2f}s{a['rerun_s']:>12.2f}s")
+    print(f"{'total per session':<30}{before / 1024:>12.0f}{after / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
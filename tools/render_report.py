@@ -0,0 +1,234 @@
+"""
+Offline-Report: rendert alle Sektionen ohne Streamlit-Server in einen eigenständigen
+HTML-Report (plotly.js eingebettet, offline lesbar) und einen Ordner mit PNG/SVG pro Grafik.
+
+Jede Sektion läuft in einem eigenen Prozess des Pools. Gerendert wird app.py selbst
+(Streamlit-AppTest, ohne Browser) – Grafiken und Tabellen stammen also aus genau dem Code,
+den das Dashboard verwendet, inklusive der Standardwerte aller Widgets.
+
+Beispiel (aus dem Repo-Root):
+    python tools/render_report.py --output report
+    python tools/render_report.py attitudes Last_Holiday --workers 2 --no-svg
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, "app.py")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import PAGES  # noqa: E402
+
+TEXT_TYPES = {"title": "h1", "header": "h2", "subheader": "h3", "caption": "p"}
+
+
+def _collect(node, items):
+    """Elemente einer Seite in Anzeigereihenfolge; Expander werden als Zwischenüberschrift aufgeklappt."""
+    for child in node.children.values():
+        kind = getattr(child, "type", None)
+        if kind in TEXT_TYPES:
+            items.append({"kind": "text", "tag": TEXT_TYPES[kind], "text": child.value})
+        elif kind == "markdown":
+            # CSS-Blöcke aus app.py gehören nicht in den Report
+            if not child.value.lstrip().startswith("<style"):
+                items.append({"kind": "markdown", "text": child.value})
+        elif kind == "plotly_chart":
+            items.append({"kind": "figure", "spec": child.proto.spec})
+        elif kind in ("dataframe", "table"):
+            items.append({"kind": "table", "html": child.value.to_html(classes="table", border=0, na_rep="")})
+        elif hasattr(child, "children"):
+            if kind == "expandable":
+                items.append({"kind": "text", "tag": "h4", "text": child.proto.expandable.label})
+            _collect(child, items)
+    return items
+
+
+def render_section(job):
+    """Rendert eine Sektion im Worker-Prozess und exportiert ihre Grafiken als Bilddateien."""
+    page, figures_dir, formats, timeout = job
+    import plotly.io as pio
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    at.session_state["password_correct"] = True
+    at.run()
+    at.sidebar.radio[0].set_value(PAGES[page]).run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].value}")
+    items = _collect(at.main, [])
+    render_s = time.perf_counter() - start
+
+    from sections.utils import prepare_figure_for_export
+
+    n = 0
+    for item in (i for i in items if i["kind"] == "figure"):
+        n += 1
+        base = os.path.join(figures_dir, f"{page}_{n:02d}")
+        item["files"] = []
+        for fmt in formats:
+            if fmt == "png":
+                # gleiches Export-Styling wie die Download-Buttons im Dashboard
+                data = prepare_figure_for_export(pio.from_json(item["spec"]))
+            else:
+                data = pio.from_json(item["spec"]).to_image(format=fmt, width=1600, height=900)
+            with open(f"{base}.{fmt}", "wb") as f:
+                f.write(data)
+            item["files"].append(os.path.basename(f"{base}.{fmt}"))
+    return {
+        "page": page,
+        "items": items,
+        "render_s": render_s,
+        "export_s": time.perf_counter() - start - render_s
+    }
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    return re.sub(r"(?<!\*)\*(?!\s)(.+?)\*", r"<em>\1</em>", text)
+
+
+def markdown_to_html(text):
+    """Kleiner Markdown-Konverter für das, was die Sektionen verwenden: Überschriften, Fett/Kursiv, Listen."""
+    if text.lstrip().startswith("<"):
+        # bereits HTML (st.markdown mit unsafe_allow_html)
+        return text
+    out, in_list = [], False
+    for line in text.strip().splitlines():
+        stripped = line.strip()
+        bullet = re.match(r"^([-*]|\d+\.)\s+(.*)", stripped)
+        if bullet:
+            if not in_list:
+                out.append("<ul>")
+                in_list = True
+            out.append(f"<li>{_inline(bullet.group(2))}</li>")
+            continue
+        if in_list:
+            out.append("</ul>")
+            in_list = False
+        heading = re.match(r"^(#{1,6})\s+(.*)", stripped)
+        if heading:
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif stripped:
+            out.append(f"<p>{_inline(stripped)}</p>")
+    if in_list:
+        out.append("</ul>")
+    return "\n".join(out)
+
+
+def build_html(results, title):
+    import plotly.io as pio
+    from plotly.offline import get_plotlyjs
+
+    body = []
+    for result in results:
+        body.append(f'<section id="{result["page"]}">')
+        for item in result["items"]:
+            if item["kind"] == "text":
+                body.append(f'<{item["tag"]}>{_inline(item["text"])}</{item["tag"]}>')
+            elif item["kind"] == "markdown":
+                body.append(markdown_to_html(item["text"]))
+            elif item["kind"] == "table":
+                body.append(item["html"])
+            else:
+                fig = pio.from_json(item["spec"])
+                body.append(pio.to_html(fig, full_html=False, include_plotlyjs=False))
+                if item.get("files"):
+                    links = " · ".join(f'<a href="figures/{name}">{name}</a>' for name in item["files"])
+                    body.append(f'<p class="files">{links}</p>')
+        body.append("</section>")
+
+    toc = "".join(f'<li><a href="#{r["page"]}">{PAGES[r["page"]]}</a></li>' for r in results)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 1200px; margin: 2rem auto; color: #222; }}
+section {{ border-top: 2px solid #ddd; margin-top: 3rem; }}
+.table {{ border-collapse: collapse; font-size: 0.85rem; margin: 1rem 0; }}
+.table td, .table th {{ border: 1px solid #ccc; padding: 0.25rem 0.5rem; text-align: right; }}
+.files {{ font-size: 0.8rem; color: #666; }}
+</style>
+<script type="text/javascript">{get_plotlyjs()}</script>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>Generated {time.strftime("%Y-%m-%d %H:%M")}</p>
+<ul>{toc}</ul>
+{"".join(body)}
+</body>
+</html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render all dashboard sections into a static HTML report")
+    parser.add_argument("pages", nargs="*", default=[p for p in PAGES if p != "introduction"],
+                        help=f"sections to render (default: all). Choices: {', '.join(PAGES)}")
+    parser.add_argument("--output", default="report", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-svg", action="store_true", help="export PNG only")
+    parser.add_argument("--title", default="Tourism Community 2025 – Report")
+    parser.add_argument("--timeout", type=float, default=600, help="timeout per section in seconds")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.pages) - set(PAGES))
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    output = os.path.abspath(args.output)
+    figures_dir = os.path.join(output, "figures")
+    os.makedirs(figures_dir, exist_ok=True)
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    # Worker brauchen weder API- und Metrik-Server noch das Vorwärmen fremder Sektionen
+    os.environ["TOURISM_API"] = "0"
+    os.environ["TOURISM_PREFETCH"] = "0"
+    os.environ["TOURISM_WARMUP"] = "0"
+    os.environ["TOURISM_METRICS"] = "0"
+    # Parallelität kommt hier vom Sektions-Pool; Bilder rendert jeder Worker selbst
+    os.environ["TOURISM_RENDER_WORKERS"] = "0"
+
+    formats = ["png"] if args.no_svg else ["png", "svg"]
+    jobs = [(page, figures_dir, formats, args.timeout) for page in args.pages]
+    start = time.perf_counter()
+    # Frischer Prozess pro Sektion (spawn, ein Job pro Worker): Streamlit-Laufzeit und
+    # Kaleido-Subprozess lassen sich nicht sauber für eine zweite Sektion wiederverwenden
+    context = multiprocessing.get_context("spawn")
+    workers = max(1, min(args.workers, len(jobs)))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+        # map erhält die Menü-Reihenfolge, egal welche Sektion zuerst fertig ist
+        results = list(pool.map(render_section, jobs))
+
+    report_file = os.path.join(output, "report.html")
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write(build_html(results, args.title))
+
+    for r in results:
+        figures = sum(1 for i in r["items"] if i["kind"] == "figure")
+        tables = sum(1 for i in r["items"] if i["kind"] == "table")
+        print(f"{r['page']:<22}{figures:>3} figures{tables:>3} tables  "
+              f"render {r['render_s']:.1f}s  export {r['export_s']:.1f}s")
+    print(f"Report written to {report_file} in {time.perf_counter() - start:.1f}s")
+    with open(os.path.join(output, "manifest.json"), "w") as f:
+        json.dump([
+            {"page": r["page"], "files": [n for i in r["items"] for n in i.get("files", [])]}
+            for r in results
+        ], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()